@@ -0,0 +1,107 @@
+#! /usr/bin/env python
+"""Compare the memory used by sets of names and front-coded dictionaries.
+
+Example usage:
+
+```bash
+python scripts/frontcode_memory.py --synthetic 1000000
+```
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import glob
+import os
+import random
+import tracemalloc
+from collections.abc import Callable
+
+from standard_names import registry
+from standard_names._frontcode import FrontCodedNames
+from standard_names.registry import NamesRegistry
+from standard_names.standardname import StandardName
+from standard_names.standardname import is_valid_name
+
+
+def allocated(factory: Callable[[], object]) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        obj = factory()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return obj, size
+
+
+def synthetic_names(n_names: int, seed: int = 1945) -> list[str]:
+    latest = NamesRegistry.from_latest()
+    objects = sorted(latest.objects)
+    quantities = sorted(latest.quantities)
+    operators = sorted(latest.operators)
+
+    rng = random.Random(seed)
+    names: set[str] = set()
+    while len(names) < n_names:
+        chain = tuple(rng.sample(operators, rng.choice((0, 0, 1, 1, 2))))
+        names.add(
+            StandardName.compose_name(
+                rng.choice(objects), rng.choice(quantities), chain
+            )
+        )
+    return sorted(names)
+
+
+def report(label: str, names: list[str]) -> None:
+    names = list(names)
+    _, set_size = allocated(lambda: {name.encode().decode() for name in names})
+    _, fc_size = allocated(lambda: FrontCodedNames(names))
+    _, registry_size = allocated(lambda: NamesRegistry(names))
+    _, frozen_size = allocated(lambda: NamesRegistry(names).freeze())
+
+    print(
+        f"{label:>16} {len(names):>9} "
+        f"{set_size / 2**20:>9.2f} {fc_size / 2**20:>9.2f} "
+        f"{set_size / fc_size:>6.1f}x "
+        f"{registry_size / 2**20:>9.2f} {frozen_size / 2**20:>9.2f} "
+        f"{registry_size / frozen_size:>6.1f}x",
+        flush=True,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Also report on N names generated from the parts of bundled names",
+    )
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'names':>16} {'count':>9} {'set (MB)':>9} {'fc (MB)':>9} {'':>7}"
+        f" {'reg (MB)':>9} {'frz (MB)':>9}"
+    )
+
+    data_dir = os.path.join(os.path.dirname(registry.__file__), "data")
+    for path in sorted(glob.glob(os.path.join(data_dir, "names-*.txt"))):
+        with open(path) as fp:
+            names = [
+                name
+                for name in (line.strip() for line in fp)
+                if name and is_valid_name(name)
+            ]
+        report(os.path.basename(path), names)
+
+    if args.synthetic:
+        report("synthetic", synthetic_names(args.synthetic))
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
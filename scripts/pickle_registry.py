@@ -0,0 +1,106 @@
+#! /usr/bin/env python
+"""Compare the size and speed of pickling registries and names.
+
+Example usage:
+
+```bash
+python scripts/pickle_registry.py --synthetic 1000000
+```
+
+Each object is pickled as it is now and as it would be by default (that
+is, by pickling its instance dictionary). Times are the best of a few runs.
+"""
+from __future__ import annotations
+
+import argparse
+import pickle
+import time
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from standard_names.namespace import NameSpace
+from standard_names.registry import NamesRegistry
+from standard_names.registry import SortedNamesRegistry
+from standard_names.standardname import StandardName
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def default_state(obj: Any) -> Any:
+    """What pickle would store for an object without its own reduction."""
+    if isinstance(obj, list):
+        return [default_state(item) for item in obj]
+    state = dict(vars(obj))
+    state.pop("_subscribers", None)
+    return state
+
+
+def report(label: str, obj: Any, repeat: int) -> None:
+    protocol = pickle.HIGHEST_PROTOCOL
+    row = []
+    for state in (default_state(obj), obj):
+        data = pickle.dumps(state, protocol)
+        row += [
+            len(data) / 2**20,
+            best_time(partial(pickle.dumps, state, protocol), repeat),
+            best_time(partial(pickle.loads, data), repeat),
+        ]
+    print(
+        f"{label:>24} "
+        + " ".join(f"{value:>9.3f}" for value in row)
+        + f" {row[0] / row[3]:>6.1f}x",
+        flush=True,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        metavar="N",
+        help="also pickle registries of N generated names",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="number of times to time each"
+    )
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'':>24} {'default':>29} {'compact':>29}\n"
+        f"{'object':>24} "
+        + "{:>9} {:>9} {:>9} ".format("MB", "dump (s)", "load (s)") * 2
+        + f"{'smaller':>7}"
+    )
+    latest = NamesRegistry.from_latest()
+    report("latest", latest, args.repeat)
+    report("latest (sorted)", SortedNamesRegistry(latest), args.repeat)
+    report("latest (names)", [StandardName(name) for name in latest], args.repeat)
+
+    if args.synthetic:
+        space = NameSpace.from_registry(latest, max_operators=2)
+        names = space.sample(min(args.synthetic, space.size), seed=1945)
+        registry = NamesRegistry()
+        registry.add_many(names)
+        report(f"{len(names)} names", registry, args.repeat)
+        registry = SortedNamesRegistry(registry)
+        report(f"{len(names)} names (sorted)", registry, args.repeat)
+        del registry
+
+        names = [StandardName(name) for name in names[:100000]]
+        report(f"{len(names)} StandardName", names, args.repeat)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
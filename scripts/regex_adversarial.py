@@ -0,0 +1,93 @@
+#! /usr/bin/env python
+"""Time name matching on adversarial, almost-valid, inputs.
+
+Each input is matched with both the linear-time patterns and the
+original patterns with nested quantifiers, whose matching time grows
+exponentially with the length of some of these inputs. The original
+patterns are run in a separate process (whose start-up is included in
+their times) and given up on once they take longer than ``--limit``
+seconds.
+
+Example usage:
+
+```bash
+python scripts/regex_adversarial.py --sizes 16 20 24 1000 100000
+```
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import re
+import sys
+import time
+from collections.abc import Callable
+
+from standard_names.regex import STANDARD_NAME_REGEX
+from standard_names.regex import findall
+
+_WORDS = "[a-z]+(?:[-~_]?[a-zA-Z0-9]+)*"
+NESTED_NAME_REGEX = re.compile(f"^{_WORDS}__{_WORDS}$")
+NESTED_PATTERN = re.compile(f"(?<!\\w){_WORDS}__{_WORDS}(?=\\W|$)")
+
+INPUTS: dict[str, Callable[[int], str]] = {
+    "no_separator": lambda n: "a" * n + "!",
+    "underscores": lambda n: "a_" * (n // 2) + "!",
+    "hyphens": lambda n: "a-" * (n // 2),
+    "long_quantity": lambda n: "a__" + "b" * n + "!",
+    "repeated_names": lambda n: "a__b-" * (n // 5) + "_",
+}
+
+
+def _nested(line: str) -> None:
+    NESTED_NAME_REGEX.match(line)
+    NESTED_PATTERN.findall(line)
+
+
+def _linear(line: str) -> None:
+    STANDARD_NAME_REGEX.match(line)
+    findall(line)
+
+
+def seconds(func: Callable[[str], None], line: str, limit: float) -> float | None:
+    """Time a call in a separate process, giving up after *limit* seconds."""
+    process = multiprocessing.Process(target=func, args=(line,))
+    start = time.perf_counter()
+    process.start()
+    process.join(limit)
+    elapsed = time.perf_counter() - start
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return None
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[16, 20, 24, 1000, 100000]
+    )
+    parser.add_argument(
+        "--limit", type=float, default=5.0, help="Seconds to give each pattern"
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{'input':<16} {'size':>8} {'nested (s)':>12} {'linear (s)':>12}")
+    for label, make_line in INPUTS.items():
+        for size in args.sizes:
+            line = make_line(size)
+
+            start = time.perf_counter()
+            _linear(line)
+            linear = time.perf_counter() - start
+
+            nested = seconds(_nested, line, args.limit)
+            nested_str = f">{args.limit:g}" if nested is None else f"{nested:.4f}"
+            print(f"{label:<16} {size:>8} {nested_str:>12} {linear:>12.6f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#! /usr/bin/env python
+"""Load test a running registry server.
+
+Example usage:
+
+```bash
+standard-names serve &
+python scripts/serve_loadtest.py --clients 16 --requests 500
+```
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from standard_names.cli._serve import DEFAULT_HOST
+from standard_names.cli._serve import DEFAULT_PORT
+from standard_names.cli._serve import ServeClient
+from standard_names.namespace import NameSpace
+from standard_names.registry import NamesRegistry
+
+OPERATIONS = ("validate", "decompose", "search", "match")
+
+
+def run_client(
+    host: str,
+    port: int,
+    names: list[str],
+    ops: list[str],
+    n_requests: int,
+    batch_size: int,
+    seed: int,
+) -> list[float]:
+    rng = random.Random(seed)
+    latencies = []
+    with ServeClient(host=host, port=port) as client:
+        for _ in range(n_requests):
+            op = rng.choice(ops)
+            start = time.perf_counter()
+            if op == "validate":
+                client.validate(rng.sample(names, batch_size))
+            elif op == "decompose":
+                client.decompose(rng.sample(names, batch_size))
+            elif op == "search":
+                name = rng.choice(names)
+                client.search(name[: max(len(name) - 3, 1)])
+            else:
+                client.match(rng.choice(names).split("__")[0] + "__*")
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def percentile(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent clients")
+    parser.add_argument(
+        "--requests", type=int, default=200, help="Requests sent by each client"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=10, help="Names per validate request"
+    )
+    parser.add_argument(
+        "--op",
+        action="append",
+        choices=OPERATIONS,
+        help="Operation to send (default: a mix of all of them)",
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Send N names drawn from the parts of the registered names",
+    )
+    args = parser.parse_args(argv)
+
+    latest = NamesRegistry.from_latest()
+    if args.synthetic:
+        space = NameSpace.from_registry(latest, max_operators=2)
+        names = space.sample(args.synthetic, seed=1945)
+    else:
+        names = sorted(latest)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.clients) as executor:
+        futures = [
+            executor.submit(
+                run_client,
+                args.host,
+                args.port,
+                names,
+                args.op or OPERATIONS,
+                args.requests,
+                args.batch_size,
+                seed,
+            )
+            for seed in range(args.clients)
+        ]
+        latencies = [latency for future in futures for latency in future.result()]
+    elapsed = time.perf_counter() - start
+
+    print(f"requests:   {len(latencies)}", file=sys.stderr)
+    print(f"throughput: {len(latencies) / elapsed:.1f} req/s", file=sys.stderr)
+    print(f"p50:        {percentile(latencies, 50) * 1000.0:.2f} ms", file=sys.stderr)
+    print(f"p99:        {percentile(latencies, 99) * 1000.0:.2f} ms", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
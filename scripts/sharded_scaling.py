@@ -0,0 +1,146 @@
+#! /usr/bin/env python
+"""Compare building, and querying, sharded and unsharded registries.
+
+Example usage:
+
+```bash
+python scripts/sharded_scaling.py --sizes 1000000 2000000 5000000 10000000
+```
+
+Times are wall-clock times, so that shards built by other processes are
+counted. An unsharded registry of ten million names needs several
+gigabytes of memory; use ``--no-flat`` to skip it.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import random
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+from standard_names.namespace import NameSpace
+from standard_names.registry import NamesRegistry
+from standard_names.registry import ShardedNamesRegistry
+
+T = TypeVar("T")
+
+
+def synthetic_names(n_names: int) -> list[str]:
+    """Distinct names made from the parts of the latest names."""
+    space = NameSpace.from_registry(NamesRegistry.from_latest())
+    names = space.names_between(0, n_names)
+    random.Random(1945).shuffle(names)
+    return names
+
+
+def timed(func: Callable[[], T]) -> tuple[T, float]:
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def build_flat(names: list[str]) -> NamesRegistry:
+    registry = NamesRegistry()
+    registry.add_many(names)
+    return registry
+
+
+def report(
+    names: list[str],
+    n_shards: int,
+    partition: str,
+    processes: int,
+    flat: bool,
+) -> None:
+    lookups = random.Random(1066).sample(names, min(100000, len(names)))
+    pattern = "atmosphere_air__*"
+
+    rows: list[tuple[str, Callable[[], NamesRegistry | ShardedNamesRegistry]]] = []
+    if flat:
+        rows.append(("flat", lambda: build_flat(names)))
+    rows.append(
+        (
+            "sharded",
+            lambda: ShardedNamesRegistry(
+                names, n_shards=n_shards, partition=partition, processes=1
+            ),
+        )
+    )
+    if processes > 1:
+        rows.append(
+            (
+                f"sharded/{processes}",
+                lambda: ShardedNamesRegistry(
+                    names, n_shards=n_shards, partition=partition, processes=processes
+                ),
+            )
+        )
+
+    for label, build in rows:
+        build_time, lookup_time, match_time = measure(build, lookups, pattern)
+        print(
+            f"{len(names):>10} {label:>12} {build_time:>9.2f} "
+            f"{1e6 * lookup_time / len(lookups):>9.2f} {1e3 * match_time:>9.2f}",
+            flush=True,
+        )
+
+
+def measure(
+    build: Callable[[], NamesRegistry | ShardedNamesRegistry],
+    lookups: list[str],
+    pattern: str,
+) -> tuple[float, float, float]:
+    registry, build_time = timed(build)
+    _, lookup_time = timed(lambda: sum(name in registry for name in lookups))
+    _, match_time = timed(lambda: registry.match(pattern))
+    return build_time, lookup_time, match_time
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000000, 2000000, 5000000, 10000000],
+        metavar="N",
+        help="numbers of names",
+    )
+    parser.add_argument("--shards", type=int, default=16, help="number of shards")
+    parser.add_argument(
+        "--partition",
+        choices=ShardedNamesRegistry.PARTITIONS,
+        default="hash",
+        help="how names are assigned to shards",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="processes used to build shards",
+    )
+    parser.add_argument(
+        "--no-flat",
+        action="store_true",
+        help="skip the unsharded registry",
+    )
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'names':>10} {'registry':>12} {'build (s)':>9} "
+        f"{'get (us)':>9} {'match (ms)':>9}"
+    )
+    for size in args.sizes:
+        names = synthetic_names(size)
+        report(names, args.shards, args.partition, args.processes, not args.no_flat)
+        del names
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+#! /usr/bin/env python
+"""Compare checking names files a line at a time and all at once.
+
+Example usage:
+
+```bash
+python scripts/validate_buffer.py --synthetic 10000000
+```
+
+Each file is validated, and loaded into a set of names, both by reading it
+a line at a time and by memory mapping it and checking it all at once.
+Times are the best of a few runs.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from functools import partial
+
+from standard_names import registry
+from standard_names._scan import scan_file
+from standard_names.namespace import NameSpace
+from standard_names.registry import NamesRegistry
+from standard_names.registry import load_names_from_txt
+from standard_names.standardname import is_valid_name
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        times.append(time.process_time() - start)
+    return min(times)
+
+
+def validate_by_line(path: str) -> set[str]:
+    with open(path) as fp:
+        return {
+            name
+            for name in (line.strip() for line in fp)
+            if name and not is_valid_name(name)
+        }
+
+
+def validate_by_buffer(path: str) -> set[str]:
+    with open(path, "rb") as fp:
+        return set(scan_file(fp, with_names=False)[1])
+
+
+def load_by_line(path: str) -> int:
+    with open(path) as fp:
+        return len(load_names_from_txt(list(fp), onerror="pass"))
+
+
+def load_by_buffer(path: str) -> int:
+    with open(path, "rb") as fp:
+        return len(load_names_from_txt(fp, onerror="pass"))
+
+
+def write_synthetic(path: str, n_lines: int, bad_every: int) -> None:
+    space = NameSpace.from_registry(NamesRegistry.from_latest(), max_operators=2)
+    step = max(space.size // n_lines, 1)
+    with open(path, "w") as fp:
+        for start in range(0, n_lines, 100000):
+            stop = min(start + 100000, n_lines)
+            lines = [space[index * step] for index in range(start, stop)]
+            if bad_every:
+                for index in range(-start % bad_every, len(lines), bad_every):
+                    lines[index] = lines[index].capitalize()
+            fp.write("\n".join(lines) + "\n")
+
+
+def report(label: str, path: str, repeat: int, load: bool) -> None:
+    with open(path, "rb") as fp:
+        n_lines = fp.read().count(b"\n")
+    rows: list[tuple[str, Callable[[str], object], Callable[[str], object]]] = [
+        ("validate", validate_by_line, validate_by_buffer)
+    ]
+    if load:
+        rows.append(("load", load_by_line, load_by_buffer))
+
+    for task, by_line, by_buffer in rows:
+        assert by_line(path) == by_buffer(path)
+        line_time = best_time(partial(by_line, path), repeat)
+        buffer_time = best_time(partial(by_buffer, path), repeat)
+        print(
+            f"{label:>18} {task:>8} {n_lines:>10} {line_time:>9.3f} "
+            f"{buffer_time:>9.3f} {line_time / buffer_time:>6.1f}x",
+            flush=True,
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        metavar="N",
+        help="also check a file of N generated names",
+    )
+    parser.add_argument(
+        "--bad-every",
+        type=int,
+        default=1000,
+        metavar="N",
+        help="make every Nth generated name invalid (0 for none)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="number of times to time each"
+    )
+    parser.add_argument(
+        "--no-load", action="store_true", help="only validate the synthetic file"
+    )
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'file':>18} {'task':>8} {'lines':>10} {'lines (s)':>9} "
+        f"{'buffer (s)':>9} {'speedup':>7}"
+    )
+    data_dir = os.path.dirname(registry.__file__)
+    for path in sorted(glob.glob(os.path.join(data_dir, "data", "names-*.txt"))):
+        report(os.path.basename(path), path, args.repeat, load=True)
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "names.txt")
+            write_synthetic(path, args.synthetic, args.bad_every)
+            report("synthetic", path, args.repeat, load=not args.no_load)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,12 +1,59 @@
 """The CSDMS Standard Names"""
+from __future__ import annotations
+
+from importlib import import_module
+
 from standard_names._version import __version__
-from standard_names.registry import NamesRegistry
-from standard_names.standardname import StandardName
-from standard_names.standardname import is_valid_name
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from standard_names._stats import stats
+    from standard_names.registry import ConcurrentNamesRegistry
+    from standard_names.registry import FrozenNamesRegistry
+    from standard_names.registry import MergedNamesRegistry
+    from standard_names.registry import NamesRegistry
+    from standard_names.registry import ShardedNamesRegistry
+    from standard_names.registry import SortedNamesRegistry
+    from standard_names.standardname import StandardName
+    from standard_names.standardname import is_valid_name
 
 __all__ = [
     "__version__",
     "StandardName",
     "is_valid_name",
     "NamesRegistry",
+    "FrozenNamesRegistry",
+    "SortedNamesRegistry",
+    "ConcurrentNamesRegistry",
+    "MergedNamesRegistry",
+    "ShardedNamesRegistry",
+    "stats",
 ]
+
+# Submodules are only imported when one of their attributes is first used,
+# which keeps "import standard_names" (and the cli) quick to start.
+_LAZY_ATTRS = {
+    "NamesRegistry": "standard_names.registry",
+    "FrozenNamesRegistry": "standard_names.registry",
+    "SortedNamesRegistry": "standard_names.registry",
+    "ConcurrentNamesRegistry": "standard_names.registry",
+    "MergedNamesRegistry": "standard_names.registry",
+    "ShardedNamesRegistry": "standard_names.registry",
+    "StandardName": "standard_names.standardname",
+    "is_valid_name": "standard_names.standardname",
+    "stats": "standard_names._stats",
+}
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = globals()[name] = getattr(import_module(module), name)
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,319 @@
+"""A compact, read-only dictionary of sorted words."""
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Set
+from typing import Any
+
+_MAGIC = b"SNFC"
+_HEADER = struct.Struct("<4sBIII")
+_FORMAT_VERSION = 1
+_OFFSET_SIZE = array("I").itemsize
+
+
+def _encode_varint(value: int, buffer: bytearray) -> None:
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _decode_varint(data: bytes | memoryview, offset: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _common_prefix(a: bytes, b: bytes) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class FrontCodedNames(Set[str]):
+
+    """A read-only, front-coded set of words, kept in sorted order.
+
+    Words are sorted and split into blocks. The first word of each block is
+    stored in full and every other word as the length of the prefix it
+    shares with the word before it, followed by the rest of the word. The
+    whole dictionary lives in a single ``bytes`` buffer, which can be
+    written to, or read from, a file with :meth:`tobytes` and
+    :meth:`frombytes`.
+
+    Lookups binary search the first words of the blocks and then decode
+    (at most) one block, so membership, :meth:`rank` and :meth:`select`
+    take O(log N) time.
+
+    Parameters
+    ----------
+    words : iterable of str
+        The words of the dictionary (in any order, duplicates are dropped).
+    block_size : int, optional
+        Number of words in each block.
+
+    Examples
+    --------
+    >>> from standard_names._frontcode import FrontCodedNames
+
+    >>> names = FrontCodedNames(
+    ...     [
+    ...         "atmosphere_air__temperature",
+    ...         "atmosphere_air__pressure",
+    ...         "atmosphere__pressure",
+    ...         "soil__porosity",
+    ...     ]
+    ... )
+    >>> len(names)
+    4
+    >>> "soil__porosity" in names
+    True
+    >>> names.rank("atmosphere_air__pressure")
+    1
+    >>> names.select(1)
+    'atmosphere_air__pressure'
+    >>> list(names.startswith("atmosphere_air"))
+    ['atmosphere_air__pressure', 'atmosphere_air__temperature']
+    >>> names.prefix_range("atmosphere")
+    (0, 3)
+    >>> FrontCodedNames.frombytes(names.tobytes()) == names
+    True
+    """
+
+    # Something, such as a block of shared memory, that must stay open for
+    # as long as the buffer the words are read from.
+    _owner: object = None
+
+    _data: bytes | memoryview
+    _offsets: array[int] | memoryview
+
+    def __init__(self, words: Iterable[str] = (), block_size: int = 16):
+        if block_size < 1:
+            raise ValueError(f"block_size must be positive ({block_size})")
+
+        keys = sorted({word.encode("utf-8") for word in words})
+
+        data = bytearray()
+        offsets = array("I")
+        previous = b""
+        for index, word in enumerate(keys):
+            if index % block_size == 0:
+                offsets.append(len(data))
+                _encode_varint(len(word), data)
+                data += word
+            else:
+                shared = _common_prefix(previous, word)
+                _encode_varint(shared, data)
+                _encode_varint(len(word) - shared, data)
+                data += word[shared:]
+            previous = word
+
+        self._block_size = block_size
+        self._len = len(keys)
+        self._data = bytes(data)
+        self._offsets = offsets
+
+    @classmethod
+    def _from_iterable(cls, words: Iterable[Any]) -> Set[Any]:
+        return cls(words)
+
+    @classmethod
+    def frombytes(cls, buffer: bytes | memoryview) -> FrontCodedNames:
+        """Create a dictionary from the output of :meth:`tobytes`.
+
+        If *buffer* is a ``memoryview``, the dictionary reads its words
+        straight out of it, without making a copy.
+        """
+        magic, version, block_size, count, n_bytes = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            raise ValueError("not a front-coded dictionary")
+
+        n_blocks = -(-count // block_size)
+        start = _HEADER.size
+        stop = start + _OFFSET_SIZE * n_blocks
+
+        offsets: array[int] | memoryview
+        if isinstance(buffer, memoryview) and sys.byteorder == "little":
+            offsets = buffer[start:stop].cast("I")
+        else:
+            offsets = array("I")
+            offsets.frombytes(buffer[start:stop])
+            if sys.byteorder == "big":
+                offsets.byteswap()
+
+        self = cls.__new__(cls)
+        self._block_size = block_size
+        self._len = count
+        self._offsets = offsets
+        data = buffer[stop : stop + n_bytes]
+        self._data = data if isinstance(data, memoryview) else bytes(data)
+        return self
+
+    def _release(self) -> None:
+        """Release the views into a buffer the words are read from."""
+        for view in (self._offsets, self._data):
+            if isinstance(view, memoryview):
+                view.release()
+        self._owner = None
+
+    def tobytes(self) -> bytes:
+        """Serialize the dictionary.
+
+        Returns
+        -------
+        bytes
+            The dictionary, in a form that can be read by :meth:`frombytes`.
+        """
+        offsets = array("I", self._offsets)
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        return (
+            _HEADER.pack(
+                _MAGIC, _FORMAT_VERSION, self._block_size, self._len, len(self._data)
+            )
+            + offsets.tobytes()
+            + self._data
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used to store the words."""
+        return len(self._data) + self._offsets.itemsize * len(self._offsets)
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._data)
+            + sys.getsizeof(self._offsets)
+        )
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[str]:
+        return self._iter_range(0, self._len)
+
+    def __reversed__(self) -> Iterator[str]:
+        for index in range(self._len - 1, -1, -1):
+            yield self.select(index)
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        key = word.encode("utf-8")
+        block = self._find_block(key)
+        return block >= 0 and key in self._decode_block(block)
+
+    def __getitem__(self, index: int) -> str:
+        return self.select(index)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    def rank(self, word: str) -> int:
+        """Number of words that sort before a word."""
+        return self._rank(word.encode("utf-8"))
+
+    def select(self, index: int) -> str:
+        """The word with a given rank.
+
+        Parameters
+        ----------
+        index : int
+            Position of the word in sorted order (negative values count
+            back from the end).
+
+        Returns
+        -------
+        str
+            The word.
+        """
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("index out of range")
+        block, position = divmod(index, self._block_size)
+        return self._decode_block(block)[position].decode("utf-8")
+
+    def index(self, word: str) -> int:
+        """The rank of a word that is in the dictionary."""
+        rank = self.rank(word)
+        if rank < self._len and self.select(rank) == word:
+            return rank
+        raise ValueError(f"{word!r} is not in dictionary")
+
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        """The ranks of the first, and one past the last, words with a prefix."""
+        key = prefix.encode("utf-8")
+        start = self._rank(key)
+
+        # Words that start with the prefix sort before the prefix's successor.
+        key = key.rstrip(b"\xff")
+        if not key:
+            return start, self._len
+        return start, self._rank(key[:-1] + bytes([key[-1] + 1]))
+
+    def startswith(self, prefix: str) -> Iterator[str]:
+        """Iterate, in order, over the words that start with a prefix."""
+        return self._iter_range(*self.prefix_range(prefix))
+
+    def _head(self, block: int) -> bytes:
+        length, offset = _decode_varint(self._data, self._offsets[block])
+        return bytes(self._data[offset : offset + length])
+
+    def _find_block(self, key: bytes) -> int:
+        """The last block whose first word is not greater than *key*."""
+        lo, hi = 0, len(self._offsets)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key < self._head(mid):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo - 1
+
+    def _rank(self, key: bytes) -> int:
+        block = self._find_block(key)
+        if block < 0:
+            return 0
+        words = self._decode_block(block)
+        position = 0
+        while position < len(words) and words[position] < key:
+            position += 1
+        return block * self._block_size + position
+
+    def _decode_block(self, block: int) -> list[bytes]:
+        data = self._data
+        length, offset = _decode_varint(data, self._offsets[block])
+        word = bytes(data[offset : offset + length])
+        offset += length
+        words = [word]
+
+        n_words = min(self._block_size, self._len - block * self._block_size)
+        for _ in range(n_words - 1):
+            shared, offset = _decode_varint(data, offset)
+            length, offset = _decode_varint(data, offset)
+            word = word[:shared] + data[offset : offset + length]
+            offset += length
+            words.append(word)
+        return words
+
+    def _iter_range(self, start: int, stop: int) -> Iterator[str]:
+        index = start
+        while index < stop:
+            block, position = divmod(index, self._block_size)
+            words = self._decode_block(block)[position : position + stop - index]
+            for word in words:
+                yield word.decode("utf-8")
+            index += len(words)
@@ -0,0 +1,174 @@
+"""Indexed fuzzy lookup of words."""
+from __future__ import annotations
+
+import math
+import os
+from collections import Counter
+from collections import defaultdict
+from collections.abc import Iterable
+from collections.abc import Sequence
+
+_PAD = "\0"
+
+
+def _ngrams(word: str, n: int = 3) -> set[str]:
+    padded = _PAD * (n - 1) + word + _PAD
+    return {padded[i : i + n] for i in range(len(padded) - n + 1)}
+
+
+class NGramIndex:
+
+    """An n-gram index for finding the closest matches to a word.
+
+    Words are scored by the similarity (the Dice coefficient) of their
+    sets of n-grams. Candidates are found through an inverted index of
+    n-grams, and only the rarest n-grams of a query are looked up, so the
+    cost of a query doesn't grow with the number of words in the index.
+
+    Parameters
+    ----------
+    words : iterable of str
+        The words to index.
+    n : int, optional
+        Length of the n-grams.
+
+    Examples
+    --------
+    >>> from standard_names._fuzzy import NGramIndex
+
+    >>> index = NGramIndex(["air__temperature", "water__temperature", "soil__depth"])
+    >>> index.query("air__temp")
+    [('air__temperature', 0.667)]
+    >>> [word for word, _ in index.query("watr__temperature", cutoff=0.5)]
+    ['water__temperature', 'air__temperature']
+    """
+
+    def __init__(self, words: Iterable[str], n: int = 3):
+        self._n = n
+        self._words = sorted(set(words))
+        self._grams = [_ngrams(word, n) for word in self._words]
+
+        postings = defaultdict(list)
+        for id_, grams in enumerate(self._grams):
+            for gram in grams:
+                postings[gram].append(id_)
+        self._postings = dict(postings)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    @property
+    def words(self) -> tuple[str, ...]:
+        """The indexed words, sorted."""
+        return tuple(self._words)
+
+    def query(
+        self, word: str, k: int = 3, cutoff: float = 0.6
+    ) -> list[tuple[str, float]]:
+        """Find the indexed words that are closest to a word.
+
+        Parameters
+        ----------
+        word : str
+            The word to look up.
+        k : int, optional
+            Maximum number of matches to return.
+        cutoff : float, optional
+            Matches that score less than this (on a scale from 0 to 1)
+            are ignored.
+
+        Returns
+        -------
+        list of (str, float)
+            The closest matches and their similarity scores, best first.
+        """
+        grams = _ngrams(word, self._n)
+        n_grams = len(grams)
+
+        # A word can only score above the cutoff if it shares at least
+        # min_shared n-grams with the query, and so it must share one of the
+        # (n_grams - min_shared + 1) rarest. Count only those.
+        min_shared = max(math.ceil(cutoff * n_grams / (2.0 - cutoff)), 1)
+        postings = sorted(
+            (self._postings[gram] for gram in grams if gram in self._postings),
+            key=len,
+        )
+
+        shared: Counter[int] = Counter()
+        for ids in postings[: n_grams - min_shared + 1]:
+            shared.update(ids)
+
+        matches = []
+        for id_, _ in shared.most_common(max(4 * k, 16)):
+            candidate = self._grams[id_]
+            score = 2.0 * len(grams & candidate) / (n_grams + len(candidate))
+            if score >= cutoff:
+                matches.append((self._words[id_], round(score, 3)))
+
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches[:k]
+
+    def query_many(
+        self,
+        words: Iterable[str],
+        k: int = 3,
+        cutoff: float = 0.6,
+        processes: int | None = None,
+    ) -> dict[str, list[tuple[str, float]]]:
+        """Find the closest matches for many words, in parallel.
+
+        Parameters
+        ----------
+        words : iterable of str
+            Words to look up.
+        k : int, optional
+            Maximum number of matches for each word.
+        cutoff : float, optional
+            Matches that score less than this are ignored.
+        processes : int, optional
+            Number of worker processes. By default, small inputs are looked
+            up in this process and large ones use all available CPUs.
+
+        Returns
+        -------
+        dict
+            The matches for each word.
+        """
+        words = list(dict.fromkeys(words))
+
+        if processes is None:
+            processes = 1 if len(words) < 2048 else os.cpu_count() or 1
+        processes = min(processes, max(len(words) // 256, 1))
+
+        if processes <= 1:
+            return {word: self.query(word, k=k, cutoff=cutoff) for word in words}
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = [words[i::processes] for i in range(processes)]
+        with ProcessPoolExecutor(
+            processes, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            results = executor.map(
+                _query_chunk, chunks, [k] * len(chunks), [cutoff] * len(chunks)
+            )
+            return {
+                word: matches
+                for chunk, chunk_matches in zip(chunks, results)
+                for word, matches in zip(chunk, chunk_matches)
+            }
+
+
+_worker_index: NGramIndex | None = None
+
+
+def _init_worker(index: NGramIndex) -> None:
+    global _worker_index
+    _worker_index = index
+
+
+def _query_chunk(
+    words: Sequence[str], k: int, cutoff: float
+) -> list[list[tuple[str, float]]]:
+    assert _worker_index is not None
+    return [_worker_index.query(word, k=k, cutoff=cutoff) for word in words]
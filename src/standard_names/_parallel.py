@@ -0,0 +1,101 @@
+"""Stream chunks of work through a pool of processes."""
+from __future__ import annotations
+
+import os
+from collections import deque
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from itertools import islice
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import TypeVar
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def imap_chunks(
+    function: Callable[[Any, list[T]], list[R]],
+    state: Any,
+    items: Iterable[T],
+    chunksize: int = 16384,
+    processes: int | None = None,
+) -> Iterator[R]:
+    """Apply a function to chunks of a stream of items, in parallel.
+
+    Items are read a chunk at a time, and only a couple of chunks per
+    process are in flight at once, so streams of any length can be
+    processed in constant memory. Each worker is sent *state* once, when
+    it starts.
+
+    Parameters
+    ----------
+    function : callable
+        A module-level function that takes the state and a chunk of items
+        and returns a list of results, one for each item.
+    state : object
+        What *function* needs, other than the items.
+    items : iterable
+        The items.
+    chunksize : int, optional
+        Number of items sent to a worker at a time.
+    processes : int, optional
+        Number of worker processes. By default, streams that fit in a
+        single chunk are processed in this process and longer ones use
+        all available CPUs.
+
+    Yields
+    ------
+    object
+        The result for each item, in order.
+
+    Examples
+    --------
+    >>> from standard_names._parallel import imap_chunks
+
+    >>> def scale(factor, chunk):
+    ...     return [factor * item for item in chunk]
+    >>> list(imap_chunks(scale, 10, range(5), chunksize=2))
+    [0, 10, 20, 30, 40]
+    """
+    items = iter(items)
+    first = list(islice(items, chunksize))
+
+    if processes is None:
+        processes = 1 if len(first) < chunksize else os.cpu_count() or 1
+    if processes <= 1:
+        yield from function(state, first)
+        for chunk in iter(lambda: list(islice(items, chunksize)), []):
+            yield from function(state, chunk)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(
+        processes, initializer=_init_worker, initargs=(state,)
+    ) as executor:
+        pending: deque[Future[list[R]]] = deque(
+            [executor.submit(_call, function, first)]
+        )
+        for chunk in iter(lambda: list(islice(items, chunksize)), []):
+            if len(pending) >= 2 * processes:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(_call, function, chunk))
+        while pending:
+            yield from pending.popleft().result()
+
+
+_worker_state: Any = None
+
+
+def _init_worker(state: Any) -> None:
+    global _worker_state
+    _worker_state = state
+
+
+def _call(function: Callable[[Any, list[T]], list[R]], chunk: list[T]) -> list[R]:
+    return function(_worker_state, chunk)
@@ -0,0 +1,193 @@
+"""Split the contents of a names file into valid names and bad lines.
+
+Rather than strip and match each line in turn, the contents of a file, as
+bytes, are matched all at once against a pattern for any number of lines
+that each hold (at most) one valid name. Where the match stops is the
+start of a line that isn't valid; only these lines are looked at by
+Python, to decide how to report them. Runs of valid lines are turned into
+names by decoding, and splitting, the whole run.
+"""
+from __future__ import annotations
+
+import io
+import mmap
+import os
+import re
+from collections.abc import Iterator
+from typing import IO
+from typing import cast
+
+from standard_names import standardname
+from standard_names._stats import timed
+
+# Whitespace, other than a newline, that str.strip removes from a line.
+_SPACE = rb"[ \t\v\f\r]"
+
+# The words of an object or quantity (see standard_names.regex). A word
+# can only end at a separator, so nothing is lost by never backtracking
+# into one, and the matcher is spared from keeping track of where it could.
+_WORDS = rb"[a-z][a-zA-Z0-9]*+(?:[-~_][a-zA-Z0-9]++)*+"
+
+# Lines that each hold, at most, one valid name. The repetition is
+# possessive, too, so no state is kept for backtracking into earlier lines.
+_VALID_LINES = re.compile(
+    rb"(?:%s*+(?:%s__%s%s*+)?+(?:\n|\Z))*+" % (_SPACE, _WORDS, _WORDS, _SPACE)
+)
+
+
+def _count_lines(result: tuple[list[str], list[str]]) -> int:
+    return len(result[0]) + len(result[1])
+
+
+@timed("validate", items=_count_lines)
+def scan_names(
+    buffer: bytes | mmap.mmap, with_names: bool = True
+) -> tuple[list[str], list[str]]:
+    """Find the names in a buffer of lines, and the lines that aren't names.
+
+    Parameters
+    ----------
+    buffer : bytes or mmap
+        Lines of UTF-8 encoded text.
+    with_names : bool, optional
+        If ``False``, only look for the lines that aren't names.
+
+    Returns
+    -------
+    tuple of (list of str, list of str)
+        The valid names (none, if *with_names* is ``False``), and the
+        (stripped) lines that aren't valid names, in the order they
+        appear. Blank lines are neither.
+
+    Examples
+    --------
+    >>> from standard_names._scan import scan_names
+    >>> scan_names(b"air__temperature\\n\\n  water__temperature \\r\\nAir__x\\n")
+    (['air__temperature', 'water__temperature'], ['Air__x'])
+    >>> scan_names(b"air__temperature\\nAir__x", with_names=False)
+    ([], ['Air__x'])
+    """
+    names: list[str] = []
+    bad_names: list[str] = []
+    checked = names if with_names else []
+
+    for start, stop, eol in _runs(buffer, 0, len(buffer)):
+        if with_names and stop > start:
+            names += buffer[start:stop].decode("ascii").split()
+        if eol > stop:
+            _check_line(buffer[stop:eol].decode("utf-8", "replace"), checked, bad_names)
+
+    return names, bad_names
+
+
+@timed("validate", items=len)
+def scan_bad_names(
+    buffer: bytes | mmap.mmap, start: int = 0, end: int | None = None
+) -> list[tuple[int, str]]:
+    """Find the lines of a buffer that aren't names, and where they start.
+
+    Parameters
+    ----------
+    buffer : bytes or mmap
+        Lines of UTF-8 encoded text.
+    start, end : int, optional
+        Only look at this part of the buffer, which should start at the
+        beginning of a line and end at the end of one.
+
+    Returns
+    -------
+    list of (int, str)
+        Offsets of the starts of lines, and the (stripped) text of the
+        lines, that aren't valid names, in the order they appear. A line
+        with a lone carriage return is split in two, and both parts have
+        the same offset.
+
+    Examples
+    --------
+    >>> from standard_names._scan import scan_bad_names
+    >>> scan_bad_names(b"air__temperature\\nAir__x\\n\\nice__\\n")
+    [(17, 'Air__x'), (25, 'ice__')]
+    >>> scan_bad_names(b"air__temperature\\nAir__x\\n\\nice__\\n", start=24)
+    [(25, 'ice__')]
+    """
+    bad_names: list[tuple[int, str]] = []
+    for _, stop, eol in _runs(buffer, start, len(buffer) if end is None else end):
+        if eol > stop:
+            found: list[str] = []
+            _check_line(buffer[stop:eol].decode("utf-8", "replace"), [], found)
+            bad_names += [(stop, name) for name in found]
+    return bad_names
+
+
+def _runs(
+    buffer: bytes | mmap.mmap, start: int, end: int
+) -> Iterator[tuple[int, int, int]]:
+    """Split part of a buffer into runs of valid lines and the lines between.
+
+    Yields the start and end of each run of lines that the pattern accepts,
+    and the end of the line that follows it, which the pattern didn't
+    accept (the same as the end of the run if there's no such line).
+    """
+    while start < end:
+        # The pattern matches (if only the empty string) everywhere.
+        stop = cast("re.Match[bytes]", _VALID_LINES.match(buffer, start, end)).end()
+        if stop >= end:
+            yield start, end, end
+            break
+
+        eol = buffer.find(b"\n", stop, end)
+        eol = end if eol < 0 else eol + 1
+        yield start, stop, eol
+        start = eol
+
+
+def _check_line(line: str, names: list[str], bad_names: list[str]) -> None:
+    """Check, in Python, a line that the pattern didn't accept."""
+    # Text files also end lines with a lone carriage return.
+    for part in line.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        name = part.strip()
+        if not name:
+            continue
+        elif standardname.is_valid_name(name):
+            names.append(name)
+        else:
+            bad_names.append(name)
+
+
+def scan_file(
+    file: IO[str] | IO[bytes], with_names: bool = True
+) -> tuple[list[str], list[str]]:
+    """Find the names in the rest of a file (see :func:`scan_names`).
+
+    Files opened in binary mode, from their beginning, are memory mapped
+    rather than read.
+
+    Parameters
+    ----------
+    file : file-like
+        A file, opened for reading in either text or binary mode.
+    with_names : bool, optional
+        If ``False``, only look for the lines that aren't names.
+
+    Returns
+    -------
+    tuple of (list of str, list of str)
+        The valid names, and the lines that aren't valid names.
+    """
+    if isinstance(file, io.BufferedReader):
+        try:
+            fileno = file.fileno()
+            mappable = file.tell() == 0 and os.fstat(fileno).st_size > 0
+        except (OSError, ValueError):
+            mappable = False
+        if mappable:
+            with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as buffer:
+                return scan_names(buffer, with_names=with_names)
+
+    contents = file.read()
+    return scan_names(
+        contents.encode("utf-8", "surrogateescape")
+        if isinstance(contents, str)
+        else contents,
+        with_names=with_names,
+    )
@@ -0,0 +1,215 @@
+"""Opt-in timing instrumentation for registry operations.
+
+Instrumentation is off by default. While it is off, functions decorated with
+``timed`` cost one extra call and a flag check. Functions that run once per
+name aren't decorated; they check the module's ``_enabled`` flag themselves
+and, only if it is set, time their work with a ``timer``, so they cost just
+the flag check otherwise (and are counted however they are imported).
+
+Instrumentation is turned on by calling ``enable``, or by setting the
+``STANDARD_NAMES_PROFILE`` environment variable, and off by calling
+``disable``. Calls that raise are recorded too, with no items.
+
+Examples
+--------
+>>> from standard_names import _stats
+>>> from standard_names import NamesRegistry
+
+>>> _stats.reset()
+>>> _stats.enable()
+>>> registry = NamesRegistry(["air__temperature", "water__temperature"])
+>>> _stats.disable()
+
+>>> counts = _stats.stats()
+>>> counts["load"]["calls"], counts["load"]["items"]
+(1, 2)
+>>> counts["decompose"]["calls"]
+2
+"""
+from __future__ import annotations
+
+import functools
+import os
+import time
+from collections.abc import Callable
+from collections.abc import Sized
+from typing import Any
+from typing import TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = bool(os.environ.get("STANDARD_NAMES_PROFILE"))
+_records: dict[str, list[float]] = {}
+
+
+def enable() -> None:
+    """Start recording calls to instrumented functions."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording calls to instrumented functions."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Check if instrumentation is turned on."""
+    return _enabled
+
+
+def reset() -> None:
+    """Discard everything recorded so far."""
+    _records.clear()
+
+
+def record(category: str, seconds: float, items: int = 1) -> None:
+    """Add a call to the statistics of a category.
+
+    Parameters
+    ----------
+    category : str
+        The category of operation (e.g. ``"load"``).
+    seconds : float
+        Time spent in the call.
+    items : int, optional
+        Number of items processed by the call.
+    """
+    try:
+        counts = _records[category]
+    except KeyError:
+        counts = _records[category] = [0, 0.0, 0]
+    counts[0] += 1
+    counts[1] += seconds
+    counts[2] += items
+
+
+def _count_items(result: Any) -> int:
+    if isinstance(result, Sized) and not isinstance(result, str):
+        return len(result)
+    return 1
+
+
+def timed(
+    category: str, items: Callable[[Any], int] | None = _count_items
+) -> Callable[[F], F]:
+    """Decorate a function so its calls are recorded under a category.
+
+    Parameters
+    ----------
+    category : str
+        The category to record calls under.
+    items : callable, optional
+        Function that, given the return value of the decorated function,
+        gives the number of items processed. By default, the length of the
+        return value (or 1 if it has no length).
+    """
+    count = items or (lambda result: 1)
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwds: Any) -> Any:
+            if not _enabled:
+                return func(*args, **kwds)
+
+            start = time.perf_counter()
+            n_items = 0
+            try:
+                result = func(*args, **kwds)
+                n_items = count(result)
+                return result
+            finally:
+                record(category, time.perf_counter() - start, n_items)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+class timer:
+
+    """Record the time spent in a block of code under a category.
+
+    The block counts as one item, unless :attr:`items` is set within it,
+    and as none if it raises. Nothing is recorded while instrumentation is
+    disabled, though functions called once per name should check
+    ``_enabled`` before using a timer at all.
+
+    Examples
+    --------
+    >>> from standard_names import _stats
+    >>> _stats.reset()
+    >>> _stats.enable()
+    >>> with _stats.timer("load") as t:
+    ...     t.items = 3
+    >>> _stats.disable()
+    >>> _stats.stats()["load"]["items"]
+    3
+    >>> _stats.reset()
+    """
+
+    __slots__ = ("category", "items", "_start")
+
+    def __init__(self, category: str):
+        self.category = category
+        self.items = 1
+        self._start = 0.0
+
+    def __enter__(self) -> timer:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        if not _enabled:
+            return
+        record(
+            self.category,
+            time.perf_counter() - self._start,
+            0 if exc_type is not None else self.items,
+        )
+
+
+def stats() -> dict[str, dict[str, float]]:
+    """Statistics recorded for instrumented operations.
+
+    Returns
+    -------
+    dict
+        For each category, the number of ``calls``, the cumulative
+        ``seconds``, the number of ``items`` processed, and the
+        throughput as ``items_per_second``.
+    """
+    return {
+        category: {
+            "calls": calls,
+            "seconds": seconds,
+            "items": n_items,
+            "items_per_second": n_items / seconds if seconds > 0.0 else 0.0,
+        }
+        for category, (calls, seconds, n_items) in sorted(_records.items())
+    }
+
+
+def summary() -> str:
+    """Summarize recorded statistics as a table.
+
+    Examples
+    --------
+    >>> from standard_names import _stats
+    >>> _stats.reset()
+    >>> _stats.record("load", 0.5, items=100)
+    >>> print(_stats.summary())
+    category       calls   seconds      items    items/s
+    load               1    0.5000        100      200.0
+    >>> _stats.reset()
+    """
+    lines = [
+        f"{'category':<10} {'calls':>10} {'seconds':>9} {'items':>10} {'items/s':>10}"
+    ]
+    for category, counts in stats().items():
+        lines.append(
+            f"{category:<10} {counts['calls']:>10d} {counts['seconds']:>9.4f}"
+            f" {counts['items']:>10d} {counts['items_per_second']:>10.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,471 @@
+"""Tries over the parts of standard names."""
+from __future__ import annotations
+
+import copy
+from collections import Counter
+from collections import defaultdict
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from typing import cast
+
+from standard_names.standardname import StandardName
+
+
+class _Node:
+    __slots__ = ("children", "names", "count", "owner")
+
+    def __init__(self, owner: object = None) -> None:
+        self.children: dict[str, _Node] = {}
+        self.names: set[str] = set()
+        self.count = 0
+        self.owner = owner
+
+
+class TokenTrie:
+
+    """A trie of token sequences, each of which leads to a set of names.
+
+    Every node keeps a count of the names below it so that subtree sizes
+    are known without walking the subtree, and queries that return names
+    take time proportional to the size of their result.
+
+    Examples
+    --------
+    >>> from standard_names._trie import TokenTrie
+
+    >>> trie = TokenTrie()
+    >>> trie.add(("a", "b"), "ab")
+    True
+    >>> trie.add(("a", "c"), "ac")
+    True
+    >>> trie.add(("a", "c"), "ac")
+    False
+    >>> trie.add(("a",), "a")
+    True
+    >>> sorted(trie.startswith(("a",)))
+    ['a', 'ab', 'ac']
+    >>> trie.children(("a",))
+    {'b': 1, 'c': 1}
+    >>> trie.count(("a",))
+    3
+    """
+
+    def __init__(self) -> None:
+        self._owner = object()
+        self._root = _Node(self._owner)
+
+    def __len__(self) -> int:
+        return self._root.count
+
+    def copy(self) -> TokenTrie:
+        """A copy of the trie that can be changed independently of it.
+
+        The copy starts out sharing all of its nodes with the trie. A node
+        is copied only when one of the two tries changes it, and then only
+        along the path that changes, so copies are cheap no matter how
+        large the trie is.
+        """
+        new = copy.copy(self)
+        # Neither trie owns the shared nodes, so both copy them before a change.
+        self._owner = object()
+        new._owner = object()
+        return new
+
+    def add(self, tokens: Sequence[str], name: str) -> bool:
+        """Add a name at the end of a path of tokens.
+
+        Returns
+        -------
+        bool
+            ``True`` if the name was added, ``False`` if it was already there.
+        """
+        node = self._find(tokens)
+        if node is not None and name in node.names:
+            return False
+
+        path = self._writable_path(tokens)
+        path[-1].names.add(name)
+        for node in path:
+            node.count += 1
+        return True
+
+    def update(self, items: Iterable[tuple[Sequence[str], str]]) -> set[str]:
+        """Add many names, each at the end of a path of tokens.
+
+        Names that share a path are added together, so each path is walked
+        only once.
+
+        Returns
+        -------
+        set of str
+            The names that were added (that weren't already there).
+        """
+        added: set[str] = set()
+        for tokens, names in _group_by_path(items).items():
+            added |= self._add_at(tokens, names)
+        return added
+
+    def difference_update(self, items: Iterable[tuple[Sequence[str], str]]) -> set[str]:
+        """Remove many names, each from the end of a path of tokens.
+
+        Returns
+        -------
+        set of str
+            The names that were removed (that were there).
+        """
+        removed: set[str] = set()
+        for tokens, names in _group_by_path(items).items():
+            removed |= self._discard_at(tokens, names)
+        return removed
+
+    def _add_at(self, tokens: Sequence[str], names: set[str]) -> set[str]:
+        node = self._find(tokens)
+        added = names if node is None else names - node.names
+        if added:
+            path = self._writable_path(tokens)
+            path[-1].names |= added
+            for node in path:
+                node.count += len(added)
+        return added
+
+    def discard(self, tokens: Sequence[str], name: str) -> bool:
+        """Remove a name (if present) from the end of a path of tokens.
+
+        Returns
+        -------
+        bool
+            ``True`` if the name was removed, ``False`` if it wasn't there.
+        """
+        node = self._find(tokens)
+        if node is None or name not in node.names:
+            return False
+
+        path = self._writable_path(tokens)
+        path[-1].names.remove(name)
+        for node in path:
+            node.count -= 1
+        self._prune(path, tokens)
+        return True
+
+    def _discard_at(self, tokens: Sequence[str], names: set[str]) -> set[str]:
+        node = self._find(tokens)
+        removed = set() if node is None else names & node.names
+        if removed:
+            path = self._writable_path(tokens)
+            path[-1].names -= removed
+            for node in path:
+                node.count -= len(removed)
+            self._prune(path, tokens)
+        return removed
+
+    def _writable_path(self, tokens: Sequence[str]) -> list[_Node]:
+        """The nodes along a path, created if missing and copied if shared."""
+        owner = self._owner
+        node = self._root
+        if node.owner is not owner:
+            node = self._root = self._copy_node(node)
+
+        path = [node]
+        for token in tokens:
+            children = node.children
+            try:
+                node = children[token]
+            except KeyError:
+                node = children[token] = _Node(owner)
+            else:
+                if node.owner is not owner:
+                    node = children[token] = self._copy_node(node)
+            path.append(node)
+        return path
+
+    def _copy_node(self, node: _Node) -> _Node:
+        new = _Node(self._owner)
+        new.children = dict(node.children)
+        new.names = set(node.names)
+        new.count = node.count
+        return new
+
+    @staticmethod
+    def _prune(path: list[_Node], tokens: Sequence[str]) -> None:
+        """Remove the empty nodes at the end of a path."""
+        for parent, token, node in zip(path[-2::-1], tokens[::-1], path[::-1]):
+            if node.count > 0:
+                break
+            del parent.children[token]
+
+    def _find(self, tokens: Sequence[str]) -> _Node | None:
+        node = self._root
+        for token in tokens:
+            try:
+                node = node.children[token]
+            except KeyError:
+                return None
+        return node
+
+    def count(self, prefix: Sequence[str] = ()) -> int:
+        """Number of names whose tokens start with a prefix."""
+        node = self._find(prefix)
+        return 0 if node is None else node.count
+
+    def exactly(self, tokens: Sequence[str]) -> set[str]:
+        """Names whose tokens are exactly *tokens*."""
+        node = self._find(tokens)
+        return set() if node is None else set(node.names)
+
+    def startswith(self, prefix: Sequence[str] = ()) -> set[str]:
+        """Names whose tokens start with a prefix."""
+        node = self._find(prefix)
+        if node is None:
+            return set()
+        return {name for _, names in self._walk(node, tuple(prefix)) for name in names}
+
+    def children(self, prefix: Sequence[str] = ()) -> dict[str, int]:
+        """The tokens that follow a prefix and the number of names under each."""
+        node = self._find(prefix)
+        if node is None:
+            return {}
+        return {token: child.count for token, child in sorted(node.children.items())}
+
+    def items(
+        self, prefix: Sequence[str] = (), depth: int | None = None
+    ) -> Iterator[tuple[tuple[str, ...], set[str]]]:
+        """Iterate over token paths that start with a prefix, and their names.
+
+        Parameters
+        ----------
+        prefix : sequence of str, optional
+            Only include paths that start with these tokens.
+        depth : int, optional
+            Only include paths of this many tokens.
+        """
+        node = self._find(prefix)
+        if node is None:
+            return
+        for tokens, names in self._walk(node, tuple(prefix), depth=depth):
+            if names and (depth is None or len(tokens) == depth):
+                yield tokens, set(names)
+
+    @staticmethod
+    def _walk(
+        node: _Node, tokens: tuple[str, ...], depth: int | None = None
+    ) -> Iterator[tuple[tuple[str, ...], set[str]]]:
+        stack = [(tokens, node)]
+        while stack:
+            tokens, node = stack.pop()
+            yield tokens, node.names
+            if depth is None or len(tokens) < depth:
+                stack.extend(
+                    (tokens + (token,), child) for token, child in node.children.items()
+                )
+
+
+class OperatorTrie(TokenTrie):
+
+    """A trie of the operator chains of names, keyed outermost-first.
+
+    Examples
+    --------
+    >>> from standard_names._trie import OperatorTrie
+
+    >>> trie = OperatorTrie()
+    >>> trie.add_name("air__temperature")
+    >>> trie.add_name("air__time_derivative_of_temperature")
+    >>> trie.add_name("air__time_derivative_of_log_of_pressure")
+    >>> trie.add_name("air__log_of_temperature")
+
+    >>> sorted(trie.startswith("time_derivative"))
+    ['air__time_derivative_of_log_of_pressure', 'air__time_derivative_of_temperature']
+    >>> trie.with_depth(2)
+    {'air__time_derivative_of_log_of_pressure'}
+    >>> sorted(trie.applied_to("temperature"))
+    [(), ('log',), ('time_derivative',)]
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        # The counters are replaced, never changed, so copies can share them.
+        self._chains: dict[str, Counter[tuple[str, ...]]] = {}
+
+    def copy(self) -> OperatorTrie:
+        new = cast(OperatorTrie, super().copy())
+        new._chains = dict(self._chains)
+        return new
+
+    def add_name(self, name: str) -> None:
+        """Add a name to the trie."""
+        _, quantity, operators = StandardName.decompose_name(name)
+        self.add_parts(name, quantity, operators)
+
+    def discard_name(self, name: str) -> None:
+        """Remove a name from the trie."""
+        _, quantity, operators = StandardName.decompose_name(name)
+        self.discard_parts(name, quantity, operators)
+
+    def add_parts(self, name: str, quantity: str, operators: tuple[str, ...]) -> None:
+        """Add an already-decomposed name to the trie."""
+        if self.add(operators, name):
+            self._add_chain(quantity, operators)
+
+    def discard_parts(
+        self, name: str, quantity: str, operators: tuple[str, ...]
+    ) -> None:
+        """Remove an already-decomposed name from the trie."""
+        if self.discard(operators, name):
+            self._discard_chain(quantity, operators)
+
+    def _add_chain(self, quantity: str, operators: tuple[str, ...]) -> None:
+        chains = Counter(self._chains.get(quantity, ()))
+        chains[operators] += 1
+        self._chains[quantity] = chains
+
+    def _discard_chain(self, quantity: str, operators: tuple[str, ...]) -> None:
+        chains = self._chains[quantity].copy()
+        chains[operators] -= 1
+        if chains[operators] <= 0:
+            del chains[operators]
+        if chains:
+            self._chains[quantity] = chains
+        else:
+            del self._chains[quantity]
+
+    def add_many_parts(self, parts: Iterable[tuple[str, str, tuple[str, ...]]]) -> None:
+        """Add many already-decomposed names to the trie."""
+        quantities = {}
+        items = []
+        for name, quantity, operators in parts:
+            quantities[name] = quantity, operators
+            items.append((operators, name))
+        for name in self.update(items):
+            self._add_chain(*quantities[name])
+
+    def discard_many_parts(
+        self, parts: Iterable[tuple[str, str, tuple[str, ...]]]
+    ) -> None:
+        """Remove many already-decomposed names from the trie."""
+        quantities = {}
+        items = []
+        for name, quantity, operators in parts:
+            quantities[name] = quantity, operators
+            items.append((operators, name))
+        for name in self.difference_update(items):
+            self._discard_chain(*quantities[name])
+
+    def startswith(self, prefix: str | Sequence[str] = ()) -> set[str]:
+        """Names whose operator chain starts with an operator, or operators."""
+        return super().startswith(_as_chain(prefix))
+
+    def with_chain(self, operators: str | Sequence[str]) -> set[str]:
+        """Names with exactly this chain of operators."""
+        return self.exactly(_as_chain(operators))
+
+    def with_depth(self, n_operators: int) -> set[str]:
+        """Names with exactly *n_operators* operators."""
+        return {name for _, names in self.items(depth=n_operators) for name in names}
+
+    def applied_to(self, quantity: str) -> set[tuple[str, ...]]:
+        """Chains of operators applied to a quantity."""
+        return set(self._chains.get(quantity, ()))
+
+
+def _as_chain(operators: str | Sequence[str]) -> tuple[str, ...]:
+    return (operators,) if isinstance(operators, str) else tuple(operators)
+
+
+class ObjectTree(TokenTrie):
+
+    """A tree of the objects of names, split into their ``_``-separated tokens.
+
+    Compound objects, like ``atmosphere_air`` or ``above-ground_crop_biomass``,
+    sit below the objects that they start with, so that all of the names
+    about, say, the atmosphere are in a single subtree. Prefixes can be
+    given either as sequences of tokens or as (partial) objects.
+
+    Examples
+    --------
+    >>> from standard_names._trie import ObjectTree
+
+    >>> tree = ObjectTree()
+    >>> tree.add_name("atmosphere__pressure")
+    >>> tree.add_name("atmosphere_air__temperature")
+    >>> tree.add_name("atmosphere_air_flow__speed")
+    >>> tree.add_name("soil_water__volume_fraction")
+    >>> tree.add_name("soil_layer__thickness")
+
+    >>> sorted(tree.under("atmosphere_air"))
+    ['atmosphere_air__temperature', 'atmosphere_air_flow__speed']
+    >>> tree.children("soil")
+    {'layer': 1, 'water': 1}
+    >>> tree.count("atmosphere")
+    3
+    >>> sorted(tree.objects("atmosphere"))
+    ['atmosphere', 'atmosphere_air', 'atmosphere_air_flow']
+    """
+
+    def copy(self) -> ObjectTree:
+        return cast(ObjectTree, super().copy())
+
+    def add_name(self, name: str) -> None:
+        """Add a name to the tree."""
+        object_, _, _ = StandardName.decompose_name(name)
+        self.add_parts(name, object_)
+
+    def discard_name(self, name: str) -> None:
+        """Remove a name from the tree."""
+        object_, _, _ = StandardName.decompose_name(name)
+        self.discard_parts(name, object_)
+
+    def add_parts(self, name: str, object_: str) -> None:
+        """Add a name, whose object is already known, to the tree."""
+        self.add(object_.split("_"), name)
+
+    def discard_parts(self, name: str, object_: str) -> None:
+        """Remove a name, whose object is already known, from the tree."""
+        self.discard(object_.split("_"), name)
+
+    def add_many_parts(self, parts: Iterable[tuple[str, str]]) -> None:
+        """Add many names, whose objects are already known, to the tree."""
+        self.update((object_.split("_"), name) for name, object_ in parts)
+
+    def discard_many_parts(self, parts: Iterable[tuple[str, str]]) -> None:
+        """Remove many names, whose objects are already known, from the tree."""
+        self.difference_update((object_.split("_"), name) for name, object_ in parts)
+
+    def count(self, prefix: str | Sequence[str] = ()) -> int:
+        """Number of names whose object starts with some tokens."""
+        return super().count(_as_tokens(prefix))
+
+    def children(self, prefix: str | Sequence[str] = ()) -> dict[str, int]:
+        """The tokens that follow a prefix and the number of names under each."""
+        return super().children(_as_tokens(prefix))
+
+    def startswith(self, prefix: str | Sequence[str] = ()) -> set[str]:
+        """Names whose object starts with some tokens."""
+        return super().startswith(_as_tokens(prefix))
+
+    def under(self, prefix: str | Sequence[str] = ()) -> set[str]:
+        """Names whose object starts with some tokens (``prefix_*``)."""
+        return self.startswith(prefix)
+
+    def with_object(self, object_: str) -> set[str]:
+        """Names with exactly this object."""
+        return self.exactly(_as_tokens(object_))
+
+    def objects(self, prefix: str | Sequence[str] = ()) -> set[str]:
+        """Objects that start with some tokens."""
+        return {"_".join(tokens) for tokens, _ in self.items(_as_tokens(prefix))}
+
+
+def _as_tokens(object_: str | Sequence[str]) -> tuple[str, ...]:
+    if isinstance(object_, str):
+        return tuple(object_.split("_")) if object_ else ()
+    return tuple(object_)
+
+
+def _group_by_path(
+    items: Iterable[tuple[Sequence[str], str]],
+) -> dict[tuple[str, ...], set[str]]:
+    paths: dict[tuple[str, ...], set[str]] = defaultdict(set)
+    for tokens, name in items:
+        paths[tuple(tokens)].add(name)
+    return paths
@@ -0,0 +1,188 @@
+"""Validate and decompose arrays of names.
+
+The functions in this module work on whole columns of names, held either
+in NumPy arrays or in Arrow arrays. NumPy and pyarrow are optional
+dependencies and are only imported when arrays of their types are used.
+
+With Arrow arrays, names are validated by Arrow's own (RE2) regular
+expression kernels. With NumPy arrays (or any other sequence of strings),
+each distinct name is validated and decomposed only once. Results for
+sequences that are neither are plain lists, so NumPy isn't needed for them.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+
+from standard_names import standardname
+from standard_names.regex import _WORDS
+from standard_names.standardname import StandardName
+
+if TYPE_CHECKING:
+    import numpy
+    import pyarrow
+
+# The same names as STANDARD_NAME_REGEX, in a form understood by RE2.
+_ARROW_PATTERN = f"^(?P<object>{_WORDS})__(?P<quantity_clause>{_WORDS})$"
+
+
+class DecomposedNames(NamedTuple):
+    """Columns of the parts of an array of names.
+
+    Elements of the part columns that correspond to invalid names are
+    empty (for NumPy) or null (for Arrow).
+    """
+
+    valid: Any
+    object: Any
+    quantity: Any
+    operators: Any
+
+
+def _is_arrow(names: object) -> bool:
+    return type(names).__module__.split(".")[0] == "pyarrow"
+
+
+def _is_numpy(names: object) -> bool:
+    return type(names).__module__.split(".")[0] == "numpy"
+
+
+def _as_strs(names: Iterable[Any]) -> list[str]:
+    tolist = getattr(names, "tolist", None)
+    values = tolist() if tolist is not None else list(names)
+    return [
+        value.decode("utf-8", errors="replace") if isinstance(value, bytes) else value
+        for value in values
+    ]
+
+
+def _verdicts(names: list[str]) -> dict[str, bool]:
+    verdicts = dict.fromkeys(names, False)
+    for name in verdicts:
+        verdicts[name] = isinstance(name, str) and standardname.is_valid_name(name)
+    return verdicts
+
+
+def validate_array(
+    names: numpy.ndarray | pyarrow.Array | pyarrow.ChunkedArray | Iterable[str],
+) -> numpy.ndarray | pyarrow.Array | pyarrow.ChunkedArray:
+    """Check which elements of an array are valid names.
+
+    Parameters
+    ----------
+    names : array_like of str
+        Names as a NumPy array (of ``str``, ``bytes`` or ``object``), an
+        Arrow string array, or a sequence of ``str``.
+
+    Returns
+    -------
+    ndarray or pyarrow.Array or list of bool
+        A boolean mask that is ``True`` for valid names. If *names* is an
+        Arrow array, so is the mask (with nulls taken to be invalid). If it
+        is neither a NumPy nor an Arrow array, the mask is a list.
+
+    Examples
+    --------
+    >>> from standard_names.arrays import validate_array
+    >>> validate_array(["air__temperature", "Air__temperature"])
+    [True, False]
+    """
+    if _is_arrow(names):
+        import pyarrow.compute as pc
+
+        return pc.match_substring_regex(names, _ARROW_PATTERN).fill_null(False)
+
+    strs = _as_strs(names)
+    verdicts = _verdicts(strs)
+    if not _is_numpy(names):
+        return [verdicts[name] for name in strs]
+
+    import numpy as np
+
+    return np.fromiter(map(verdicts.__getitem__, strs), dtype=bool, count=len(strs))
+
+
+def decompose_array(
+    names: numpy.ndarray | pyarrow.Array | pyarrow.ChunkedArray | Iterable[str],
+) -> DecomposedNames:
+    """Split an array of names into columns of their parts.
+
+    Parameters
+    ----------
+    names : array_like of str
+        Names as a NumPy array (of ``str``, ``bytes`` or ``object``), an
+        Arrow string array, or a sequence of ``str``.
+
+    Returns
+    -------
+    DecomposedNames
+        A mask of the valid names along with object, quantity and operator
+        columns. For NumPy, the object and quantity columns are arrays of
+        ``str`` and the operators an ``object`` array of tuples. For Arrow,
+        they are string arrays and a list-of-strings array. For other
+        sequences, they are lists.
+    """
+    if _is_arrow(names):
+        return _decompose_arrow(names)
+
+    strs = _as_strs(names)
+    verdicts = _verdicts(strs)
+    parts = {
+        name: StandardName.decompose_name(name) if is_valid else ("", "", ())
+        for name, is_valid in verdicts.items()
+    }
+
+    if not _is_numpy(names):
+        return DecomposedNames(
+            [verdicts[name] for name in strs],
+            [parts[name][0] for name in strs],
+            [parts[name][1] for name in strs],
+            [parts[name][2] for name in strs],
+        )
+
+    import numpy as np
+
+    valid = np.fromiter(map(verdicts.__getitem__, strs), dtype=bool, count=len(strs))
+    objects = np.array([parts[name][0] for name in strs], dtype=str)
+    quantities = np.array([parts[name][1] for name in strs], dtype=str)
+    operators = np.empty(len(strs), dtype=object)
+    operators[:] = [parts[name][2] for name in strs]
+
+    return DecomposedNames(valid, objects, quantities, operators)
+
+
+def _decompose_arrow(
+    names: pyarrow.Array | pyarrow.ChunkedArray,
+) -> DecomposedNames:
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if isinstance(names, pa.ChunkedArray):
+        names = names.combine_chunks()
+
+    parts = pc.extract_regex(names, _ARROW_PATTERN)
+    valid = parts.is_valid()
+    objects = pc.struct_field(parts, "object")
+
+    # Split the quantity clause on "_of_"; the last piece is the quantity
+    # and the ones before it are the operators.
+    pieces = pc.split_pattern(
+        pc.struct_field(parts, "quantity_clause").fill_null(""), "_of_"
+    )
+    offsets = pieces.offsets.to_numpy()
+    values = pieces.values
+
+    is_last = np.zeros(len(values), dtype=bool)
+    is_last[offsets[1:] - 1] = True
+
+    quantities = pc.if_else(valid, values.filter(pa.array(is_last)), None)
+    operators = pa.ListArray.from_arrays(
+        pa.array(offsets - np.arange(len(offsets)), type=pa.int32()),
+        values.filter(pa.array(~is_last)),
+        mask=pc.invert(valid),
+    )
+
+    return DecomposedNames(valid, objects, quantities, operators)
@@ -11,19 +11,207 @@ snscrape http://csdms.colorado.edu/wiki/CSN_Quantity_Templates \
 """
 from __future__ import annotations
 
+import hashlib
+import os
+import sqlite3
+import time
 from collections.abc import Iterable
+from typing import Any
+from urllib.error import HTTPError
+from urllib.request import Request
 from urllib.request import urlopen
 
 from standard_names.registry import NamesRegistry
 
+_CACHE_SCHEMA = """
+create table scrape_cache (
+    source   text primary key,
+    digest   text,
+    etag     text,
+    names    text,
+    size     integer,
+    accessed real
+);
+""".strip()
 
-def scrape_names(files: Iterable[str]) -> NamesRegistry:
+# Version of the cache's schema, kept as the database's user_version.
+_CACHE_VERSION = 1
+
+
+class ScrapeCacheError(RuntimeError):
+
+    """Error to indicate a file that is not a scrape cache."""
+
+    pass
+
+
+class ScrapeCache:
+
+    """A persistent cache of the names found in scraped inputs.
+
+    Each input (a file path or a URL) is stored along with a digest of its
+    contents, the ETag the server gave for it (if any), and the names found
+    in it.
+    When the cache grows beyond *max_size* bytes of names, the least
+    recently used entries are evicted.
+
+    A new cache is created if *path* doesn't exist (or is an empty
+    database). Any other file that isn't a scrape cache is left untouched,
+    and a :class:`ScrapeCacheError` is raised.
+
+    Parameters
+    ----------
+    path : str
+        Path to the cache database.
+    max_size : int, optional
+        Maximum size, in bytes, of the names held in the cache.
+
+    Examples
+    --------
+    >>> from standard_names.cli._scrape import ScrapeCache
+
+    >>> with ScrapeCache(":memory:", max_size=40) as cache:
+    ...     cache.store("a.txt", "1", {"air__temperature"})
+    ...     cache.store("b.txt", "2", {"water__temperature"})
+    ...     cache.store("c.txt", "3", {"soil__depth"})
+    ...     cache.lookup("a.txt"), cache.lookup("c.txt")
+    (None, ('3', {'soil__depth'}))
+    """
+
+    def __init__(self, path: str, max_size: int = 64 * 2**20):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._max_size = max_size
+        self._db = sqlite3.connect(path)
+        try:
+            tables = self._db.execute("SELECT name FROM sqlite_master").fetchall()
+            version = self._db.execute("PRAGMA user_version").fetchone()[0]
+            if not tables and version == 0:
+                self._db.execute(_CACHE_SCHEMA)
+                self._db.execute(f"PRAGMA user_version = {_CACHE_VERSION}")
+            elif ("scrape_cache",) not in tables or version != _CACHE_VERSION:
+                raise ScrapeCacheError(f"{path}: not a scrape cache")
+        except sqlite3.DatabaseError as error:
+            self._db.close()
+            raise ScrapeCacheError(f"{path}: not a scrape cache ({error})") from None
+        except ScrapeCacheError:
+            self._db.close()
+            raise
+
+    def __enter__(self) -> ScrapeCache:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.commit()
+        self._db.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT count(*) FROM scrape_cache").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        """Total size, in bytes, of the names in the cache."""
+        return self._db.execute("SELECT total(size) FROM scrape_cache").fetchone()[0]
+
+    def lookup(self, source: str) -> tuple[str, set[str]] | None:
+        """Get the digest and names cached for an input.
+
+        Parameters
+        ----------
+        source : str
+            Path or URL of the input.
+
+        Returns
+        -------
+        tuple of (str, set of str) or None
+            The digest of the cached input and the names found in it, or
+            ``None`` if the input is not in the cache.
+        """
+        row = self._db.execute(
+            "SELECT digest, names FROM scrape_cache WHERE source = ?", (source,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        self._db.execute(
+            "UPDATE scrape_cache SET accessed = ? WHERE source = ?",
+            (time.time(), source),
+        )
+        digest, names = row
+        return digest, set(names.split()) if names else set()
+
+    def etag(self, source: str) -> str | None:
+        """The ETag cached for an input, if the server gave one."""
+        row = self._db.execute(
+            "SELECT etag FROM scrape_cache WHERE source = ?", (source,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def store(
+        self,
+        source: str,
+        digest: str,
+        names: Iterable[str],
+        etag: str | None = None,
+    ) -> None:
+        """Add the names found in an input to the cache.
+
+        Parameters
+        ----------
+        source : str
+            Path or URL of the input.
+        digest : str
+            Digest of the contents of the input.
+        names : iterable of str
+            Names found in the input.
+        etag : str, optional
+            The ETag the server gave for the input.
+        """
+        text = "\n".join(sorted(names))
+        self._db.execute(
+            "INSERT OR REPLACE INTO scrape_cache VALUES (?, ?, ?, ?, ?, ?)",
+            (source, digest, etag, text, len(text) + 1, time.time()),
+        )
+        self.evict(self._max_size)
+
+    def evict(self, max_size: int) -> None:
+        """Evict least-recently used entries until the cache fits a size.
+
+        Parameters
+        ----------
+        max_size : int
+            Maximum size, in bytes, of the names held in the cache.
+        """
+        excess = self.size - max_size
+        if excess <= 0:
+            return
+
+        sources = []
+        for source, size in self._db.execute(
+            "SELECT source, size FROM scrape_cache ORDER BY accessed, rowid"
+        ):
+            sources.append((source,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._db.executemany("DELETE FROM scrape_cache WHERE source = ?", sources)
+
+
+def scrape_names(
+    files: Iterable[str], cache: ScrapeCache | None = None
+) -> NamesRegistry:
     """Scrape standard names from a file or URL.
 
     Parameters
     ----------
     files : iterable of str
         Files to search for names.
+    cache : ScrapeCache, optional
+        Cache of names found in previously-scraped inputs. Only inputs
+        that are new, or have changed, are searched.
 
     Returns
     -------
@@ -32,7 +220,7 @@ def scrape_names(files: Iterable[str]) -> NamesRegistry:
     """
     registry = NamesRegistry([])
     for file in files:
-        registry |= NamesRegistry(search_file_for_names(file))
+        registry |= NamesRegistry(search_file_for_names(file, cache=cache))
     return registry
 
 
@@ -70,13 +258,52 @@ def find_all_names(lines: Iterable[str], engine: str = "regex") -> set[str]:
     return names
 
 
-def search_file_for_names(path: str) -> set[str]:
-    names = set()
+def search_file_for_names(path: str, cache: ScrapeCache | None = None) -> set[str]:
+    if cache is not None:
+        return _search_file_for_names_cached(path, cache)
+
     if path.startswith(("http://", "https://")):
         with urlopen(path) as response:
-            names = find_all_names(line.decode("utf-8") for line in response)
+            contents = response.read()
+    else:
+        with open(path, "rb") as fp:
+            contents = fp.read()
+
+    return _find_names_in(contents)
+
+
+def _find_names_in(contents: bytes) -> set[str]:
+    return find_all_names(contents.decode("utf-8", errors="replace").splitlines())
+
+
+def _search_file_for_names_cached(path: str, cache: ScrapeCache) -> set[str]:
+    is_url = path.startswith(("http://", "https://"))
+    source = path if is_url else os.path.abspath(path)
+    cached = cache.lookup(source)
+
+    etag = None
+    if is_url:
+        cached_etag = cache.etag(source) if cached else None
+        headers = {"If-None-Match": cached_etag} if cached_etag else {}
+        try:
+            with urlopen(Request(path, headers=headers)) as response:
+                etag = response.headers.get("ETag")
+                contents = response.read()
+        except HTTPError as error:
+            if error.code == 304 and cached:
+                return cached[1]
+            raise
     else:
-        with open(path) as fp:
-            names = find_all_names(fp)
+        with open(path, "rb") as fp:
+            contents = fp.read()
+    digest = hashlib.sha256(contents).hexdigest()
+
+    if cached and cached[0] == digest:
+        if is_url and etag != cache.etag(source):
+            cache.store(source, digest, cached[1], etag=etag)
+        return cached[1]
+
+    names = _find_names_in(contents)
+    cache.store(source, digest, names, etag=etag)
 
     return names
@@ -0,0 +1,476 @@
+"""Serve registries over a local HTTP/JSON protocol.
+
+A long-running server keeps registries loaded so that clients don't pay
+for interpreter startup and registry construction with every request.
+Requests are sent as a JSON object to ``POST /<operation>``, where
+*operation* is one of ``validate``, ``search``, ``match``, or
+``decompose``. The optional ``registry`` key selects which of the loaded
+registries to use (by default, the first one).
+
+Requests that arrive together are answered as a batch so that shared work
+(for instance, several clients validating the same names) is done once.
+
+Examples
+--------
+>>> import threading
+>>> from standard_names.registry import NamesRegistry
+>>> from standard_names.cli._serve import RegistryServer, ServeClient
+
+>>> registry = NamesRegistry(["air__temperature", "water__temperature"])
+>>> server = RegistryServer({"example": registry}, port=0)
+>>> thread = threading.Thread(target=server.serve_forever, daemon=True)
+>>> thread.start()
+
+>>> with ServeClient(port=server.server_port) as client:
+...     client.search("air__temp")
+['air__temperature']
+
+>>> server.shutdown()
+>>> server.server_close()
+"""
+from __future__ import annotations
+
+import http.client
+import json
+import queue
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Hashable
+from collections.abc import Iterable
+from collections.abc import Mapping
+from collections.abc import Sequence
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+
+from standard_names import standardname
+from standard_names.registry import NamesRegistry
+from standard_names.standardname import StandardName
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+OPERATIONS = ("validate", "search", "match", "decompose")
+
+# Largest request body, in bytes, that a server will read.
+MAX_CONTENT_LENGTH = 16 * 1024 * 1024
+
+
+class ServeError(RuntimeError):
+
+    """Error to indicate a bad request to, or a failed response from, a server."""
+
+    pass
+
+
+class RegistryService:
+
+    """Answer requests against one or more registries.
+
+    Parameters
+    ----------
+    registries : mapping of str to NamesRegistry
+        Registries to serve, keyed by name. The first is the default.
+
+    Examples
+    --------
+    >>> from standard_names.registry import NamesRegistry
+    >>> from standard_names.cli._serve import RegistryService
+
+    >>> service = RegistryService({"example": NamesRegistry("air__temperature")})
+    >>> service.handle("validate", {"names": ["air__temperature", "air_temp"]})
+    ...     # doctest: +NORMALIZE_WHITESPACE
+    {'results': [{'name': 'air__temperature', 'valid': True, 'registered': True},
+                 {'name': 'air_temp', 'valid': False, 'registered': False}]}
+    >>> service.handle("decompose", {"names": ["air__log_of_temperature"]})
+    ...     # doctest: +NORMALIZE_WHITESPACE
+    {'results': [{'name': 'air__log_of_temperature', 'object': 'air',
+                  'quantity': 'temperature', 'operators': ['log']}]}
+    >>> service.handle("match", {"pattern": "air*", "registry": "missing"})
+    {'error': "unknown registry: 'missing'"}
+    """
+
+    def __init__(self, registries: Mapping[str, NamesRegistry]):
+        if not registries:
+            raise ValueError("no registries to serve")
+        self._registries = dict(registries)
+        self._default = next(iter(self._registries))
+
+    @property
+    def registries(self) -> tuple[str, ...]:
+        """Names of the registries being served, the default first."""
+        return tuple(self._registries)
+
+    def handle(self, op: str, params: Mapping[str, Any]) -> dict[str, Any]:
+        """Answer a single request."""
+        return self.handle_batch([(op, params)])[0]
+
+    def handle_batch(
+        self, requests: Sequence[tuple[str, Mapping[str, Any]]]
+    ) -> list[dict[str, Any]]:
+        """Answer a batch of requests.
+
+        Work shared by requests in the batch, such as validating or
+        decomposing the same name or running the same query, is done once.
+
+        Parameters
+        ----------
+        requests : sequence of (str, mapping)
+            Operations and their parameters.
+
+        Returns
+        -------
+        list of dict
+            Responses, in the same order as the requests. Responses to bad
+            requests contain only an ``error`` message.
+        """
+        cache: dict[Hashable, Any] = {}
+        responses = []
+        for op, params in requests:
+            try:
+                responses.append(self._answer(op, params, cache))
+            except ServeError as error:
+                responses.append({"error": str(error)})
+        return responses
+
+    def _answer(
+        self, op: str, params: Mapping[str, Any], cache: dict[Hashable, Any]
+    ) -> dict[str, Any]:
+        if not isinstance(params, Mapping):
+            raise ServeError("request must be a JSON object")
+
+        key = params.get("registry") or self._default
+        try:
+            registry = self._registries[key]
+        except (KeyError, TypeError):
+            raise ServeError(f"unknown registry: {key!r}") from None
+
+        if op == "validate":
+            return {
+                "results": [
+                    _cached(cache, (key, op, name), _validate, registry, name)
+                    for name in _get_names(params)
+                ]
+            }
+        elif op == "decompose":
+            return {
+                "results": [
+                    _cached(cache, (op, name), _decompose, name)
+                    for name in _get_names(params)
+                ]
+            }
+        elif op == "search":
+            name = _get_str(params, "name")
+            return {"results": _cached(cache, (key, op, name), _search, registry, name)}
+        elif op == "match":
+            pattern = _get_str(params, "pattern")
+            return {
+                "results": _cached(cache, (key, op, pattern), _match, registry, pattern)
+            }
+        else:
+            raise ServeError(
+                f"unknown operation: {op!r} is not one of"
+                f" {', '.join(repr(op) for op in OPERATIONS)}"
+            )
+
+
+def _cached(
+    cache: dict[Hashable, Any], key: Hashable, func: Callable[..., Any], *args: Any
+) -> Any:
+    try:
+        return cache[key]
+    except KeyError:
+        value = cache[key] = func(*args)
+        return value
+
+
+def _get_names(params: Mapping[str, Any]) -> list[str]:
+    names = params.get("names")
+    if isinstance(names, str):
+        names = [names]
+    if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+        raise ServeError("'names' must be a list of strings")
+    return names
+
+
+def _get_str(params: Mapping[str, Any], key: str) -> str:
+    value = params.get(key)
+    if not isinstance(value, str):
+        raise ServeError(f"{key!r} must be a string")
+    return value
+
+
+def _validate(registry: NamesRegistry, name: str) -> dict[str, Any]:
+    return {
+        "name": name,
+        "valid": standardname.is_valid_name(name),
+        "registered": name in registry,
+    }
+
+
+def _decompose(name: str) -> dict[str, Any] | None:
+    if not standardname.is_valid_name(name):
+        return None
+    object_, quantity, operators = StandardName.decompose_name(name)
+    return {
+        "name": name,
+        "object": object_,
+        "quantity": quantity,
+        "operators": list(operators),
+    }
+
+
+def _search(registry: NamesRegistry, name: str) -> list[str]:
+    return sorted(registry.search(name))
+
+
+def _match(registry: NamesRegistry, pattern: str) -> list[str]:
+    return sorted(registry.match(pattern))
+
+
+class _Batcher:
+
+    """Collect requests from many threads and answer them in batches.
+
+    Requests that are queued while a batch is being answered make up the
+    next batch. If *window* is greater than zero, the batcher also waits
+    that many seconds after the first request of a batch for others.
+    """
+
+    def __init__(
+        self, service: RegistryService, window: float = 0.0, max_size: int = 1024
+    ):
+        self._service = service
+        self._window = window
+        self._max_size = max_size
+        self._queue: queue.SimpleQueue[
+            tuple[str, Mapping[str, Any], Future[dict[str, Any]]] | None
+        ] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, op: str, params: Mapping[str, Any]) -> Future[dict[str, Any]]:
+        future: Future[dict[str, Any]] = Future()
+        self._queue.put((op, params, future))
+        return future
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            batch = [item]
+            deadline = time.monotonic() + self._window
+            while len(batch) < self._max_size:
+                try:
+                    timeout = deadline - time.monotonic()
+                    if timeout > 0.0:
+                        item = self._queue.get(timeout=timeout)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+
+            try:
+                responses = self._service.handle_batch(
+                    [(op, params) for op, params, _ in batch]
+                )
+            except Exception:
+                # Answer each request on its own, so that only the requests
+                # that fail get an error.
+                for op, params, future in batch:
+                    try:
+                        future.set_result(self._service.handle(op, params))
+                    except Exception as error:
+                        future.set_exception(error)
+            else:
+                for (_, _, future), response in zip(batch, responses):
+                    future.set_result(response)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: RegistryServer
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/registries":
+            self._send(200, {"registries": list(self.server.service.registries)})
+        else:
+            self._send(404, {"error": f"not found: {self.path}"})
+
+    def do_POST(self) -> None:
+        op = self.path.strip("/")
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send(400, {"error": "Content-Length is not a valid length"})
+            return
+        if length > MAX_CONTENT_LENGTH:
+            self.close_connection = True
+            self._send(
+                413,
+                {"error": f"request body is larger than {MAX_CONTENT_LENGTH} bytes"},
+            )
+            return
+
+        try:
+            params = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "request body is not valid JSON"})
+            return
+
+        if op not in OPERATIONS:
+            self._send(404, {"error": f"not found: {self.path}"})
+            return
+
+        try:
+            response = self.server.batcher.submit(op, params).result()
+        except Exception as error:
+            self._send(500, {"error": f"internal error: {error!r}"})
+        else:
+            self._send(400 if "error" in response else 200, response)
+
+    def _send(self, status: int, body: Mapping[str, Any]) -> None:
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class RegistryServer(ThreadingHTTPServer):
+
+    """An HTTP server that answers requests against loaded registries.
+
+    Parameters
+    ----------
+    registries : mapping of str to NamesRegistry
+        Registries to serve, keyed by name. The first is the default.
+    host : str, optional
+        Address to bind to.
+    port : int, optional
+        Port to listen on. Use 0 to pick any free port.
+    window : float, optional
+        Seconds to wait for more requests before answering a batch.
+    verbose : bool, optional
+        Log requests to stderr.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        registries: Mapping[str, NamesRegistry],
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        window: float = 0.0,
+        verbose: bool = False,
+    ):
+        self.service = RegistryService(registries)
+        self.verbose = verbose
+        super().__init__((host, port), _RequestHandler)
+        self.batcher = _Batcher(self.service, window=window)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.batcher.close()
+
+
+class ServeClient:
+
+    """A client for a registry server.
+
+    Parameters
+    ----------
+    host : str, optional
+        Address of the server.
+    port : int, optional
+        Port the server is listening on.
+    registry : str, optional
+        Registry to send requests to. By default, the server's default.
+    timeout : float, optional
+        Seconds to wait for a response.
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        registry: str | None = None,
+        timeout: float = 10.0,
+    ):
+        self._registry = registry
+        self._connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def __enter__(self) -> ServeClient:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def registries(self) -> list[str]:
+        """Names of the registries on the server, the default first."""
+        return self._request("GET", "/registries")["registries"]
+
+    def validate(self, names: str | Iterable[str]) -> list[dict[str, Any]]:
+        """Check if names are valid and if they are in the registry."""
+        return self._call("validate", names=_as_list(names))
+
+    def decompose(self, names: str | Iterable[str]) -> list[dict[str, Any] | None]:
+        """Decompose names into their parts (``None`` for invalid names)."""
+        return self._call("decompose", names=_as_list(names))
+
+    def search(self, name: str) -> list[str]:
+        """Fuzzy search the registry for a name."""
+        return self._call("search", name=name)
+
+    def match(self, pattern: str) -> list[str]:
+        """Search the registry for names that match a glob-style pattern."""
+        return self._call("match", pattern=pattern)
+
+    def _call(self, op: str, **params: Any) -> Any:
+        if self._registry is not None:
+            params["registry"] = self._registry
+        return self._request("POST", f"/{op}", params)["results"]
+
+    def _request(
+        self, method: str, path: str, body: Mapping[str, Any] | None = None
+    ) -> dict[str, Any]:
+        content = None if body is None else json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": "application/json"} if content else {}
+
+        try:
+            self._connection.request(method, path, body=content, headers=headers)
+            response = self._connection.getresponse()
+        except (ConnectionError, http.client.HTTPException):
+            self._connection.close()
+            self._connection.request(method, path, body=content, headers=headers)
+            response = self._connection.getresponse()
+
+        reply = json.loads(response.read())
+        if response.status != 200:
+            raise ServeError(reply.get("error", f"server error ({response.status})"))
+        return reply
+
+
+def _as_list(names: str | Iterable[str]) -> list[str]:
+    return [names] if isinstance(names, str) else list(names)
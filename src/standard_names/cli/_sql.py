@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 
+from standard_names.registry import MergedNamesRegistry
 from standard_names.registry import NamesRegistry
 
 _NAMES_SCHEMA = """
@@ -27,10 +28,26 @@ create table operators (
 );
 """.strip()
 
+_SOURCES_SCHEMA = """
+create table sources (
+    id       integer primary key,
+    name     text,
+    unique(name)
+);
+create table name_sources (
+    name_id     integer references names(id),
+    source_id   integer references sources(id),
+    primary key(name_id, source_id)
+);
+""".strip()
+
 
 def as_sql_commands(names: NamesRegistry, newline: str = os.linesep) -> str:
     """Create an sql database from a NamesRegistry.
 
+    The names of a :class:`~standard_names.registry.MergedNamesRegistry`
+    also get a table of their sources, and one linking names to sources.
+
     Parameters
     ----------
     names : NamesRegistry
@@ -77,12 +94,25 @@ def as_sql_commands(names: NamesRegistry, newline: str = os.linesep) -> str:
     );
     INSERT INTO "quantities" VALUES(1,'temperature');
     COMMIT;
+
+    >>> from standard_names.registry import MergedNamesRegistry
+    >>> names = MergedNamesRegistry({"a.txt": ["air__temperature"]})
+    >>> for line in as_sql_commands(names).splitlines():
+    ...     if line.startswith("INSERT"):
+    ...         print(line)
+    INSERT INTO "name_sources" VALUES(1,1);
+    INSERT INTO "names" VALUES(1,'air__temperature');
+    INSERT INTO "objects" VALUES(1,'air');
+    INSERT INTO "quantities" VALUES(1,'temperature');
+    INSERT INTO "sources" VALUES(1,'a.txt');
     """
     from contextlib import closing
     from sqlite3 import connect
 
     with closing(connect(":memory:")) as db:
         db.cursor().executescript(_NAMES_SCHEMA)
+        if isinstance(names, MergedNamesRegistry):
+            db.cursor().executescript(_SOURCES_SCHEMA)
 
         c = db.cursor()
 
@@ -94,6 +124,21 @@ def as_sql_commands(names: NamesRegistry, newline: str = os.linesep) -> str:
             c.execute("INSERT INTO quantities(name) VALUES ('%s');" % name)
         for name in names.operators:
             c.execute("INSERT INTO operators(name) VALUES ('%s');" % name)
+        if isinstance(names, MergedNamesRegistry):
+            c.executemany(
+                "INSERT INTO sources(name) VALUES (?);",
+                [(source,) for source in names.sources],
+            )
+            c.executemany(
+                "INSERT INTO name_sources(name_id, source_id)"
+                " SELECT names.id, sources.id FROM names, sources"
+                " WHERE names.name = ? AND sources.name = ?;",
+                [
+                    (name, source)
+                    for name in names.names
+                    for source in names.sources_of(name)
+                ],
+            )
         db.commit()
 
         commands = newline.join(db.iterdump())
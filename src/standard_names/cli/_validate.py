@@ -2,15 +2,20 @@
 """Validate a list of names."""
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import Iterable
+from typing import IO
+from typing import cast
 
-from standard_names.error import BadRegistryError
-from standard_names.registry import NamesRegistry
+from standard_names import standardname
+from standard_names._scan import scan_file
 
 
-def validate_names(names: Iterator[str]) -> set[str]:
+def validate_names(names: Iterable[str] | IO[str] | IO[bytes]) -> set[str]:
     """Find invalid names.
 
+    Files are checked all at once (see :mod:`standard_names._scan`), and
+    other iterables one line at a time.
+
     Examples
     --------
     >>> import os
@@ -33,11 +38,13 @@ def validate_names(names: Iterator[str]) -> set[str]:
     >>> sorted(invalid_names)
     ['Water__temperature', 'water_temperature']
     """
-    try:
-        NamesRegistry(names)
-    except BadRegistryError as err:
-        invalid_names = set(err.names)
-    else:
-        invalid_names = set()
-
+    if hasattr(names, "read"):
+        _, bad_names = scan_file(cast("IO[str] | IO[bytes]", names), with_names=False)
+        return set(bad_names)
+
+    invalid_names = set()
+    for name in names:
+        name = name.strip()
+        if name and not standardname.is_valid_name(name):
+            invalid_names.add(name)
     return invalid_names
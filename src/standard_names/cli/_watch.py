@@ -0,0 +1,226 @@
+"""Watch names files and revalidate them as they change."""
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Callable
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from standard_names._scan import scan_bad_names
+
+# Size of the blocks that files are compared in, when looking for changes.
+_BLOCK_SIZE = 1 << 16
+
+
+class WatchReport(NamedTuple):
+    """Result of revalidating a changed file."""
+
+    path: str
+    invalid: list[tuple[int, str]]
+    n_lines: int
+    n_checked: int
+    seconds: float
+    removed: bool = False
+
+
+class _FileState:
+    def __init__(self) -> None:
+        self.stat: tuple[int, int] | None = None
+        self.contents: bytes | None = None
+        self.bad_names: list[tuple[int, str]] = []
+        self.invalid: list[tuple[int, str]] = []
+
+
+class NamesWatcher:
+
+    """Keep track of the invalid names in a set of files.
+
+    Files are polled for changes, first by modification time and size, and
+    then by comparing their contents with what they were. When a file
+    changes, only the lines between the part at its start, and the part at
+    its end, that didn't change are checked again, in the same way as
+    ``validate`` checks a file (see :mod:`standard_names._scan`).
+
+    Parameters
+    ----------
+    paths : iterable of str
+        Names files to watch.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> from standard_names.cli._watch import NamesWatcher
+
+    >>> path = os.path.join(tempfile.mkdtemp(), "names.txt")
+    >>> with open(path, "w") as fp:
+    ...     _ = fp.write("air__temperature\\nWater__temperature\\n")
+
+    >>> watcher = NamesWatcher([path])
+    >>> [report.invalid for report in watcher.poll()]
+    [[(2, 'Water__temperature')]]
+    >>> watcher.poll()
+    []
+
+    >>> with open(path, "a") as fp:
+    ...     _ = fp.write("water__temperature\\n")
+    >>> os.utime(path, ns=(0, 0))
+    >>> [(report.n_lines, report.n_checked) for report in watcher.poll()]
+    [(3, 1)]
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self._files = {path: _FileState() for path in paths}
+
+    @property
+    def paths(self) -> tuple[str, ...]:
+        """Paths of the watched files."""
+        return tuple(self._files)
+
+    @property
+    def invalid_names(self) -> dict[str, list[tuple[int, str]]]:
+        """Line numbers and invalid names in each file, as of the last poll."""
+        return {path: list(state.invalid) for path, state in self._files.items()}
+
+    def poll(self) -> list[WatchReport]:
+        """Revalidate files that have changed since the last poll.
+
+        Returns
+        -------
+        list of WatchReport
+            Reports for the files that changed.
+        """
+        reports = []
+        for path, state in self._files.items():
+            report = self._update(path, state)
+            if report is not None:
+                reports.append(report)
+        return reports
+
+    def watch(
+        self, callback: Callable[[WatchReport], None], interval: float = 0.5
+    ) -> None:
+        """Poll files forever, calling *callback* for each change.
+
+        Parameters
+        ----------
+        callback : callable
+            Function called with the report for each changed file.
+        interval : float, optional
+            Seconds to wait between polls.
+        """
+        while True:
+            for report in self.poll():
+                callback(report)
+            time.sleep(interval)
+
+    def _update(self, path: str, state: _FileState) -> WatchReport | None:
+        start = time.perf_counter()
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if state.stat is None:
+                return None
+            self._files[path] = _FileState()
+            return WatchReport(path, [], 0, 0, time.perf_counter() - start, True)
+
+        if state.stat == (stat.st_mtime_ns, stat.st_size):
+            return None
+        state.stat = (stat.st_mtime_ns, stat.st_size)
+
+        with open(path, "rb") as fp:
+            contents = fp.read()
+        old = state.contents if state.contents is not None else b""
+        if state.contents is not None and contents == old:
+            return None
+
+        # Only the lines between an unchanged head and tail are checked.
+        head = _common_prefix(old, contents)
+        head = contents.rfind(b"\n", 0, head) + 1
+        tail = _common_suffix(old, contents, min(len(old), len(contents)) - head)
+        if not (
+            _at_line_start(contents, len(contents) - tail)
+            and _at_line_start(old, len(old) - tail)
+        ):
+            eol = contents.find(b"\n", len(contents) - tail)
+            tail = 0 if eol < 0 else len(contents) - eol - 1
+        shift = len(contents) - len(old)
+
+        bad_names = [entry for entry in state.bad_names if entry[0] < head]
+        bad_names += scan_bad_names(contents, head, len(contents) - tail)
+        bad_names += [
+            (offset + shift, name)
+            for offset, name in state.bad_names
+            if offset >= len(old) - tail
+        ]
+
+        invalid = []
+        lineno, last = 1, 0
+        for offset, name in bad_names:
+            lineno += contents.count(b"\n", last, offset)
+            last = offset
+            invalid.append((lineno, name))
+
+        state.contents = contents
+        state.bad_names = bad_names
+        state.invalid = invalid
+
+        return WatchReport(
+            path,
+            invalid,
+            _count_lines(contents),
+            _count_lines(contents[head : len(contents) - tail]),
+            time.perf_counter() - start,
+        )
+
+
+def _count_lines(contents: bytes) -> int:
+    return contents.count(b"\n") + (not contents.endswith(b"\n") and bool(contents))
+
+
+def _at_line_start(contents: bytes, index: int) -> bool:
+    return index == 0 or contents[index - 1] == ord("\n")
+
+
+def _common_prefix(a: bytes, b: bytes) -> int:
+    """Length of the longest common prefix of two strings of bytes."""
+    size = min(len(a), len(b))
+    start = 0
+    while start < size:
+        stop = min(start + _BLOCK_SIZE, size)
+        if a[start:stop] != b[start:stop]:
+            break
+        start = stop
+    else:
+        return size
+
+    # The first difference is somewhere in [start, stop).
+    while stop - start > 1:
+        middle = (start + stop) // 2
+        if a[start:middle] == b[start:middle]:
+            start = middle
+        else:
+            stop = middle
+    return start
+
+
+def _common_suffix(a: bytes, b: bytes, limit: int) -> int:
+    """Length of the longest common suffix of two strings of bytes, up to *limit*."""
+    length = 0
+    while length < limit:
+        stop = min(length + _BLOCK_SIZE, limit)
+        if a[len(a) - stop : len(a) - length] != b[len(b) - stop : len(b) - length]:
+            break
+        length = stop
+    else:
+        return limit
+
+    # The last difference is somewhere in the last [length, stop) bytes.
+    while stop - length > 1:
+        middle = (length + stop) // 2
+        if a[len(a) - middle : len(a) - length] == b[len(b) - middle : len(b) - length]:
+            length = middle
+        else:
+            stop = middle
+    return length
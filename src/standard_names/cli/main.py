@@ -1,15 +1,23 @@
 from __future__ import annotations
 
 import argparse
+import itertools
 import os
 import sys
+from collections.abc import Iterable
+from collections.abc import Iterator
 
 from standard_names._format import FORMATTERS
 from standard_names._version import __version__
-from standard_names.cli._scrape import scrape_names
-from standard_names.cli._sql import as_sql_commands
-from standard_names.cli._validate import validate_names
-from standard_names.registry import NamesRegistry
+
+# The same as standard_names.normalize.RULES, which isn't imported here to
+# keep the cli quick to start.
+NORMALIZE_RULES = (
+    "collapse_separators",
+    "double_underscore",
+    "canonical_of",
+    "lowercase_first_letter",
+)
 
 VALID_FIELDS = {
     "op": "operators",
@@ -32,6 +40,11 @@ def main(argv: tuple[str] | None = None) -> int:
     parser.add_argument(
         "--version", action="version", version=f"standard-names {__version__}"
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a summary of time spent in registry operations to stderr",
+    )
     subparsers = parser.add_subparsers(dest="command")
 
     def _add_cmd(name: str, *, help: str) -> argparse.ArgumentParser:
@@ -56,6 +69,11 @@ def main(argv: tuple[str] | None = None) -> int:
         type=argparse.FileType("r"),
         help="YAML file describing model exchange items",
     )
+    build_parser.add_argument(
+        "--sources",
+        action="store_true",
+        help="Also list the files each name was found in",
+    )
     build_parser.set_defaults(func=build)
 
     dump_parser = _add_cmd("dump", help="Dump known standard names")
@@ -76,20 +94,136 @@ def main(argv: tuple[str] | None = None) -> int:
     dump_parser.add_argument(
         "--format", choices=FORMATTERS, default="text", help="Output format"
     )
+    dump_parser.add_argument(
+        "--sources",
+        action="store_true",
+        help="Print each name along with the files it was found in",
+    )
     dump_parser.set_defaults(func=dump)
 
+    lint_parser = _add_cmd(
+        "lint", help="Check names against the vocabulary of a registry"
+    )
+    lint_parser.add_argument(
+        "file", type=argparse.FileType("r"), nargs="*", help="Read names from a file"
+    )
+    lint_parser.add_argument(
+        "--registry",
+        metavar="PATH",
+        help="Names file of known names (default: the latest bundled registry)",
+    )
+    lint_parser.add_argument(
+        "--processes", type=int, default=None, help="Number of worker processes"
+    )
+    lint_parser.set_defaults(func=lint)
+
+    normalize_parser = _add_cmd(
+        "normalize", help="Turn almost-valid names into standard names"
+    )
+    normalize_parser.add_argument(
+        "file", type=argparse.FileType("r"), nargs="*", help="Read names from a file"
+    )
+    normalize_parser.add_argument(
+        "--rule",
+        action="append",
+        default=[],
+        choices=NORMALIZE_RULES,
+        help="Rule to apply (default: all of them)",
+    )
+    normalize_parser.add_argument(
+        "--registry",
+        metavar="PATH",
+        help="Names file to check candidates against"
+        " (default: the latest bundled registry)",
+    )
+    normalize_parser.add_argument(
+        "--no-registry",
+        action="store_true",
+        help="Don't check candidates against a registry",
+    )
+    normalize_parser.add_argument(
+        "--min-confidence",
+        type=float,
+        default=0.0,
+        help="Don't report candidates with less confidence than this",
+    )
+    normalize_parser.add_argument(
+        "--processes", type=int, default=None, help="Number of worker processes"
+    )
+    normalize_parser.set_defaults(func=normalize)
+
     scrape_parser = _add_cmd("scrape", help="Scrape standard names from a file or URL")
     scrape_parser.add_argument(
         "file", nargs="*", metavar="FILE", help="URL or file to scrape"
     )
+    scrape_parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="Cache database (e.g. ~/.cache/standard_names/scrape.sqlite), so"
+        " that only inputs that have changed since they were last scraped are"
+        " scanned",
+    )
+    scrape_parser.add_argument(
+        "--cache-size",
+        type=float,
+        default=64.0,
+        metavar="MB",
+        help="Maximum size of the scrape cache",
+    )
     scrape_parser.set_defaults(func=scrape)
 
+    serve_parser = _add_cmd(
+        "serve", help="Serve registries for validate, search, match and decompose"
+    )
+    serve_parser.add_argument(
+        "file",
+        nargs="*",
+        help="Names file to serve (default: the latest bundled registry)",
+    )
+    # Defaults are filled in by serve, so that _serve isn't imported here.
+    serve_parser.add_argument("--host", help="Address to bind to")
+    serve_parser.add_argument("--port", type=int, help="Port to listen on")
+    serve_parser.add_argument(
+        "--batch-window",
+        type=float,
+        default=0.0,
+        metavar="MS",
+        help="Milliseconds to wait for more requests before answering a batch",
+    )
+    serve_parser.set_defaults(func=serve)
+
     sql_parser = _add_cmd("sql", help="Build an sqlite database from a list of names")
     sql_parser.add_argument(
         "file", nargs="*", type=argparse.FileType("r"), help="List of names"
     )
+    sql_parser.add_argument(
+        "--sources",
+        action="store_true",
+        help="Also create tables of the files each name was found in",
+    )
     sql_parser.set_defaults(func=sql)
 
+    tree_parser = _add_cmd("tree", help="Print the tree of objects of a list of names")
+    tree_parser.add_argument(
+        "file",
+        nargs="*",
+        type=argparse.FileType("r"),
+        help="Read names from a file (default: the latest bundled registry)",
+    )
+    tree_parser.add_argument(
+        "--root",
+        default="",
+        metavar="OBJECT",
+        help="Only print the subtree of objects that start with OBJECT",
+    )
+    tree_parser.add_argument(
+        "--depth", type=int, default=None, help="Number of levels of tokens to print"
+    )
+    tree_parser.add_argument(
+        "--names", action="store_true", help="Also print the names under each object"
+    )
+    tree_parser.set_defaults(func=tree)
+
     validate_parser = _add_cmd("validate", help="Validate a list of standard names")
     validate_parser.add_argument(
         "file",
@@ -97,71 +231,346 @@ def main(argv: tuple[str] | None = None) -> int:
         nargs="*",
         help="Read names from a file",
     )
+    validate_parser.add_argument(
+        "--suggest",
+        nargs="?",
+        type=int,
+        const=3,
+        default=0,
+        metavar="K",
+        help="Suggest up to K registered names for each invalid name",
+    )
+    validate_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and revalidate files as they change",
+    )
+    validate_parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Seconds between checks for changed files (with --watch)",
+    )
     validate_parser.set_defaults(func=validate)
 
     args = parser.parse_args(argv)
 
+    if args.profile:
+        from standard_names import _stats
+
+        _stats.reset()
+        _stats.enable()
+
     try:
         return args.func(args)
     except FatalError as err:
         print(err, file=sys.stderr)
         return 1
+    finally:
+        if args.profile:
+            _stats.disable()
+            print(_stats.summary(), file=sys.stderr)
 
 
 def build(args: argparse.Namespace) -> int:
-    registry = NamesRegistry()
-    for file in args.file:
-        registry |= NamesRegistry(file)
-
-    print(
+    from standard_names.registry import MergedNamesRegistry
+    from standard_names.registry import NamesRegistry
+
+    # Names are read once, from all files; sorting them all when dumping is
+    # quicker than keeping a SortedNamesRegistry sorted as they're added.
+    registry: NamesRegistry
+    if args.sources:
+        registry = MergedNamesRegistry((file.name, file) for file in args.file)
+    else:
+        registry = NamesRegistry(itertools.chain.from_iterable(args.file))
+
+    sections = [
         registry.dumps(
             format_="yaml",
             fields=("names", "objects", "quantities", "operators"),
             sort=True,
         )
-    )
+    ]
+    if isinstance(registry, MergedNamesRegistry):
+        lines = ["sources:"]
+        for name in sorted(registry):
+            lines.append(f"  {name}:")
+            lines += [f"    - {source}" for source in registry.sources_of(name)]
+        sections.append(os.linesep.join(lines))
+    print((2 * os.linesep).join(sections))
 
     return 0
 
 
 def dump(args: argparse.Namespace) -> int:
+    from standard_names.registry import NamesRegistry
+
+    if args.sources:
+        return _dump_sources(args)
+
     fields = [VALID_FIELDS[field] for field in args.field]
 
-    registry = NamesRegistry([])
-    for file in args.file:
-        registry |= NamesRegistry(file)
+    registry = NamesRegistry(itertools.chain.from_iterable(args.file))
     print(registry.dumps(format_=args.format, sort=args.sort, fields=fields))
 
     return 0
 
 
+def _dump_sources(args: argparse.Namespace) -> int:
+    from standard_names.registry import MergedNamesRegistry
+
+    registry = MergedNamesRegistry((file.name, file) for file in args.file)
+    print(
+        os.linesep.join(
+            f"{name}: {', '.join(registry.sources_of(name))}"
+            for name in sorted(registry)
+        )
+    )
+
+    return 0
+
+
+def _names_in(files: Iterable[Iterable[str]]) -> Iterator[str]:
+    """Names, one per line, from files, skipping blank lines."""
+    for line in itertools.chain.from_iterable(files):
+        name = line.strip()
+        if name:
+            yield name
+
+
+def lint(args: argparse.Namespace) -> int:
+    from standard_names.lint import Linter
+    from standard_names.registry import NamesRegistry
+
+    if args.registry:
+        reference = NamesRegistry.from_path(args.registry)
+    else:
+        reference = NamesRegistry.from_latest()
+
+    n_issues = 0
+    for name, issues in Linter(reference).lint_many(
+        _names_in(args.file), processes=args.processes
+    ):
+        for issue in issues:
+            print(f"{name}: {issue.message}")
+        n_issues += len(issues)
+
+    if not args.silent and n_issues:
+        print(f"found {n_issues} issue(s)", file=sys.stderr)
+
+    return 1 if n_issues else 0
+
+
+def normalize(args: argparse.Namespace) -> int:
+    from standard_names.normalize import Normalizer
+    from standard_names.registry import NamesRegistry
+
+    if args.no_registry:
+        registry = None
+    elif args.registry:
+        registry = NamesRegistry.from_path(args.registry)
+    else:
+        registry = NamesRegistry.from_latest()
+    normalizer = Normalizer(registry, rules=args.rule or None)
+
+    n_failed = 0
+    for result in normalizer.normalize_many(
+        _names_in(args.file), processes=args.processes
+    ):
+        if result.candidate is None or result.confidence < args.min_confidence:
+            n_failed += 1
+            print(f"{result.name}\t\t0.000")
+        else:
+            print(f"{result.name}\t{result.candidate}\t{result.confidence:.3f}")
+
+    if not args.silent and n_failed:
+        print(f"unable to normalize {n_failed} name(s)", file=sys.stderr)
+
+    return 1 if n_failed else 0
+
+
 def scrape(args: argparse.Namespace) -> int:
-    registry = scrape_names(args.file)
+    from standard_names.cli._scrape import ScrapeCache
+    from standard_names.cli._scrape import ScrapeCacheError
+    from standard_names.cli._scrape import scrape_names
+
+    if args.cache is not None:
+        try:
+            cache = ScrapeCache(args.cache, max_size=int(args.cache_size * 2**20))
+        except ScrapeCacheError as error:
+            raise FatalError(str(error)) from error
+        with cache:
+            registry = scrape_names(args.file, cache=cache)
+    else:
+        registry = scrape_names(args.file)
     print(registry.dumps(format_="text", fields=("names",)))
 
     return 0
 
 
+def serve(args: argparse.Namespace) -> int:
+    from standard_names.cli._serve import DEFAULT_HOST
+    from standard_names.cli._serve import DEFAULT_PORT
+    from standard_names.cli._serve import RegistryServer
+    from standard_names.registry import NamesRegistry
+
+    host = DEFAULT_HOST if args.host is None else args.host
+    port = DEFAULT_PORT if args.port is None else args.port
+
+    if args.file:
+        registries = {
+            os.path.splitext(os.path.basename(path))[0]: NamesRegistry.from_path(path)
+            for path in args.file
+        }
+    else:
+        registry = NamesRegistry.from_latest()
+        registries = {registry.version: registry}
+
+    try:
+        server = RegistryServer(
+            registries,
+            host=host,
+            port=port,
+            window=args.batch_window / 1000.0,
+            verbose=bool(args.verbose),
+        )
+    except OSError as error:
+        raise FatalError(f"unable to start server: {error}") from error
+
+    if not args.silent:
+        print(
+            f"serving {', '.join(registries)} on"
+            f" http://{host}:{server.server_port}",
+            file=sys.stderr,
+        )
+
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    return 0
+
+
 def sql(args: argparse.Namespace) -> int:
-    registry = NamesRegistry()
-    for file in args.file:
-        registry |= NamesRegistry(file)
+    from standard_names.cli._sql import as_sql_commands
+    from standard_names.registry import MergedNamesRegistry
+    from standard_names.registry import NamesRegistry
+
+    registry: NamesRegistry
+    if args.sources:
+        registry = MergedNamesRegistry((file.name, file) for file in args.file)
+    else:
+        registry = NamesRegistry()
+        for file in args.file:
+            registry |= NamesRegistry(file)
 
     print(as_sql_commands(registry))
 
     return 0
 
 
+def tree(args: argparse.Namespace) -> int:
+    from standard_names.registry import NamesRegistry
+
+    if args.file:
+        registry = NamesRegistry()
+        for file in args.file:
+            registry |= NamesRegistry(file)
+    else:
+        registry = NamesRegistry.from_latest()
+
+    object_tree = registry.object_tree
+    root = tuple(args.root.split("_")) if args.root else ()
+    if object_tree.count(root) == 0:
+        raise FatalError(f"{args.root}: no names with this object")
+
+    lines = []
+    stack = [(root, 0)]
+    while stack:
+        tokens, level = stack.pop()
+        if tokens:
+            lines.append(
+                f"{'  ' * level}{tokens[-1] if level else '_'.join(tokens)}"
+                f" ({object_tree.count(tokens)})"
+            )
+            if args.names:
+                lines += [
+                    f"{'  ' * (level + 1)}{name}"
+                    for name in sorted(object_tree.exactly(tokens))
+                ]
+        if args.depth is None or len(tokens) - len(root) < args.depth:
+            stack.extend(
+                (tokens + (token,), level + 1 if tokens else 0)
+                for token in reversed(object_tree.children(tokens))
+            )
+    print(os.linesep.join(lines))
+
+    return 0
+
+
 def validate(args: argparse.Namespace) -> int:
+    if args.watch:
+        return _watch(args)
+
+    from standard_names.cli._validate import validate_names
+    from standard_names.registry import NamesRegistry
+
     invalid_names = set()
     for file in args.file:
         invalid_names |= validate_names(file)
 
-    if invalid_names:
+    if invalid_names and args.suggest:
+        suggestions = NamesRegistry.from_latest().suggest(invalid_names, k=args.suggest)
+        print(
+            os.linesep.join(
+                f"{name}: {', '.join(suggestions[name])}"
+                for name in sorted(invalid_names)
+            )
+        )
+    elif invalid_names:
         print(os.linesep.join(invalid_names))
 
     return len(invalid_names)
 
 
+def _watch(args: argparse.Namespace) -> int:
+    from standard_names.cli._watch import NamesWatcher
+    from standard_names.cli._watch import WatchReport
+
+    paths = []
+    for file in args.file:
+        file.close()
+        if file is sys.stdin or not os.path.isfile(file.name):
+            raise FatalError(f"{file.name}: unable to watch, not a file")
+        paths.append(file.name)
+
+    def report(change: WatchReport) -> None:
+        if not args.silent:
+            status = (
+                "removed"
+                if change.removed
+                else (
+                    f"{len(change.invalid)} invalid,"
+                    f" {change.n_checked} of {change.n_lines} lines checked"
+                )
+            )
+            print(
+                f"{change.path}: {status} ({change.seconds * 1000.0:.1f} ms)",
+                file=sys.stderr,
+            )
+        for lineno, name in change.invalid:
+            print(f"{change.path}:{lineno}: {name}", flush=True)
+
+    watcher = NamesWatcher(paths)
+    try:
+        watcher.watch(report, interval=args.interval)
+    except KeyboardInterrupt:
+        pass
+
+    return sum(len(invalid) for invalid in watcher.invalid_names.values())
+
+
 if __name__ == "__main__":
     SystemExit(main())
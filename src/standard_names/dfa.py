@@ -0,0 +1,272 @@
+"""Validate standard names with a DFA that reports where, and why, they fail.
+
+A standard name is an object and a quantity separated by a double
+underscore. Each of those is made up of alphanumeric words, separated by
+single ``-``, ``~``, or ``_`` characters, the first of which starts with
+a lowercase letter. This module describes names with a deterministic
+finite automaton (DFA) that, when a name is rejected, knows the offset of
+the first character that can't be part of a valid name, and why.
+
+The DFA is run by matching names against regular expressions for its
+language (and for the prefixes of the names in it) that never backtrack
+by more than a character, so names are checked in linear time, by the
+C regular expression engine, and the transition table is consulted only
+for the character at which the DFA gets stuck.
+
+Reasons that a name is rejected are given as one of the following codes:
+
+* ``empty``: the name is an empty string.
+* ``uppercase_first_letter``: the object or quantity starts with an
+  uppercase letter.
+* ``bad_first_character``: the object or quantity starts with something
+  other than a letter.
+* ``bad_character``: a character that is not a letter, a digit, or a
+  separator.
+* ``bad_separator``: a separator that follows another separator.
+* ``missing_double_underscore``: the name ends before the ``__`` that
+  separates the object from the quantity.
+* ``missing_quantity``: the name ends right after the ``__``.
+* ``extra_double_underscore``: a second ``__``, in the quantity.
+* ``trailing_separator``: the name ends with a separator.
+"""
+from __future__ import annotations
+
+import re
+import string
+from collections.abc import Iterable
+from functools import partial
+from typing import NamedTuple
+from typing import cast
+
+from standard_names.regex import _PREFIX as _PREFIX_PATTERN
+from standard_names.regex import _WORDS
+
+EMPTY = "empty"
+UPPERCASE_FIRST_LETTER = "uppercase_first_letter"
+BAD_FIRST_CHARACTER = "bad_first_character"
+BAD_CHARACTER = "bad_character"
+BAD_SEPARATOR = "bad_separator"
+MISSING_DOUBLE_UNDERSCORE = "missing_double_underscore"
+MISSING_QUANTITY = "missing_quantity"
+EXTRA_DOUBLE_UNDERSCORE = "extra_double_underscore"
+TRAILING_SEPARATOR = "trailing_separator"
+
+MESSAGES = {
+    EMPTY: "name is empty",
+    UPPERCASE_FIRST_LETTER: "must start with a lowercase letter",
+    BAD_FIRST_CHARACTER: "must start with a lowercase letter",
+    BAD_CHARACTER: "only letters, digits, '-', '~' and '_' are allowed",
+    BAD_SEPARATOR: "separators must be followed by a letter or digit",
+    MISSING_DOUBLE_UNDERSCORE: "missing '__' between object and quantity",
+    MISSING_QUANTITY: "missing quantity after '__'",
+    EXTRA_DOUBLE_UNDERSCORE: "only one '__' is allowed",
+    TRAILING_SEPARATOR: "must not end with a separator",
+}
+
+
+class NameDiagnosis(NamedTuple):
+    """Where, and why, a name is not a valid standard name.
+
+    Both fields are ``None`` for a valid name.
+    """
+
+    offset: int | None
+    reason: str | None
+
+    @property
+    def valid(self) -> bool:
+        """``True`` if the name is valid."""
+        return self.reason is None
+
+    @property
+    def message(self) -> str | None:
+        """A description of the problem, or ``None`` for a valid name."""
+        return None if self.reason is None else MESSAGES[self.reason]
+
+
+_VALID = NameDiagnosis(None, None)
+
+# Skips the (Python) __new__ of the named tuple, as a lot of them are made.
+_diagnosis = partial(tuple.__new__, NameDiagnosis)
+
+# Character classes.
+_LOWER, _UPPER, _DIGIT, _UNDERSCORE, _SEPARATOR, _OTHER = range(6)
+
+_CLASSES = dict.fromkeys(string.ascii_lowercase, _LOWER)
+_CLASSES.update(dict.fromkeys(string.ascii_uppercase, _UPPER))
+_CLASSES.update(dict.fromkeys(string.digits, _DIGIT))
+_CLASSES.update({"_": _UNDERSCORE, "-": _SEPARATOR, "~": _SEPARATOR})
+
+# States. The object states come first, then those of the quantity.
+(
+    _START,
+    _OBJECT,
+    _OBJECT_SEPARATOR,
+    _OBJECT_UNDERSCORE,
+    _QUANTITY_START,
+    _QUANTITY,
+    _QUANTITY_SEPARATOR,
+    _QUANTITY_UNDERSCORE,
+) = range(8)
+
+# For each state, the next state for each character class. Strings are the
+# reasons that the character is rejected.
+_TRANSITIONS: tuple[tuple[int | str, ...], ...] = (
+    # lower, upper, digit, underscore, separator, other
+    (
+        _OBJECT,
+        UPPERCASE_FIRST_LETTER,
+        BAD_FIRST_CHARACTER,
+        BAD_FIRST_CHARACTER,
+        BAD_FIRST_CHARACTER,
+        BAD_CHARACTER,
+    ),
+    (_OBJECT, _OBJECT, _OBJECT, _OBJECT_UNDERSCORE, _OBJECT_SEPARATOR, BAD_CHARACTER),
+    (_OBJECT, _OBJECT, _OBJECT, BAD_SEPARATOR, BAD_SEPARATOR, BAD_CHARACTER),
+    (_OBJECT, _OBJECT, _OBJECT, _QUANTITY_START, BAD_SEPARATOR, BAD_CHARACTER),
+    (
+        _QUANTITY,
+        UPPERCASE_FIRST_LETTER,
+        BAD_FIRST_CHARACTER,
+        BAD_SEPARATOR,
+        BAD_SEPARATOR,
+        BAD_CHARACTER,
+    ),
+    (
+        _QUANTITY,
+        _QUANTITY,
+        _QUANTITY,
+        _QUANTITY_UNDERSCORE,
+        _QUANTITY_SEPARATOR,
+        BAD_CHARACTER,
+    ),
+    (_QUANTITY, _QUANTITY, _QUANTITY, BAD_SEPARATOR, BAD_SEPARATOR, BAD_CHARACTER),
+    (
+        _QUANTITY,
+        _QUANTITY,
+        _QUANTITY,
+        EXTRA_DOUBLE_UNDERSCORE,
+        BAD_SEPARATOR,
+        BAD_CHARACTER,
+    ),
+)
+
+# For each state, the reason a name can't end there (None if it can).
+_AT_END: tuple[str | None, ...] = (
+    EMPTY,
+    MISSING_DOUBLE_UNDERSCORE,
+    MISSING_DOUBLE_UNDERSCORE,
+    MISSING_DOUBLE_UNDERSCORE,
+    MISSING_QUANTITY,
+    None,
+    TRAILING_SEPARATOR,
+    TRAILING_SEPARATOR,
+)
+
+# The language of the DFA, and the prefixes of the names in it. Both
+# patterns match in linear time (see standard_names.regex): the first
+# quickly accepts valid names, the second finds the offset at which the DFA
+# gets stuck on invalid ones.
+_ACCEPT = re.compile(f"{_WORDS}__{_WORDS}").fullmatch
+_PREFIX = re.compile(f"(?:{_PREFIX_PATTERN.pattern})?").match
+
+
+def diagnose_name(name: str) -> NameDiagnosis:
+    """Find where, and why, a string is not a valid standard name.
+
+    Parameters
+    ----------
+    name : str
+        A possible standard name.
+
+    Returns
+    -------
+    NameDiagnosis
+        The offset of the first character that can't be part of a valid
+        name (or the length of *name*, if the name ends too soon) and the
+        reason it is rejected.
+
+    Examples
+    --------
+    >>> from standard_names.dfa import diagnose_name
+
+    >>> diagnose_name("air__temperature")
+    NameDiagnosis(offset=None, reason=None)
+    >>> diagnose_name("air__Temperature")
+    NameDiagnosis(offset=5, reason='uppercase_first_letter')
+    >>> diagnose_name("air_temperature")
+    NameDiagnosis(offset=15, reason='missing_double_underscore')
+    >>> diagnose_name("air-_water__temperature").message
+    'separators must be followed by a letter or digit'
+    """
+    return _VALID if _ACCEPT(name) else _run(name)
+
+
+def _run(name: str) -> NameDiagnosis:
+    # The prefix pattern matches (if only the empty string) every string.
+    offset = cast("re.Match[str]", _PREFIX(name)).end()
+    state = _state_after(name, offset)
+
+    if offset == len(name):
+        reason = _AT_END[state]
+        return _VALID if reason is None else _diagnosis((offset, reason))
+
+    # The prefix is as long as it can be, so the DFA rejects the next character,
+    # and the transition is a reason rather than a state.
+    rejected = cast(str, _TRANSITIONS[state][_CLASSES.get(name[offset], _OTHER)])
+    return _diagnosis((offset, rejected))
+
+
+def _state_after(name: str, end: int) -> int:
+    """The state of the DFA after reading a prefix of a valid name."""
+    if end == 0:
+        return _START
+
+    last = name[end - 1]
+    if name.find("__", 0, end) >= 0:
+        if name[end - 2 : end] == "__":
+            return _QUANTITY_START
+        elif last == "_":
+            return _QUANTITY_UNDERSCORE
+        elif last in "-~":
+            return _QUANTITY_SEPARATOR
+        else:
+            return _QUANTITY
+    else:
+        if last == "_":
+            return _OBJECT_UNDERSCORE
+        elif last in "-~":
+            return _OBJECT_SEPARATOR
+        else:
+            return _OBJECT
+
+
+def diagnose_names(names: Iterable[str]) -> list[NameDiagnosis]:
+    """Diagnose many names.
+
+    The names are first matched, all together, against the language of
+    the DFA, and only those that don't match are diagnosed.
+
+    Parameters
+    ----------
+    names : iterable of str
+        Possible standard names.
+
+    Returns
+    -------
+    list of NameDiagnosis
+        The diagnosis of each name, in order.
+
+    Examples
+    --------
+    >>> from standard_names.dfa import diagnose_names
+
+    >>> [d.reason for d in diagnose_names(["air__temperature", "air__", ""])]
+    [None, 'missing_quantity', 'empty']
+    """
+    names = list(names)
+    diagnoses = [_VALID] * len(names)
+    for index, match in enumerate(map(_ACCEPT, names)):
+        if match is None:
+            diagnoses[index] = _run(names[index])
+    return diagnoses
@@ -1,4 +1,10 @@
+from __future__ import annotations
+
 from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from standard_names.dfa import NameDiagnosis
 
 
 class Error(Exception):
@@ -10,7 +16,15 @@ class Error(Exception):
 
 class BadNameError(Error):
 
-    """Error to indicate a poorly-formed standard name."""
+    """Error to indicate a poorly-formed standard name.
+
+    Examples
+    --------
+    >>> from standard_names.error import BadNameError
+    >>> error = BadNameError("air__Temperature")
+    >>> error.offset, error.reason
+    (5, 'uppercase_first_letter')
+    """
 
     def __init__(self, name: str):
         super().__init__()
@@ -23,6 +37,21 @@ class BadNameError(Error):
     def name(self) -> str:
         return self._name
 
+    @property
+    def offset(self) -> int | None:
+        """Offset of the first character that can't be part of a valid name."""
+        return self._diagnose().offset
+
+    @property
+    def reason(self) -> str | None:
+        """Why the name is not valid (see :mod:`standard_names.dfa`)."""
+        return self._diagnose().reason
+
+    def _diagnose(self) -> NameDiagnosis:
+        from standard_names.dfa import diagnose_name
+
+        return diagnose_name(self._name)
+
 
 class BadRegistryError(Error):
 
@@ -0,0 +1,227 @@
+"""Check the parts of names against the vocabulary of a reference registry.
+
+A name can be a perfectly valid standard name and still be wrong: its
+quantity may be misspelled, it may use an operator no one has heard of,
+or its object may be a typo of an object that's already registered. A
+:class:`Linter` decomposes names and looks up each of their parts in the
+objects, quantities and operators of a reference registry, which takes
+constant time per part. Only parts that aren't found are compared, by an
+n-gram index, with the vocabulary to suggest what might have been meant.
+
+Issues are reported with one of the following codes:
+
+* ``invalid_name``: the name is not a valid standard name.
+* ``unknown_quantity``: the quantity is not in the reference registry.
+* ``unknown_operator``: an operator is not in the reference registry.
+* ``near_miss_object``: the object is not in the reference registry, but
+  is close to an object that is. (New objects that aren't close to any
+  known ones are not reported.)
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+
+from standard_names import standardname
+from standard_names._fuzzy import NGramIndex
+from standard_names._parallel import imap_chunks
+from standard_names.standardname import StandardName
+
+if TYPE_CHECKING:
+    from standard_names.registry import FrozenNamesRegistry
+    from standard_names.registry import NamesRegistry
+
+INVALID_NAME = "invalid_name"
+UNKNOWN_QUANTITY = "unknown_quantity"
+UNKNOWN_OPERATOR = "unknown_operator"
+NEAR_MISS_OBJECT = "near_miss_object"
+
+_FIELDS = {
+    UNKNOWN_QUANTITY: "quantities",
+    UNKNOWN_OPERATOR: "operators",
+    NEAR_MISS_OBJECT: "objects",
+}
+
+
+class LintIssue(NamedTuple):
+    """A problem with a name.
+
+    ``part`` is the object, quantity, or operator the issue is about (or,
+    for an invalid name, the name itself) and ``hints`` are known parts
+    that are close to it, closest first.
+    """
+
+    name: str
+    code: str
+    part: str
+    hints: tuple[str, ...]
+
+    @property
+    def message(self) -> str:
+        """A description of the issue."""
+        if self.code == INVALID_NAME:
+            from standard_names.dfa import diagnose_name
+
+            diagnosis = diagnose_name(self.name)
+            return f"invalid name ({diagnosis.message}, at {diagnosis.offset})"
+
+        what = self.code.replace("_", " ")
+        message = f"{what} {self.part!r}"
+        if self.hints:
+            message += f" (did you mean {' or '.join(map(repr, self.hints))}?)"
+        return message
+
+
+class Linter:
+
+    """Check names against the vocabulary of a reference registry.
+
+    Parameters
+    ----------
+    reference : NamesRegistry or FrozenNamesRegistry
+        Registry of known names.
+    k : int, optional
+        Maximum number of hints for each unknown part.
+    cutoff : float, optional
+        Similarity, between 0 and 1, below which known parts are not
+        given as hints.
+    object_cutoff : float, optional
+        Similarity to a known object above which an unknown object is
+        taken to be a near miss.
+
+    Examples
+    --------
+    >>> from standard_names import NamesRegistry
+    >>> from standard_names.lint import Linter
+
+    >>> linter = Linter(
+    ...     NamesRegistry(["atmosphere_air__temperature", "soil__log_of_porosity"])
+    ... )
+    >>> linter.lint("atmosphere_air__temperature")
+    []
+    >>> linter.lint("sea_water__temperature")
+    []
+    >>> [issue.message for issue in linter.lint("atmosphere_aire__ln_of_temprature")]
+    ["unknown quantity 'temprature' (did you mean 'temperature'?)",
+     "unknown operator 'ln'",
+     "near miss object 'atmosphere_aire' (did you mean 'atmosphere_air'?)"]
+    """
+
+    def __init__(
+        self,
+        reference: NamesRegistry | FrozenNamesRegistry,
+        k: int = 3,
+        cutoff: float = 0.6,
+        object_cutoff: float = 0.75,
+    ):
+        self._names = frozenset(reference.names)
+        self._vocabulary = {
+            "objects": frozenset(reference.objects),
+            "quantities": frozenset(reference.quantities),
+            "operators": frozenset(reference.operators),
+        }
+        self._k = k
+        self._cutoffs = {
+            "objects": object_cutoff,
+            "quantities": cutoff,
+            "operators": cutoff,
+        }
+        self._indexes: dict[str, NGramIndex] = {}
+        self._hints: dict[tuple[str, str], tuple[str, ...]] = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Workers build the indexes they need for themselves.
+        state = self.__dict__.copy()
+        state["_indexes"] = {}
+        state["_hints"] = {}
+        return state
+
+    def lint(self, name: str) -> list[LintIssue]:
+        """Check a name.
+
+        Parameters
+        ----------
+        name : str
+            A standard name.
+
+        Returns
+        -------
+        list of LintIssue
+            Problems with the name: first with its quantity, then with its
+            operators (outermost first) and then its object.
+        """
+        if name in self._names:
+            return []
+        if not standardname.is_valid_name(name):
+            return [LintIssue(name, INVALID_NAME, name, ())]
+
+        object_, quantity, operators = StandardName.decompose_name(name)
+        vocabulary = self._vocabulary
+
+        issues = []
+        if quantity not in vocabulary["quantities"]:
+            issues.append(self._issue(name, UNKNOWN_QUANTITY, quantity))
+        for operator in operators:
+            if operator not in vocabulary["operators"]:
+                issues.append(self._issue(name, UNKNOWN_OPERATOR, operator))
+        if object_ not in vocabulary["objects"]:
+            hints = self._hints_for("objects", object_)
+            if hints:
+                issues.append(LintIssue(name, NEAR_MISS_OBJECT, object_, hints))
+        return issues
+
+    def lint_many(
+        self,
+        names: Iterable[str],
+        processes: int | None = None,
+        chunksize: int = 16384,
+    ) -> Iterator[tuple[str, list[LintIssue]]]:
+        """Check a stream of names, in parallel.
+
+        Parameters
+        ----------
+        names : iterable of str
+            Standard names.
+        processes : int, optional
+            Number of worker processes. By default, inputs that fit in a
+            single chunk are checked in this process and longer ones use
+            all available CPUs.
+        chunksize : int, optional
+            Number of names sent to a worker at a time.
+
+        Yields
+        ------
+        tuple of (str, list of LintIssue)
+            Each name, in order, with its issues.
+        """
+        return imap_chunks(
+            _lint_chunk, self, names, chunksize=chunksize, processes=processes
+        )
+
+    def _issue(self, name: str, code: str, part: str) -> LintIssue:
+        return LintIssue(name, code, part, self._hints_for(_FIELDS[code], part))
+
+    def _hints_for(self, field: str, part: str) -> tuple[str, ...]:
+        try:
+            return self._hints[field, part]
+        except KeyError:
+            pass
+
+        try:
+            index = self._indexes[field]
+        except KeyError:
+            index = self._indexes[field] = NGramIndex(self._vocabulary[field])
+
+        hints = tuple(
+            word
+            for word, _ in index.query(part, k=self._k, cutoff=self._cutoffs[field])
+        )
+        self._hints[field, part] = hints
+        return hints
+
+
+def _lint_chunk(linter: Linter, names: list[str]) -> list[tuple[str, list[LintIssue]]]:
+    return [(name, linter.lint(name)) for name in names]
@@ -0,0 +1,406 @@
+"""Enumerate the names that can be made from a vocabulary.
+
+Given objects, quantities and operators (those of a registry, say), a
+:class:`NameSpace` is every name made, with
+:meth:`StandardName.compose_name`, from an object, a quantity, and a chain
+of up to some number of operators. That is usually far more names than can
+be kept in memory, so a name space is never built. Instead, each name has
+an index, from which the name is worked out when needed, and names can be
+counted, looked up by index, iterated over, randomly sampled, or generated
+in chunks by several processes.
+
+Names are ordered by the number of operators in their chains, then by
+chain, by quantity, and finally by object.
+"""
+from __future__ import annotations
+
+import itertools
+import math
+import random
+import re
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+from standard_names._parallel import imap_chunks
+from standard_names.regex import _WORDS
+from standard_names.standardname import StandardName
+
+if TYPE_CHECKING:
+    from standard_names.registry import FrozenNamesRegistry
+    from standard_names.registry import NamesRegistry
+
+_IS_WORDS = re.compile(_WORDS).fullmatch
+
+
+class NameSpace:
+
+    """The names that can be made from objects, quantities, and operators.
+
+    Parameters
+    ----------
+    objects : iterable of str
+        Objects.
+    quantities : iterable of str
+        Quantities.
+    operators : iterable of str, optional
+        Operators.
+    max_operators : int, optional
+        The most operators that are applied to a quantity.
+    distinct_operators : bool, optional
+        If ``True``, an operator appears at most once in a chain.
+
+    Raises
+    ------
+    ValueError
+        If some of the parts can't be part of a name (or, for quantities
+        and operators, contain an ``of`` that would make names with them
+        decompose into other parts).
+
+    Examples
+    --------
+    >>> from standard_names.namespace import NameSpace
+
+    >>> space = NameSpace(
+    ...     ["air", "water"], ["temperature", "pressure"], ["log", "gradient"]
+    ... )
+    >>> len(space)
+    12
+    >>> list(space)[:5]
+    ['air__pressure', 'water__pressure', 'air__temperature',
+     'water__temperature', 'air__gradient_of_pressure']
+    >>> space[-1]
+    'water__log_of_temperature'
+    >>> "air__log_of_pressure" in space, "air__log_of_log_of_pressure" in space
+    (True, False)
+
+    Spaces are counted, not built.
+
+    >>> from standard_names import NamesRegistry
+    >>> space = NameSpace.from_registry(NamesRegistry.from_latest(), max_operators=3)
+    >>> len(space) > 10**12
+    True
+    >>> len(space.sample(3, seed=1945))
+    3
+    """
+
+    def __init__(
+        self,
+        objects: Iterable[str],
+        quantities: Iterable[str],
+        operators: Iterable[str] = (),
+        max_operators: int = 1,
+        distinct_operators: bool = True,
+    ):
+        self._objects = tuple(sorted(set(objects)))
+        self._quantities = tuple(sorted(set(quantities)))
+        self._operators = tuple(sorted(set(operators)))
+        self._max_operators = max(max_operators, 0)
+        self._distinct_operators = distinct_operators
+
+        bad_parts = [part for part in self._objects if not _IS_WORDS(part)] + [
+            part
+            for part in self._quantities + self._operators
+            if not _IS_WORDS(part) or "of" in part.split("_")
+        ]
+        if bad_parts:
+            raise ValueError(
+                f"parts can't be used to make names: {', '.join(sorted(bad_parts))}"
+            )
+
+        self._sets = (
+            frozenset(self._objects),
+            frozenset(self._quantities),
+            frozenset(self._operators),
+        )
+
+        self._n_chains = [self._count_chains(depth) for depth in self.depths]
+        self._sizes = [
+            n_chains * len(self._quantities) * len(self._objects)
+            for n_chains in self._n_chains
+        ]
+        self._offsets = [0] + list(itertools.accumulate(self._sizes))
+
+    @classmethod
+    def from_registry(
+        cls,
+        registry: NamesRegistry | FrozenNamesRegistry,
+        max_operators: int = 1,
+        distinct_operators: bool = True,
+    ) -> NameSpace:
+        """The name space of the parts of the names in a registry.
+
+        Parameters
+        ----------
+        registry : NamesRegistry or FrozenNamesRegistry
+            A registry.
+        max_operators : int, optional
+            The most operators that are applied to a quantity.
+        distinct_operators : bool, optional
+            If ``True``, an operator appears at most once in a chain.
+
+        Returns
+        -------
+        NameSpace
+            Names made from the registry's objects, quantities, and
+            operators.
+        """
+        return cls(
+            registry.objects,
+            registry.quantities,
+            registry.operators,
+            max_operators=max_operators,
+            distinct_operators=distinct_operators,
+        )
+
+    @property
+    def objects(self) -> tuple[str, ...]:
+        """The objects, sorted."""
+        return self._objects
+
+    @property
+    def quantities(self) -> tuple[str, ...]:
+        """The quantities, sorted."""
+        return self._quantities
+
+    @property
+    def operators(self) -> tuple[str, ...]:
+        """The operators, sorted."""
+        return self._operators
+
+    @property
+    def depths(self) -> range:
+        """The possible numbers of operators in a chain."""
+        if self._distinct_operators:
+            return range(min(self._max_operators, len(self._operators)) + 1)
+        elif self._operators:
+            return range(self._max_operators + 1)
+        else:
+            return range(1)
+
+    @property
+    def size(self) -> int:
+        """The number of names in the space.
+
+        Unlike ``len``, this works for spaces of any size.
+        """
+        return self._offsets[-1]
+
+    def count(self, depth: int | None = None) -> int:
+        """Count names.
+
+        Parameters
+        ----------
+        depth : int, optional
+            Count only names with this many operators.
+
+        Returns
+        -------
+        int
+            The number of names.
+
+        Examples
+        --------
+        >>> from standard_names.namespace import NameSpace
+        >>> space = NameSpace(["air"], ["temperature"], ["a", "b", "c"], 3)
+        >>> [space.count(depth) for depth in space.depths], space.count()
+        ([1, 3, 6, 6], 16)
+        >>> NameSpace(["air"], ["temperature"], ["a", "b", "c"], 3, False).count()
+        40
+        """
+        if depth is None:
+            return self.size
+        return self._sizes[depth] if depth in self.depths else 0
+
+    def _count_chains(self, depth: int) -> int:
+        if self._distinct_operators:
+            return math.perm(len(self._operators), depth)
+        return len(self._operators) ** depth
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str) or "__" not in name:
+            return False
+        object_, quantity, operators = StandardName.decompose_name(name)
+        objects, quantities, known_operators = self._sets
+        return (
+            object_ in objects
+            and quantity in quantities
+            and len(operators) in self.depths
+            and all(operator in known_operators for operator in operators)
+            and (not self._distinct_operators or len(set(operators)) == len(operators))
+            and StandardName.compose_name(object_, quantity, operators) == name
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        for depth in self.depths:
+            yield from self._names_with_depth(depth)
+
+    def _names_with_depth(self, depth: int) -> Iterator[str]:
+        chains: Iterator[tuple[str, ...]]
+        if self._distinct_operators:
+            chains = itertools.permutations(self._operators, depth)
+        else:
+            chains = itertools.product(self._operators, repeat=depth)
+
+        compose_name = StandardName.compose_name
+        for chain in chains:
+            for quantity in self._quantities:
+                for object_ in self._objects:
+                    yield compose_name(object_, quantity, chain)
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("name space index out of range")
+
+        chain, quantity, object_ = self._parts_at(index)
+        return StandardName.compose_name(
+            self._objects[object_], self._quantities[quantity], chain
+        )
+
+    def _parts_at(self, index: int) -> tuple[tuple[str, ...], int, int]:
+        """The chain, and indices of the quantity and object, of a name."""
+        depth = next(d for d in self.depths if index < self._offsets[d + 1])
+        row, object_ = divmod(index - self._offsets[depth], len(self._objects))
+        chain, quantity = divmod(row, len(self._quantities))
+        return self._chain_at(depth, chain), quantity, object_
+
+    def _chain_at(self, depth: int, index: int) -> tuple[str, ...]:
+        """The chain of operators at some index, in the order it's generated."""
+        available = list(self._operators)
+        chain = []
+        block = self._n_chains[depth]
+        for _ in range(depth):
+            if self._distinct_operators:
+                block //= len(available)
+                digit, index = divmod(index, block)
+                chain.append(available.pop(digit))
+            else:
+                block //= len(self._operators)
+                digit, index = divmod(index, block)
+                chain.append(self._operators[digit])
+        return tuple(chain)
+
+    def names_between(self, start: int, stop: int) -> list[str]:
+        """The names with indices in a range.
+
+        Parameters
+        ----------
+        start, stop : int
+            The first index, and one past the last.
+
+        Returns
+        -------
+        list of str
+            The names, in order.
+        """
+        start, stop = max(start, 0), min(stop, self.size)
+        if start >= stop:
+            return []
+
+        n_objects = len(self._objects)
+        compose_name = StandardName.compose_name
+
+        names = []
+        index = start
+        while index < stop:
+            chain, quantity, object_ = self._parts_at(index)
+            row_stop = min(stop, index + n_objects - object_)
+            quantity_ = self._quantities[quantity]
+            names += [
+                compose_name(other, quantity_, chain)
+                for other in self._objects[object_ : object_ + row_stop - index]
+            ]
+            index = row_stop
+        return names
+
+    def sample(self, k: int, seed: int | None = None) -> list[str]:
+        """Choose names at random, without replacement.
+
+        Parameters
+        ----------
+        k : int
+            Number of names.
+        seed : int, optional
+            Seed for the random number generator.
+
+        Returns
+        -------
+        list of str
+            The names, in the order they were chosen.
+
+        Raises
+        ------
+        ValueError
+            If there are fewer than *k* names in the space.
+        """
+        if not 0 <= k <= self.size:
+            raise ValueError(f"sample size must be between 0 and {self.size} (got {k})")
+        # Spaces may be too large for random.sample (past sys.maxsize), so
+        # draw indices one at a time and redraw any already chosen.
+        rng = random.Random(seed)
+        chosen: set[int] = set()
+        indices: list[int] = []
+        while len(indices) < k:
+            index = rng.randrange(self.size)
+            if index not in chosen:
+                chosen.add(index)
+                indices.append(index)
+        return [self[index] for index in indices]
+
+    def chunks(
+        self,
+        chunksize: int = 16384,
+        start: int = 0,
+        stop: int | None = None,
+        processes: int | None = None,
+    ) -> Iterator[list[str]]:
+        """Generate names a chunk at a time, in parallel.
+
+        Each worker is sent the space once, and then only the ranges of
+        indices of the chunks it is to generate.
+
+        Parameters
+        ----------
+        chunksize : int, optional
+            Number of names in a chunk.
+        start, stop : int, optional
+            Generate only the names with indices in this range.
+        processes : int, optional
+            Number of worker processes. By default, names that fit in a
+            single chunk are generated in this process and more use all
+            available CPUs.
+
+        Yields
+        ------
+        list of str
+            Chunks of names, in order.
+
+        Examples
+        --------
+        >>> from standard_names.namespace import NameSpace
+        >>> space = NameSpace(["air", "water"], ["temperature"], ["log"])
+        >>> list(space.chunks(chunksize=3))
+        [['air__temperature', 'water__temperature', 'air__log_of_temperature'],
+         ['water__log_of_temperature']]
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        if processes is None and stop - start <= chunksize:
+            processes = 1
+
+        ranges = (
+            (lo, min(lo + chunksize, stop)) for lo in range(start, stop, chunksize)
+        )
+        return imap_chunks(
+            _names_in_ranges, self, ranges, chunksize=1, processes=processes
+        )
+
+
+def _names_in_ranges(
+    space: NameSpace, ranges: list[tuple[int, int]]
+) -> list[list[str]]:
+    return [space.names_between(start, stop) for start, stop in ranges]
@@ -0,0 +1,322 @@
+"""Normalize almost-valid names into standard names.
+
+Names from legacy models are often close to, but not quite, valid
+standard names (``Water__Temperature``, ``water_temperature``,
+``air__temperature-of-x``). A :class:`Normalizer` repairs them with a
+sequence of rules, each of which fixes one kind of mistake:
+
+* ``collapse_separators``: replace whitespace with ``_``, collapse runs of
+  separators into one (or into ``__``, for runs of underscores), and
+  strip separators from the ends.
+* ``double_underscore``: make sure there is exactly one ``__``. If there
+  isn't one, a ``_`` is doubled; if there are several, only one is kept.
+  With a registry, the split that gives a known object and quantity is
+  preferred.
+* ``canonical_of``: write the ``_of_`` between operators and quantities in
+  the usual way (lowercase, with underscores, and not repeated).
+* ``lowercase_first_letter``: lowercase the first letters of the object
+  and of the quantity.
+
+Every rule that changes a name lowers the confidence in the result. If
+the normalizer has a registry, candidates are also looked up in it, and
+those that aren't registered are given half the confidence.
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+from standard_names import standardname
+from standard_names._parallel import imap_chunks
+from standard_names.standardname import StandardName
+
+if TYPE_CHECKING:
+    from standard_names.registry import FrozenNamesRegistry
+    from standard_names.registry import NamesRegistry
+
+COLLAPSE_SEPARATORS = "collapse_separators"
+DOUBLE_UNDERSCORE = "double_underscore"
+CANONICAL_OF = "canonical_of"
+LOWERCASE_FIRST_LETTER = "lowercase_first_letter"
+
+# The rules, in the order they are applied.
+RULES = (COLLAPSE_SEPARATORS, DOUBLE_UNDERSCORE, CANONICAL_OF, LOWERCASE_FIRST_LETTER)
+
+# How much a rule that changes a name lowers the confidence in the result.
+CONFIDENCE = {
+    COLLAPSE_SEPARATORS: 0.9,
+    DOUBLE_UNDERSCORE: 0.7,
+    CANONICAL_OF: 0.9,
+    LOWERCASE_FIRST_LETTER: 0.95,
+}
+
+# Confidence in a double underscore that splits a name into a registered
+# object, or quantity.
+_KNOWN_SPLIT_CONFIDENCE = 0.9
+
+_WHITESPACE = re.compile(r"\s+")
+_SEPARATOR_RUN = re.compile(r"[-~_]{2,}")
+_OF = re.compile(r"[-~_]+of(?:[-~_]+of)*[-~_]+", re.IGNORECASE)
+_LEADING_OF = re.compile(r"^of[-~_]+", re.IGNORECASE)
+_TRAILING_OF = re.compile(r"[-~_]+of$", re.IGNORECASE)
+
+
+class Normalization(NamedTuple):
+    """The result of normalizing a name.
+
+    ``candidate`` is ``None`` if the name couldn't be made valid, in which
+    case the ``confidence`` is zero. ``registered`` is ``None`` if there
+    was no registry to check the candidate against.
+    """
+
+    name: str
+    candidate: str | None
+    confidence: float
+    rules: tuple[str, ...]
+    registered: bool | None
+
+
+class _Vocabulary(NamedTuple):
+    names: frozenset[str]
+    objects: frozenset[str]
+    quantities: frozenset[str]
+
+
+_Rule = Callable[[str, "_Vocabulary | None"], "tuple[str, float]"]
+
+
+def _collapse_separators(
+    name: str, vocabulary: _Vocabulary | None
+) -> tuple[str, float]:
+    name = _WHITESPACE.sub("_", name)
+    name = _SEPARATOR_RUN.sub(_collapse_run, name)
+    return name.strip("-~_"), CONFIDENCE[COLLAPSE_SEPARATORS]
+
+
+def _collapse_run(match: re.Match[str]) -> str:
+    run = match.group()
+    if run.count("_") >= 2:
+        return "__"
+    return "_" if "_" in run else run[0]
+
+
+def _double_underscore(name: str, vocabulary: _Vocabulary | None) -> tuple[str, float]:
+    n_double = name.count("__")
+    if n_double == 1:
+        return name, 1.0
+
+    if n_double > 1:
+        splits = [
+            (name[:start], name[start + 2 :].replace("__", "_"))
+            for start in _find_all(name, "__")
+        ]
+    else:
+        splits = [(name[:start], name[start + 1 :]) for start in _find_all(name, "_")]
+    if not splits:
+        return name, 1.0
+
+    scores = [_split_score(object_, clause, vocabulary) for object_, clause in splits]
+    best = max(range(len(splits)), key=scores.__getitem__)
+    object_, clause = splits[best]
+
+    confidence = CONFIDENCE[DOUBLE_UNDERSCORE]
+    if scores[best] > 0:
+        confidence = max(confidence, _KNOWN_SPLIT_CONFIDENCE)
+    return f"{object_.replace('__', '_')}__{clause}", confidence
+
+
+def _find_all(name: str, sub: str) -> list[int]:
+    starts = []
+    start = name.find(sub)
+    while start >= 0:
+        starts.append(start)
+        start = name.find(sub, start + len(sub))
+    return starts
+
+
+def _split_score(object_: str, clause: str, vocabulary: _Vocabulary | None) -> int:
+    if vocabulary is None:
+        return 0
+    _, quantity = StandardName.decompose_quantity(clause)
+    return (object_ in vocabulary.objects) + (quantity in vocabulary.quantities)
+
+
+def _canonical_of(name: str, vocabulary: _Vocabulary | None) -> tuple[str, float]:
+    object_, sep, clause = name.partition("__")
+    clause = _OF.sub("_of_", clause)
+    clause = _TRAILING_OF.sub("", _LEADING_OF.sub("", clause))
+    return object_ + sep + clause, CONFIDENCE[CANONICAL_OF]
+
+
+def _lowercase_first_letter(
+    name: str, vocabulary: _Vocabulary | None
+) -> tuple[str, float]:
+    object_, sep, clause = name.partition("__")
+    name = object_[:1].lower() + object_[1:] + sep + clause[:1].lower() + clause[1:]
+    return name, CONFIDENCE[LOWERCASE_FIRST_LETTER]
+
+
+_RULES: dict[str, _Rule] = {
+    COLLAPSE_SEPARATORS: _collapse_separators,
+    DOUBLE_UNDERSCORE: _double_underscore,
+    CANONICAL_OF: _canonical_of,
+    LOWERCASE_FIRST_LETTER: _lowercase_first_letter,
+}
+
+
+class Normalizer:
+
+    """Turn almost-valid names into standard names.
+
+    Parameters
+    ----------
+    registry : NamesRegistry or FrozenNamesRegistry, optional
+        Registry to check candidates against, and to choose where to put
+        a missing double underscore.
+    rules : iterable of str, optional
+        The rules to apply (by default, all of them). Rules are always
+        applied in the order given by :data:`RULES`.
+
+    Examples
+    --------
+    >>> from standard_names import NamesRegistry
+    >>> from standard_names.normalize import Normalizer
+
+    >>> normalizer = Normalizer()
+    >>> normalizer.normalize("Water__Temperature")
+    Normalization(name='Water__Temperature', candidate='water__temperature',
+                  confidence=0.95, rules=('lowercase_first_letter',),
+                  registered=None)
+    >>> normalizer.normalize("air  temperature").candidate
+    'air__temperature'
+    >>> normalizer.normalize("air__Temperature-Of-x").candidate
+    'air__temperature_of_x'
+
+    A registry helps to decide where the object ends.
+
+    >>> registry = NamesRegistry(["sea_water__temperature"])
+    >>> Normalizer(registry).normalize("sea_water_temperature")
+    Normalization(name='sea_water_temperature', candidate='sea_water__temperature',
+                  confidence=0.9, rules=('double_underscore',), registered=True)
+    >>> Normalizer(registry, rules=["collapse_separators"]).normalize(
+    ...     "sea_water_temperature"
+    ... ).candidate is None
+    True
+    """
+
+    def __init__(
+        self,
+        registry: NamesRegistry | FrozenNamesRegistry | None = None,
+        rules: Iterable[str] | None = None,
+    ):
+        rules = RULES if rules is None else tuple(rules)
+        unknown = set(rules) - set(RULES)
+        if unknown:
+            raise ValueError(
+                f"unknown normalization rules: {', '.join(sorted(unknown))}"
+            )
+
+        self._rules = tuple(rule for rule in RULES if rule in rules)
+        self._vocabulary = (
+            None
+            if registry is None
+            else _Vocabulary(
+                frozenset(registry.names),
+                frozenset(registry.objects),
+                frozenset(registry.quantities),
+            )
+        )
+
+    @property
+    def rules(self) -> tuple[str, ...]:
+        """The rules that are applied, in order."""
+        return self._rules
+
+    def normalize(self, name: str) -> Normalization:
+        """Normalize a name.
+
+        Parameters
+        ----------
+        name : str
+            A possible standard name.
+
+        Returns
+        -------
+        Normalization
+            The candidate standard name, and how confident we are in it.
+        """
+        candidate = name.strip()
+        confidence = 1.0
+        applied = []
+        for rule in self._rules:
+            fixed, factor = _RULES[rule](candidate, self._vocabulary)
+            if fixed != candidate:
+                candidate = fixed
+                confidence *= factor
+                applied.append(rule)
+
+        if not standardname.is_valid_name(candidate):
+            return Normalization(name, None, 0.0, tuple(applied), None)
+
+        registered = None
+        if self._vocabulary is not None:
+            registered = candidate in self._vocabulary.names
+            if not registered:
+                confidence *= 0.5
+
+        return Normalization(
+            name, candidate, round(confidence, 3), tuple(applied), registered
+        )
+
+    def normalize_many(
+        self,
+        names: Iterable[str],
+        processes: int | None = None,
+        chunksize: int = 16384,
+    ) -> Iterator[Normalization]:
+        """Normalize a stream of names, in parallel.
+
+        Names are read from *names* a chunk at a time, and only a few chunks
+        are in flight at once, so inputs of any length can be streamed.
+        Each distinct name in a chunk is normalized only once.
+
+        Parameters
+        ----------
+        names : iterable of str
+            Possible standard names.
+        processes : int, optional
+            Number of worker processes. By default, inputs that fit in a
+            single chunk are normalized in this process and longer ones use
+            all available CPUs.
+        chunksize : int, optional
+            Number of names sent to a worker at a time.
+
+        Yields
+        ------
+        Normalization
+            The normalization of each name, in order.
+
+        Examples
+        --------
+        >>> from standard_names.normalize import Normalizer
+        >>> [
+        ...     result.candidate
+        ...     for result in Normalizer().normalize_many(["air_Temperature", "x"])
+        ... ]
+        ['air__temperature', None]
+        """
+        return imap_chunks(
+            _normalize_chunk, self, names, chunksize=chunksize, processes=processes
+        )
+
+
+def _normalize_chunk(normalizer: Normalizer, names: list[str]) -> list[Normalization]:
+    results: dict[str, Normalization] = {}
+    for name in names:
+        if name not in results:
+            results[name] = normalizer.normalize(name)
+    return [results[name] for name in names]
@@ -1,17 +1,31 @@
+"""Regular expressions for standard names.
+
+The object and the quantity of a name are each made up of alphanumeric
+words separated by single ``-``, ``~``, or ``_`` characters. The patterns
+here are written so that every character of a name can be matched in only
+one way: a separator is never optional, and a word always starts right
+after one. Unlike patterns with nested quantifiers, such as
+``(?:[-~_]?[a-zA-Z0-9]+)*``, these never backtrack by more than a
+character and so match in linear time, even on long, almost-valid inputs.
+"""
+from __future__ import annotations
+
 import re
 
+_WORDS = "[a-z][a-zA-Z0-9]*(?:[-~_][a-zA-Z0-9]+)*"
+
 STANDARD_NAME_REGEX = re.compile(
     r"""
     ^                           # Start of the string
-    [a-z]+                      # Starts with one or more lowercase letters
+    [a-z][a-zA-Z0-9]*           # Starts with a lowercase letter
     (?:                         # Start of a non-capturing group for subsequent parts
-        [-~_]?                  # Optional separator: hyphen, tilde, or underscore
+        [-~_]                   # Separator: hyphen, tilde, or underscore
         [a-zA-Z0-9]+            # One or more alphanumeric characters
     )*                          # Zero or more repetitions of the group
     __                          # Double underscore separator
-    [a-z]+                      # Another lowercase word
+    [a-z][a-zA-Z0-9]*           # Another word that starts with a lowercase letter
     (?:                         # Start of a non-capturing group for subsequent parts
-        [-~_]?                  # Optional separator: hyphen, tilde, or underscore
+        [-~_]                   # Separator: hyphen, tilde, or underscore
         [a-zA-Z0-9]+            # One or more alphanumeric characters
     )*                          # Zero or more repetitions of the group
     $                           # End of the string
@@ -19,25 +33,75 @@ STANDARD_NAME_REGEX = re.compile(
     re.VERBOSE,
 )
 
-_PATTERN = re.compile(
-    r"""
-    (?<!\w)                   # Negative look-behind for a non-word character
-    [a-z]+                    # Starts with one or more lowercase letters
-    (?:                       # Start of a non-capturing group for subsequent parts
-        [-~_]?                # Optional separator: hyphen, tilde, or underscore
-        [a-zA-Z0-9]+          # One or more alphanumeric characters
-    )*                        # Zero or more repetitions of the group
-    __                        # Double underscore separator
-    [a-z]+                    # Another lowercase word
-    (?:                       # Start of a non-capturing group for subsequent parts
-        [-~_]?                # Optional separator: hyphen, tilde, or underscore
-        [a-zA-Z0-9]+          # One or more alphanumeric characters
-    )*                        # Zero or more repetitions of the group
-    (?=\W|$)                  # Positive look-ahead for a space or end of string
-    """,
-    re.VERBOSE,
-)
+# Where names might start: a lowercase letter that doesn't follow a word
+# character.
+_START = re.compile(r"(?<!\w)[a-z]")
+
+# The longest prefix of a name, starting at some position.
+_PREFIX = re.compile(f"{_WORDS}(?:[-~]|_(?:_(?:{_WORDS}[-~_]?)?)?)?")
+
+# Where names can end: after an alphanumeric character that is followed by
+# a non-word character, or the end of the string.
+_END = re.compile(r"[a-zA-Z0-9](?=\W|\Z)")
+_WORD_CHAR = re.compile(r"\w").match
 
 
 def findall(line: str) -> list[str]:
-    return _PATTERN.findall(line.strip())
+    """Find the standard names in a line of text.
+
+    Names are found in the same places as by the pattern,
+
+        (?<!\\w)[a-z]+(?:[-~_]?[a-zA-Z0-9]+)*__[a-z]+(?:[-~_]?[a-zA-Z0-9]+)*(?=\\W|$)
+
+    but in time proportional to the length of the line.
+
+    Parameters
+    ----------
+    line : str
+        A line of text.
+
+    Returns
+    -------
+    list of str
+        The names, in the order they appear.
+
+    Examples
+    --------
+    >>> from standard_names.regex import findall
+    >>> findall("air__temperature, and x-water__depth (sea_water__salinity_)")
+    ['air__temperature', 'x-water__depth']
+    >>> findall("is air__temperature_of_foo__bar a name?")
+    []
+    """
+    line = line.strip()
+
+    names = []
+    pos = 0
+    while (start := _START.search(line, pos)) is not None:
+        begin = start.start()
+        prefix = _PREFIX.match(line, begin)
+        assert prefix is not None
+        stuck = prefix.end()
+
+        # Any name must be in the prefix, and must end after its "__".
+        separator = line.find("__", begin, stuck)
+        if separator < 0:
+            pos = max(stuck, begin + 1)
+            continue
+
+        # Searching stops at the end of the prefix, where it sees the end of
+        # the string, so check the character there separately.
+        ends = [match.end() for match in _END.finditer(line, separator + 2, stuck)]
+        if ends and ends[-1] == stuck < len(line) and _WORD_CHAR(line[stuck]):
+            ends.pop()
+        end = ends[-1] if ends else None
+
+        if end is not None:
+            names.append(line[begin:end])
+            pos = end
+        else:
+            # A name that starts before the "__" would, from here on, be in
+            # the same state as this one, and so can't end anywhere this one
+            # couldn't.
+            pos = separator + 2
+    return names
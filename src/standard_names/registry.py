@@ -1,33 +1,68 @@
 from __future__ import annotations
 
+import io
 import os
+import struct
+import sys
+import threading
 import warnings
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter
 from collections import defaultdict
+from collections import deque
+from collections.abc import Callable
 from collections.abc import Generator
 from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
 from collections.abc import MutableSet
-from glob import glob
-from urllib.request import urlopen
-
-from packaging.version import InvalidVersion
-from packaging.version import Version
-
+from collections.abc import Sequence
+from collections.abc import Set
+from contextlib import contextmanager
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Literal
+from typing import NamedTuple
+from typing import cast
+
+from standard_names import _stats
+from standard_names import standardname
 from standard_names._format import FORMATTERS
+from standard_names._frontcode import FrontCodedNames
+from standard_names._scan import scan_file
+from standard_names._stats import timed
+from standard_names._trie import ObjectTree
+from standard_names._trie import OperatorTrie
 from standard_names.error import BadNameError
 from standard_names.error import BadRegistryError
 from standard_names.standardname import StandardName
 
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+    import pyarrow
+    from packaging.version import Version
+    from typing_extensions import Self
+
+    from standard_names._fuzzy import NGramIndex
+
 
 def load_names_from_txt(
-    file_like: Iterable[str], onerror: str = "raise"
+    file_like: Iterable[str] | IO[str] | IO[bytes], onerror: str = "raise"
 ) -> set[StandardName]:
     """Load names from a text file.
 
+    Files (anything with a ``read`` method) are read, or memory mapped, and
+    checked all at once (see :mod:`standard_names._scan`); other iterables
+    are taken to be lines of text, and checked one at a time.
+
     Parameters
     ----------
     file_like : file-like
-        A file-like object that represents the contents of a text file
-        (only a ``readline`` method need be available).
+        A file, in text or binary mode, or an iterable of lines of text.
     onerror : {'raise', 'warn', 'pass'}
         What to do if a bad name is encountered in the file.
 
@@ -51,29 +86,77 @@ def load_names_from_txt(
     if onerror not in ("pass", "raise", "warn"):
         raise ValueError("value for onerror keyword not understood")
 
+    with _stats.timer("load") as timer:
+        names, bad_names = _read_names(file_like)
+        if bad_names and onerror == "raise":
+            raise BadRegistryError(bad_names)
+        timer.items = len(names)
+
+    if bad_names and onerror == "warn":
+        for name in bad_names:
+            warnings.warn(f"{name}: not a valid name", stacklevel=2)
+
+    return names
+
+
+def _read_names(
+    file_like: Iterable[str] | IO[str] | IO[bytes],
+) -> tuple[set[StandardName], set[str]]:
+    """Read the names, and the bad names, from a file or lines of text."""
     bad_names = set()
     names = set()
-    for name in file_like:
-        name = name.strip()
-        if name:
-            try:
-                csn = StandardName(name)
-            except BadNameError:
-                bad_names.add(name)
-            else:
-                names.add(csn)
+    if hasattr(file_like, "read"):
+        valid, bad = scan_file(cast("IO[str] | IO[bytes]", file_like))
+        names = {StandardName._from_valid_name(name) for name in valid}
+        bad_names.update(bad)
+    else:
+        for name in file_like:
+            name = name.strip()
+            if name:
+                try:
+                    csn = StandardName(name)
+                except BadNameError:
+                    bad_names.add(name)
+                else:
+                    names.add(csn)
+    return names, bad_names
 
-    if bad_names:
-        if onerror == "warn":
-            for name in bad_names:
-                warnings.warn(f"{name}: not a valid name", stacklevel=2)
-        elif onerror == "raise":
-            raise BadRegistryError(bad_names)
 
-    return names
+def _parts(name: StandardName) -> tuple[str, str, str, tuple[str, ...]]:
+    return name.name, name.object, name.quantity, name.operators
+
+
+class RegistryChange(NamedTuple):
+    """A change, or batch of changes, made to a :class:`NamesRegistry`.
+
+    Names that were added, and those that were removed, are given along
+    with their parts, as ``(name, object, quantity, operators)``.
+    """
+
+    sequence: int
+    added: tuple[tuple[str, str, str, tuple[str, ...]], ...]
+    removed: tuple[tuple[str, str, str, tuple[str, ...]], ...]
+
+
+def _parse_many(
+    names: Iterable[str | StandardName],
+) -> dict[str, tuple[str, str, str, tuple[str, ...]]]:
+    """Validate and decompose names, failing on the first bad one."""
+    parsed = {}
+    for name in names:
+        if isinstance(name, StandardName):
+            parsed[name.name] = _parts(name)
+        elif standardname.is_valid_name(name):
+            parsed[name] = (name,) + StandardName.decompose_name(name)
+        else:
+            raise BadNameError(name)
+    return parsed
 
 
 def _strict_version_or_raise(version_str: str) -> Version:
+    from packaging.version import InvalidVersion
+    from packaging.version import Version
+
     try:
         return Version(version_str)
     except InvalidVersion as error:
@@ -117,6 +200,8 @@ def _get_latest_names_file(
     >>> _get_latest_names_file(prefix='names-0.8.3')
     (None, None)
     """
+    from glob import glob
+
     data_dir = path or os.path.join(os.path.dirname(__file__), "data")
 
     name_glob = f"{prefix}*{suffix}"
@@ -153,8 +238,8 @@ class NamesRegistry(MutableSet[str]):
 
     Parameters
     ----------
-    names : str or iterable of str, optional
-        Name(s) to add to the registry.
+    names : str, iterable of str, or file, optional
+        Name(s) to add to the registry, or a file of them.
     version : str, optional
         The version of the names registry.
 
@@ -220,7 +305,11 @@ class NamesRegistry(MutableSet[str]):
     {'air__temperature'}
     """
 
-    def __init__(self, names: str | Iterable[str] = (), version: str | None = None):
+    def __init__(
+        self,
+        names: str | Iterable[str] | IO[bytes] = (),
+        version: str | None = None,
+    ):
         if isinstance(names, str):
             names = [names]
 
@@ -230,12 +319,133 @@ class NamesRegistry(MutableSet[str]):
         self._objects: dict[str, int] = defaultdict(int)
         self._quantities: dict[str, int] = defaultdict(int)
         self._operators: dict[str, int] = defaultdict(int)
+        self._indexes: dict[str, NGramIndex] = {}
+        self._members: dict[str, dict[str, set[str]]] = {}
+        # Built on first use, then kept up to date as names change.
+        self._operator_trie: OperatorTrie | None = None
+        self._object_tree: ObjectTree | None = None
+        self._batch: list[tuple[bool, str | StandardName]] | None = None
+        self._read_only = False
+        self._sequence = 0
+        self._change_log: deque[RegistryChange] = deque(maxlen=self.CHANGE_LOG_SIZE)
+        self._subscribers: list[Callable[[RegistryChange], None]] = []
 
         self._load(names, onerror="raise")
 
-    def _load(self, file_like: Iterable[str], onerror: str = "raise") -> None:
-        for name in load_names_from_txt(file_like, onerror=onerror):
-            self.add(name)
+        # Sequence numbers count changes made after the registry was created.
+        self._sequence = 0
+        self._change_log.clear()
+
+    # Number of changes (or batches of changes) kept in the change log.
+    CHANGE_LOG_SIZE = 1024
+
+    def _load(
+        self, file_like: Iterable[str] | IO[bytes], onerror: str = "raise"
+    ) -> None:
+        self.add_many(load_names_from_txt(file_like, onerror=onerror))
+
+    @property
+    def sequence(self) -> int:
+        """The sequence number of the latest change to the registry.
+
+        Returns
+        -------
+        int
+            The number of changes, or batches of changes, made since the
+            registry was created.
+        """
+        return self._sequence
+
+    def subscribe(
+        self, callback: Callable[[RegistryChange], None]
+    ) -> Callable[[], None]:
+        """Be told about changes to the registry as they are made.
+
+        *callback* is called, after each change (or batch of changes made
+        with :meth:`batch`) is applied, with a :class:`RegistryChange`.
+        Copies of the registry don't inherit subscribers.
+
+        Parameters
+        ----------
+        callback : callable
+            Function to call with each change.
+
+        Returns
+        -------
+        callable
+            A function that, when called, cancels the subscription.
+
+        Examples
+        --------
+        >>> from standard_names import NamesRegistry
+
+        >>> registry = NamesRegistry(["air__temperature"])
+        >>> unsubscribe = registry.subscribe(print)
+        >>> with registry.batch():
+        ...     registry.add("air__log_of_pressure")
+        ...     registry.discard("air__temperature")
+        RegistryChange(sequence=1,
+                       added=(('air__log_of_pressure', 'air', 'pressure', ('log',)),),
+                       removed=(('air__temperature', 'air', 'temperature', ()),))
+        >>> unsubscribe()
+        >>> registry.add("air__temperature")
+        """
+        self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def changes_since(self, sequence: int) -> list[RegistryChange]:
+        """Changes made to the registry after some point.
+
+        Consumers that keep something derived from the registry (an
+        index, or a copy in a database, say) can remember the
+        :attr:`sequence` it was built at, and later catch up with only
+        the changes made since. The latest :attr:`CHANGE_LOG_SIZE`
+        changes are kept.
+
+        Parameters
+        ----------
+        sequence : int
+            The sequence number of the last change already seen.
+
+        Returns
+        -------
+        list of RegistryChange
+            The changes, oldest first.
+
+        Raises
+        ------
+        ValueError
+            If the changes since *sequence* are no longer in the log (in
+            which case, start again from the registry as it is now).
+
+        Examples
+        --------
+        >>> from standard_names import NamesRegistry
+
+        >>> registry = NamesRegistry(["air__temperature"])
+        >>> seen = registry.sequence
+        >>> registry.add("water__temperature")
+        >>> registry.discard("air__temperature")
+        >>> [
+        ...     ([a[0] for a in change.added], [r[0] for r in change.removed])
+        ...     for change in registry.changes_since(seen)
+        ... ]
+        [(['water__temperature'], []), ([], ['air__temperature'])]
+        >>> registry.changes_since(registry.sequence)
+        []
+        """
+        oldest = self._sequence - len(self._change_log)
+        if not oldest <= sequence <= self._sequence:
+            raise ValueError(
+                f"changes since {sequence} are not available"
+                f" (the log holds changes {oldest + 1} to {self._sequence})"
+            )
+        return list(self._change_log)[sequence - oldest :]
 
     @property
     def version(self) -> str:
@@ -292,12 +502,85 @@ class NamesRegistry(MutableSet[str]):
         """
         return frozenset(self._operators)
 
+    @property
+    def operator_trie(self) -> OperatorTrie:
+        """Trie of the operator chains of the names in the registry.
+
+        Returns
+        -------
+        OperatorTrie
+            Chains of operators, keyed outermost-first.
+
+        Examples
+        --------
+        >>> from standard_names import NamesRegistry
+        >>> registry = NamesRegistry(
+        ...     [
+        ...         "air__temperature",
+        ...         "air__time_derivative_of_temperature",
+        ...         "air__time_derivative_of_log_of_pressure",
+        ...     ]
+        ... )
+        >>> sorted(registry.operator_trie.startswith("time_derivative"))
+        ['air__time_derivative_of_log_of_pressure',
+         'air__time_derivative_of_temperature']
+        >>> registry.operator_trie.with_depth(0)
+        {'air__temperature'}
+        """
+        if self._operator_trie is None:
+            trie = OperatorTrie()
+            trie.add_many_parts(
+                (name, quantity, operators)
+                for name, _, quantity, operators in self._parts_of_names()
+            )
+            self._operator_trie = trie
+        return self._operator_trie
+
+    @property
+    def object_tree(self) -> ObjectTree:
+        """Tree of the objects of the names in the registry.
+
+        Returns
+        -------
+        ObjectTree
+            Objects, split into their ``_``-separated tokens.
+
+        Examples
+        --------
+        >>> from standard_names import NamesRegistry
+        >>> registry = NamesRegistry(
+        ...     [
+        ...         "atmosphere_air__temperature",
+        ...         "atmosphere_water__precipitation_rate",
+        ...         "soil__porosity",
+        ...     ]
+        ... )
+        >>> registry.object_tree.children("atmosphere")
+        {'air': 1, 'water': 1}
+        >>> registry.object_tree.count("soil")
+        1
+        """
+        if self._object_tree is None:
+            tree = ObjectTree()
+            tree.add_many_parts(
+                (name, object_) for name, object_, _, _ in self._parts_of_names()
+            )
+            self._object_tree = tree
+        return self._object_tree
+
+    def _parts_of_names(self) -> Iterator[tuple[str, str, str, tuple[str, ...]]]:
+        for name in self._names:
+            yield (name,) + StandardName.decompose_name(name)
+
     @classmethod
     def from_path(
         cls, paths: str | Iterable[str], version: str | None = None
     ) -> NamesRegistry:
         """Create a new registry from a text file.
 
+        A single file is memory mapped and checked all at once; the
+        contents of several files are read and then checked together.
+
         Parameters
         ----------
         path : str
@@ -310,16 +593,23 @@ class NamesRegistry(MutableSet[str]):
         """
         if isinstance(paths, str):
             paths = [paths]
+        paths = list(paths)
 
-        names = []
+        if len(paths) == 1:
+            with open(paths[0], "rb") as fp:
+                return cls(fp, version=version)
+
+        contents = []
         for path in paths:
-            with open(path) as fp:
-                names += [name.strip() for name in fp]
+            with open(path, "rb") as fp:
+                contents.append(fp.read())
 
-        return cls(names, version=version)
+        return cls(io.BytesIO(b"\n".join(contents)), version=version)
 
     @classmethod
     def from_url(cls, urls: Iterable[str]) -> NamesRegistry:
+        from urllib.request import urlopen
+
         if isinstance(urls, str):
             urls = [urls]
 
@@ -337,6 +627,74 @@ class NamesRegistry(MutableSet[str]):
             raise RuntimeError("unable to find a names file.")
         return cls.from_path(names_file, version=version)
 
+    @classmethod
+    def from_arrow(
+        cls,
+        data: pyarrow.Table | pyarrow.Array | pyarrow.ChunkedArray,
+        column: str = "name",
+        version: str | None = None,
+    ) -> NamesRegistry:
+        """Create a new registry from an Arrow table or array of names.
+
+        Parameters
+        ----------
+        data : pyarrow.Table or pyarrow.Array
+            Names, either as an array or as a column of a table.
+        column : str, optional
+            Column of the table that holds the names.
+        version : str, optional
+            The version of the registry. If not given, the version stored
+            in the table's metadata (by :meth:`to_arrow`), if any.
+
+        Returns
+        -------
+        NamesRegistry
+            A newly-created registry filled with the names.
+        """
+        import pyarrow.compute as pc
+
+        from standard_names.arrays import validate_array
+
+        if hasattr(data, "column"):
+            metadata = data.schema.metadata or {}
+            if version is None and b"version" in metadata:
+                version = metadata[b"version"].decode("utf-8")
+            data = data.column(column)
+
+        data = data.drop_null()
+        valid = validate_array(data)
+        if not pc.all(valid).as_py():
+            raise BadRegistryError(set(data.filter(pc.invert(valid)).to_pylist()))
+
+        return cls(data.to_pylist(), version=version)
+
+    def to_arrow(self) -> pyarrow.Table:
+        """The names of the registry, and their parts, as an Arrow table.
+
+        Returns
+        -------
+        pyarrow.Table
+            A table, sorted by name, with ``name``, ``object``, ``quantity``
+            and ``operators`` columns. The registry version is stored in the
+            table's metadata.
+        """
+        import pyarrow as pa
+
+        from standard_names.arrays import decompose_array
+
+        names = pa.array(sorted(self._names), type=pa.string())
+        _, objects, quantities, operators = decompose_array(names)
+
+        return pa.table(
+            {
+                "name": names,
+                "object": objects,
+                "quantity": quantities,
+                "operators": operators,
+            },
+            metadata={"version": self._version},
+        )
+
     def add(self, name: str | StandardName) -> None:
         """Add a name to the registry.
 
@@ -345,40 +703,413 @@ class NamesRegistry(MutableSet[str]):
         name : str
             A Standard Name.
         """
+        if self._batch is not None:
+            self._batch.append((True, name))
+            return
+
         if isinstance(name, str):
             name = StandardName(name)
 
         if name.name not in self._names:
-            self._names.add(name.name)
-            self._objects[name.object] += 1
-            self._quantities[name.quantity] += 1
-            for op in name.operators:
-                self._operators[op] += 1
+            self._change(added=[_parts(name)])
 
     def discard(self, name: str | StandardName) -> None:
+        if self._batch is not None:
+            self._batch.append((False, name))
+            return
+
         if isinstance(name, str):
             try:
                 name = StandardName(name)
             except BadNameError:
                 raise KeyError(name) from None
 
-        self._names.remove(name.name)
+        if name.name not in self._names:
+            raise KeyError(name.name)
+
+        self._change(removed=[_parts(name)])
+
+    def add_many(self, names: Iterable[str | StandardName]) -> None:
+        """Add names to the registry, all at once.
+
+        Names are all parsed before any are added so that, if one of
+        them is not a valid name, none of them are added.
+
+        Parameters
+        ----------
+        names : iterable of str
+            Standard Names.
+
+        Raises
+        ------
+        BadNameError
+            If any of the names are not valid names.
+
+        Examples
+        --------
+        >>> from standard_names import NamesRegistry
+        >>> from standard_names.error import BadNameError
+
+        >>> registry = NamesRegistry()
+        >>> registry.add_many(["air__temperature", "water__temperature"])
+        >>> try:
+        ...     registry.add_many(["air__pressure", "Water__pressure"])
+        ... except BadNameError as error:
+        ...     print(f"bad name: {error}")
+        bad name: Water__pressure
+        >>> sorted(registry)
+        ['air__temperature', 'water__temperature']
+        """
+        if self._batch is not None:
+            self._batch.extend((True, name) for name in names)
+        else:
+            self._commit([(True, name) for name in names])
+
+    def discard_many(self, names: Iterable[str | StandardName]) -> None:
+        """Remove names from the registry, all at once.
+
+        Parameters
+        ----------
+        names : iterable of str
+            Standard Names in the registry.
+
+        Raises
+        ------
+        KeyError
+            If any of the names are not in the registry (in which case,
+            none of them are removed).
+        """
+        if self._batch is not None:
+            self._batch.extend((False, name) for name in names)
+        else:
+            self._commit([(False, name) for name in names])
+
+    @contextmanager
+    def batch(self) -> Iterator[NamesRegistry]:
+        """Group changes to the registry into a single transaction.
+
+        Names added, or discarded, within the ``with`` block are applied,
+        together, when the block exits. Names are parsed all at once,
+        the counts of objects, quantities, and operators are each updated
+        once per batch, and derived indexes are refreshed only once. If
+        the block raises an exception, or any of the changes is invalid,
+        none of the changes are applied. Until then, the registry
+        doesn't change.
+
+        Batches can be nested, in which case the changes are applied
+        when the outermost block exits.
+
+        Raises
+        ------
+        BadNameError
+            If a name added in the batch is not a valid name.
+        KeyError
+            If a name discarded in the batch is not in the registry.
+
+        Examples
+        --------
+        >>> from standard_names import NamesRegistry
+        >>> registry = NamesRegistry(["air__temperature"])
+
+        >>> with registry.batch():
+        ...     registry.add("water__temperature")
+        ...     registry.discard("air__temperature")
+        ...     len(registry)
+        1
+        >>> sorted(registry)
+        ['water__temperature']
+
+        >>> try:
+        ...     with registry.batch():
+        ...         registry.add("air__temperature")
+        ...         registry.add("Air__temperature")
+        ... except BadNameError:
+        ...     pass
+        >>> sorted(registry)
+        ['water__temperature']
+        """
+        if self._batch is not None:
+            yield self
+            return
+
+        self._batch = []
+        try:
+            yield self
+        except BaseException:
+            self._batch = None
+            raise
+        changes, self._batch = self._batch, None
+        self._commit(changes)
+
+    def _commit(self, changes: Iterable[tuple[bool, str | StandardName]]) -> None:
+        """Validate, and then apply, an ordered sequence of changes."""
+        self._check_writable()
+
+        present: dict[str, bool] = {}
+        to_parse: dict[str, str | StandardName] = {}
+        for is_add, name in changes:
+            key = name.name if isinstance(name, StandardName) else name
+            if is_add:
+                to_parse.setdefault(key, name)
+                present[key] = True
+            elif present.get(key, key in self._names):
+                present[key] = False
+            else:
+                raise KeyError(key)
+
+        parsed = _parse_many(to_parse.values())
+        added = [
+            parsed[name]
+            for name, is_present in present.items()
+            if is_present and name not in self._names
+        ]
+        removed = [
+            (name,) + StandardName.decompose_name(name)
+            for name, is_present in present.items()
+            if not is_present and name in self._names
+        ]
+        if added or removed:
+            self._change(added=added, removed=removed)
+
+    def _change(
+        self,
+        added: Sequence[tuple[str, str, str, tuple[str, ...]]] = (),
+        removed: Sequence[tuple[str, str, str, tuple[str, ...]]] = (),
+    ) -> None:
+        """Apply changes, then log them and tell the subscribers."""
+        self._apply(added=added, removed=removed)
+
+        self._sequence += 1
+        change = RegistryChange(self._sequence, tuple(added), tuple(removed))
+        self._change_log.append(change)
+        for callback in list(self._subscribers):
+            callback(change)
+
+    def _apply(
+        self,
+        added: Iterable[tuple[str, str, str, tuple[str, ...]]] = (),
+        removed: Iterable[tuple[str, str, str, tuple[str, ...]]] = (),
+    ) -> None:
+        """Add and remove already-parsed names.
+
+        Names to add must not already be in the registry, and names to
+        remove must be. Nothing here can fail, so changes are applied
+        either all together or (if validation fails beforehand) not at all.
+        """
+        self._check_writable()
+        added, removed = list(added), list(removed)
+
+        if len(added) + len(removed) == 1:
+            self._apply_one(*(added[0] if added else removed[0]), add=bool(added))
+            return
+
+        self._names.difference_update(parts[0] for parts in removed)
+        self._names.update(parts[0] for parts in added)
+
+        for counts, items in (
+            (self._objects, [(parts[1],) for parts in added + removed]),
+            (self._quantities, [(parts[2],) for parts in added + removed]),
+            (self._operators, [parts[3] for parts in added + removed]),
+        ):
+            deltas = Counter(key for keys in items[: len(added)] for key in keys)
+            deltas.subtract(key for keys in items[len(added) :] for key in keys)
+            for key, delta in deltas.items():
+                count = counts.get(key, 0) + delta
+                if count > 0:
+                    counts[key] = count
+                else:
+                    counts.pop(key, None)
+
+        if self._operator_trie is not None:
+            self._operator_trie.discard_many_parts(
+                (name, quantity, ops) for name, _, quantity, ops in removed
+            )
+            self._operator_trie.add_many_parts(
+                (name, quantity, ops) for name, _, quantity, ops in added
+            )
+        if self._object_tree is not None:
+            self._object_tree.discard_many_parts(
+                (name, object_) for name, object_, _, _ in removed
+            )
+            self._object_tree.add_many_parts(
+                (name, object_) for name, object_, _, _ in added
+            )
+
+        self._clear_indexes()
+
+    def _apply_one(
+        self,
+        name: str,
+        object_: str,
+        quantity: str,
+        operators: tuple[str, ...],
+        add: bool = True,
+    ) -> None:
+        if add:
+            self._names.add(name)
+            self._objects[object_] += 1
+            self._quantities[quantity] += 1
+            for op in operators:
+                self._operators[op] += 1
+            if self._operator_trie is not None:
+                self._operator_trie.add_parts(name, quantity, operators)
+            if self._object_tree is not None:
+                self._object_tree.add_parts(name, object_)
+        else:
+            self._names.remove(name)
+            for counts, keys in (
+                (self._objects, (object_,)),
+                (self._quantities, (quantity,)),
+                (self._operators, operators),
+            ):
+                for key in keys:
+                    counts[key] -= 1
+                    if counts[key] <= 0:
+                        del counts[key]
+            if self._operator_trie is not None:
+                self._operator_trie.discard_parts(name, quantity, operators)
+            if self._object_tree is not None:
+                self._object_tree.discard_parts(name, object_)
+
+        self._clear_indexes()
+
+    def _check_writable(self) -> None:
+        if self._read_only:
+            raise TypeError("registry is a read-only snapshot")
+
+    def copy(self) -> NamesRegistry:
+        """A copy of the registry that can be changed independently of it.
+
+        Returns
+        -------
+        NamesRegistry
+            A new, writable, registry with the same names and version.
+
+        Examples
+        --------
+        >>> from standard_names import NamesRegistry
+        >>> registry = NamesRegistry(["air__temperature"])
+        >>> other = registry.copy()
+        >>> other.add("water__temperature")
+        >>> len(registry), len(other)
+        (1, 2)
+        """
+        # Not copy.copy, which would go through the (compact) pickled state.
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new._names = set(self._names)
+        new._objects = self._objects.copy()
+        new._quantities = self._quantities.copy()
+        new._operators = self._operators.copy()
+        # Derived indexes are replaced, rather than changed, so can be shared.
+        new._indexes = dict(self._indexes)
+        new._members = dict(self._members)
+        if self._operator_trie is not None:
+            new._operator_trie = self._operator_trie.copy()
+        if self._object_tree is not None:
+            new._object_tree = self._object_tree.copy()
+        new._batch = None
+        new._read_only = False
+        new._change_log = self._change_log.copy()
+        new._subscribers = []
+        return new
+
+    def __getstate__(self) -> dict[str, Any]:
+        """The state of the registry, compactly, for pickling.
+
+        Names, and the objects, quantities and operators, are each stored,
+        sorted, as a single newline-separated string, with the counts of
+        the parts as arrays. Derived indexes are rebuilt when needed, and
+        neither the change log nor subscribers are kept (so an unpickled
+        registry only has changes from after its current sequence).
+        """
+        state: dict[str, Any] = {
+            "version": self._version,
+            "names": "\n".join(sorted(self._names)),
+            "read_only": self._read_only,
+            "sequence": self._sequence,
+        }
+        for field in ("objects", "quantities", "operators"):
+            counts = getattr(self, f"_{field}")
+            keys = sorted(counts)
+            state[field] = (
+                "\n".join(keys),
+                _index_array([counts[key] for key in keys]),
+            )
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._setstate(state, _split_lines(state["names"]))
+
+    def _setstate(self, state: dict[str, Any], names: list[str]) -> None:
+        """Restore the pickled *state*, with its names (in sorted order)."""
+        self._version = state["version"]
+        self._names = set(names)
+        for field in ("objects", "quantities", "operators"):
+            keys, counts = state[field]
+            setattr(self, f"_{field}", Counter(dict(zip(_split_lines(keys), counts))))
+        self._indexes = {}
+        self._members = {}
+        self._operator_trie = None
+        self._object_tree = None
+        self._batch = None
+        self._read_only = state["read_only"]
+        self._sequence = state["sequence"]
+        self._change_log = deque(maxlen=self.CHANGE_LOG_SIZE)
+        self._subscribers = []
+
+    def freeze(self) -> FrozenNamesRegistry:
+        """A compact, read-only copy of the registry.
+
+        Returns
+        -------
+        FrozenNamesRegistry
+            The names, and their parts, of the registry.
+        """
+        return FrozenNamesRegistry._from_parts(
+            self._parts_of_names(), version=self._version
+        )
+
+    def _clear_indexes(self) -> None:
+        self._indexes.clear()
+        self._members.clear()
+
+    def _fuzzy_index(self, field: str) -> NGramIndex:
+        try:
+            return self._indexes[field]
+        except KeyError:
+            from standard_names._fuzzy import NGramIndex
+
+            index = self._indexes[field] = NGramIndex(getattr(self, f"_{field}"))
+            return index
+
+    def _names_by(self, part: str) -> dict[str, set[str]]:
+        try:
+            return self._members[part]
+        except KeyError:
+            pass
+
+        by_object = defaultdict(set)
+        by_quantity = defaultdict(set)
+        for name in self._names:
+            object_, quantity, _ = StandardName.decompose_name(name)
+            by_object[object_].add(name)
+            by_quantity[quantity].add(name)
+        self._members.update(object=by_object, quantity=by_quantity)
 
-        self._objects[name.object] -= 1
-        assert self._objects[name.object] >= 0
-        if self._objects[name.object] <= 0:
-            del self._objects[name.object]
+        return self._members[part]
 
-        self._quantities[name.quantity] -= 1
-        assert self._quantities[name.quantity] >= 0
-        if self._quantities[name.quantity] <= 0:
-            del self._quantities[name.quantity]
+    # As in MutableSet, the result is not the Set[str | T] that | gives.
+    def __ior__(self, names: Set[Any]) -> Self:  # type: ignore[misc]
+        self.add_many(names)
+        return self
 
-        for op in name.operators:
-            self._operators[op] -= 1
-            assert self._operators[op] >= 0
-            if self._operators[op] <= 0:
-                del self._operators[op]
+    def __isub__(self, names: Set[Any]) -> Self:
+        self.discard_many(list(names) if names is self else names)
+        return self
+
+    def clear(self) -> None:
+        self.discard_many(list(self._names))
 
     def __contains__(self, name: object) -> bool:
         if isinstance(name, StandardName):
@@ -394,6 +1125,7 @@ class NamesRegistry(MutableSet[str]):
     def __iter__(self) -> Generator[str, None, None]:
         yield from self._names
 
+    @timed("search")
     def search(self, name: str) -> set[str]:
         """Search the registry for a name.
 
@@ -411,6 +1143,150 @@ class NamesRegistry(MutableSet[str]):
 
         return set(get_close_matches(name, self._names))
 
+    @timed("search")
+    def search_components(
+        self, name: str, k: int = 10, cutoff: float = 0.4
+    ) -> list[tuple[str, float]]:
+        """Search the registry for a name, one part at a time.
+
+        The object, quantity, and operators of *name* are each matched
+        against the (much smaller) sets of objects, quantities, and
+        operators in the registry. Names made up of the matching parts are
+        then ranked by how well each of their parts matched.
+
+        Parameters
+        ----------
+        name : str
+            Name to search for. If it has no ``__``, it is taken to be a
+            quantity (with optional operators) of any object.
+        k : int, optional
+            Maximum number of names to return.
+        cutoff : float, optional
+            Similarity score, between 0 and 1, below which parts are not
+            considered to match.
+
+        Returns
+        -------
+        list of (str, float)
+            The closest names and their scores, best first.
+
+        Examples
+        --------
+        >>> from standard_names import NamesRegistry
+        >>> registry = NamesRegistry(
+        ...     [
+        ...         "air__temperature",
+        ...         "air__mean_of_temperature",
+        ...         "air__pressure",
+        ...         "water__temperature",
+        ...     ]
+        ... )
+        >>> registry.search_components("air__temp")
+        [('air__temperature', 0.698), ('air__mean_of_temperature', 0.444)]
+        >>> registry.search_components("watr__temperature")
+        [('water__temperature', 0.879)]
+        >>> registry.search_components("air__men_of_temperature", k=1)
+        [('air__mean_of_temperature', 0.902)]
+        >>> registry.search_components("pressure")
+        [('air__pressure', 1.0)]
+        """
+        object_, sep, quantity_clause = name.partition("__")
+        if not sep:
+            object_, quantity_clause = "", object_
+        operators, quantity = StandardName.decompose_quantity(quantity_clause)
+
+        quantities = dict(
+            self._fuzzy_index("quantities").query(quantity, k=k, cutoff=cutoff)
+        )
+        if object_:
+            objects = dict(
+                self._fuzzy_index("objects").query(object_, k=k, cutoff=cutoff)
+            )
+            by_object = self._names_by("object")
+            with_object = set().union(*(by_object[obj] for obj in objects))
+        operator_scores = [
+            dict(self._fuzzy_index("operators").query(op, k=k, cutoff=cutoff))
+            for op in operators
+        ]
+
+        by_quantity = self._names_by("quantity")
+        scores = []
+        for matched_quantity in quantities:
+            candidates = by_quantity[matched_quantity]
+            if object_:
+                candidates = candidates & with_object
+
+            for candidate in candidates:
+                (c_object, c_quantity, c_operators) = StandardName.decompose_name(
+                    candidate
+                )
+
+                total = len(quantity) * quantities[c_quantity]
+                weight = len(quantity) + sum(len(op) for op in c_operators)
+                if object_:
+                    total += len(object_) * objects[c_object]
+                    weight += len(object_)
+                for op, matches, c_op in zip(operators, operator_scores, c_operators):
+                    total += len(op) * matches.get(c_op, 0.0)
+                    weight += len(op) - len(c_op)
+                weight += sum(len(op) for op in operators[len(c_operators) :])
+
+                scores.append((candidate, round(total / weight, 3)))
+
+        scores.sort(key=lambda score: (-score[1], score[0]))
+        return scores[:k]
+
+    @timed("search")
+    def suggest(
+        self,
+        names: str | Iterable[str],
+        k: int = 3,
+        cutoff: float = 0.6,
+        processes: int | None = None,
+    ) -> dict[str, list[str]]:
+        """Suggest registered names that are close to other names.
+
+        The first call builds an n-gram index of the registry, which is
+        reused until the registry changes. Large numbers of names are
+        looked up in parallel.
+
+        Parameters
+        ----------
+        names : str or iterable of str
+            Name(s) to find suggestions for (typically, invalid names).
+        k : int, optional
+            Maximum number of suggestions for each name.
+        cutoff : float, optional
+            Similarity score, between 0 and 1, below which registered names
+            are not suggested.
+        processes : int, optional
+            Number of worker processes to use. By default, this depends on
+            how many names are given.
+
+        Returns
+        -------
+        dict
+            Suggestions, closest first, for each of the names.
+
+        Examples
+        --------
+        >>> from standard_names import NamesRegistry
+        >>> registry = NamesRegistry(["air__temperature", "water__temperature"])
+        >>> registry.suggest(["Air__temperature", "watr__temperature"], k=1)
+        {'Air__temperature': ['air__temperature'],
+         'watr__temperature': ['water__temperature']}
+        """
+        if isinstance(names, str):
+            names = [names]
+
+        return {
+            name: [match for match, _ in matches]
+            for name, matches in self._fuzzy_index("names")
+            .query_many(names, k=k, cutoff=cutoff, processes=processes)
+            .items()
+        }
+
+    @timed("match")
     def match(self, pattern: str) -> set[str]:
         """Search the registry for names that match a pattern.
 
@@ -430,6 +1306,7 @@ class NamesRegistry(MutableSet[str]):
         p = re.compile(fnmatch.translate(pattern))
         return {name for name in self._names if p.match(name)}
 
+    @timed("search")
     def names_with(self, parts: str | Iterable[str]) -> set[str]:
         """Search the registry for names containing words.
 
@@ -448,6 +1325,7 @@ class NamesRegistry(MutableSet[str]):
 
         return {name for name in self._names if all(part in name for part in parts)}
 
+    @timed("format", items=None)
     def dumps(
         self,
         format_: str = "text",
@@ -473,15 +1351,1308 @@ class NamesRegistry(MutableSet[str]):
             ) from None
 
         lines = [
-            formatter(
-                sorted(getattr(self, field)) if sort else getattr(self, field),
-                heading=field,
-            )
+            formatter(self._field_items(field, sort=sort), heading=field)
             for field in fields
         ]
 
         return (2 * newline).join(lines)
 
+    def _field_items(self, field: str, sort: bool = False) -> Iterable[str]:
+        items = getattr(self, field)
+        return sorted(items) if sort else items
+
+
+class SortedNamesRegistry(NamesRegistry):
+
+    """A registry of CSDMS Standard Names that is kept in sorted order.
+
+    Alongside the usual indexes, names, objects, quantities, and operators
+    are kept in sorted lists. Names added, or discarded, are buffered and
+    merged into the lists in one pass the next time they are read, so a
+    registry stays sorted through batches of insertions without resorting
+    all of its names. Iteration, :meth:`dumps` with ``sort=True``, and
+    prefix and range queries then walk, or bisect, the sorted lists.
+
+    Parameters
+    ----------
+    names : str or iterable of str, optional
+        Name(s) to add to the registry.
+    version : str, optional
+        The version of the names registry.
+
+    Examples
+    --------
+    >>> from standard_names.registry import SortedNamesRegistry
+
+    >>> registry = SortedNamesRegistry(["water__temperature", "air__temperature"])
+    >>> registry |= {"air__pressure", "soil__porosity"}
+    >>> list(registry)
+    ['air__pressure', 'air__temperature', 'soil__porosity', 'water__temperature']
+    >>> registry.startswith("air__")
+    ['air__pressure', 'air__temperature']
+    >>> registry.between("b", "w")
+    ['soil__porosity']
+    >>> registry.index("soil__porosity")
+    2
+    >>> registry[-1]
+    'water__temperature'
+    """
+
+    _FIELDS = ("names", "objects", "quantities", "operators")
+
+    def __init__(
+        self,
+        names: str | Iterable[str] | IO[bytes] = (),
+        version: str | None = None,
+    ):
+        self._sorted: dict[str, list[str]] = {field: [] for field in self._FIELDS}
+        self._added: dict[str, list[str]] = {field: [] for field in self._FIELDS}
+        self._removed: dict[str, set[str]] = {field: set() for field in self._FIELDS}
+        self._changes = 0
+        super().__init__(names, version=version)
+
+    def _apply(
+        self,
+        added: Iterable[tuple[str, str, str, tuple[str, ...]]] = (),
+        removed: Iterable[tuple[str, str, str, tuple[str, ...]]] = (),
+    ) -> None:
+        added, removed = list(added), list(removed)
+
+        touched = {
+            "objects": {parts[1] for parts in added + removed},
+            "quantities": {parts[2] for parts in added + removed},
+            "operators": {op for parts in added + removed for op in parts[3]},
+        }
+        before = {
+            field: {item for item in items if item in getattr(self, f"_{field}")}
+            for field, items in touched.items()
+        }
+
+        super()._apply(added=added, removed=removed)
+        self._changes += 1
+
+        for name, *_ in removed:
+            self._stage_discard("names", name)
+        for name, *_ in added:
+            self._stage_add("names", name)
+        for field, items in touched.items():
+            counts = getattr(self, f"_{field}")
+            for item in items:
+                if item in before[field] and item not in counts:
+                    self._stage_discard(field, item)
+                elif item not in before[field] and item in counts:
+                    self._stage_add(field, item)
+
+    def copy(self) -> SortedNamesRegistry:
+        new = cast(SortedNamesRegistry, super().copy())
+        new._sorted = {field: list(items) for field, items in self._sorted.items()}
+        new._added = {field: list(items) for field, items in self._added.items()}
+        new._removed = {field: set(items) for field, items in self._removed.items()}
+        return new
+
+    def _setstate(self, state: dict[str, Any], names: list[str]) -> None:
+        super()._setstate(state, names)
+        # Names, and their parts, are pickled in sorted order.
+        self._sorted = {
+            "names": names,
+            "objects": _split_lines(state["objects"][0]),
+            "quantities": _split_lines(state["quantities"][0]),
+            "operators": _split_lines(state["operators"][0]),
+        }
+        self._added = {field: [] for field in self._FIELDS}
+        self._removed = {field: set() for field in self._FIELDS}
+        self._changes = 0
+
+    def _stage_add(self, field: str, item: str) -> None:
+        try:
+            self._removed[field].remove(item)
+        except KeyError:
+            self._added[field].append(item)
+
+    def _stage_discard(self, field: str, item: str) -> None:
+        added = self._added[field]
+        if added and added[-1] == item:
+            added.pop()
+        else:
+            self._removed[field].add(item)
+
+    def _sorted_items(self, field: str) -> list[str]:
+        items = self._sorted[field]
+        removed, added = self._removed[field], self._added[field]
+        if removed:
+            items[:] = [item for item in items if item not in removed]
+            added[:] = [item for item in added if item not in removed]
+            removed.clear()
+        if added:
+            # Sorting the new items and then the concatenation of the two
+            # sorted runs is, thanks to timsort, a linear-time merge.
+            added.sort()
+            items += added
+            items.sort()
+            added.clear()
+        return items
+
+    def _field_items(self, field: str, sort: bool = False) -> Iterable[str]:
+        return self._sorted_items(field)
+
+    def __iter__(self) -> Generator[str, None, None]:
+        # Like a set, refuse to carry on if the registry changes underneath.
+        changes = self._changes
+        for name in self._sorted_items("names"):
+            if self._changes != changes:
+                break
+            yield name
+        if self._changes != changes:
+            raise RuntimeError("registry changed during iteration")
+
+    def __getitem__(self, index: int) -> str:
+        return self._sorted_items("names")[index]
+
+    def index(self, name: str) -> int:
+        """Position of a name in the sorted registry."""
+        names = self._sorted_items("names")
+        position = bisect_left(names, name)
+        if position < len(names) and names[position] == name:
+            return position
+        raise ValueError(f"{name!r} is not in registry")
+
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        """Positions of the first, and one past the last, names with a prefix."""
+        names = self._sorted_items("names")
+        start = bisect_left(names, prefix)
+
+        # Names that start with the prefix sort before the prefix's successor.
+        prefix = prefix.rstrip(chr(sys.maxunicode))
+        if not prefix:
+            return start, len(names)
+        successor = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return start, bisect_left(names, successor, lo=start)
+
+    def startswith(self, prefix: str) -> list[str]:
+        """Names, in order, that start with a prefix."""
+        start, stop = self.prefix_range(prefix)
+        return self._sorted_items("names")[start:stop]
+
+    def between(self, low: str, high: str) -> list[str]:
+        """Names, in order, that are at least *low* but less than *high*."""
+        names = self._sorted_items("names")
+        start = bisect_left(names, low)
+        return names[start : bisect_left(names, high, lo=start)]
+
+    @timed("match")
+    def match(self, pattern: str) -> set[str]:
+        """Search the registry for names that match a pattern.
+
+        Only the names that start with the literal prefix of the pattern
+        (the part before the first wildcard) are checked.
+
+        Parameters
+        ----------
+        pattern : str
+            Glob-style pattern with which to search the registry.
+
+        Returns
+        -------
+        list of str
+            List of names matching the pattern.
+        """
+        import fnmatch
+        import re
+
+        prefix = re.split(r"[*?\[]", pattern, maxsplit=1)[0]
+        p = re.compile(fnmatch.translate(pattern))
+        return {name for name in self.startswith(prefix) if p.match(name)}
+
+
+class MergedNamesRegistry(NamesRegistry):
+
+    """A registry of names merged from several sources, that remembers which.
+
+    Each name keeps the set of sources it was found in as a bitset (an
+    ``int`` with one bit for each source) and names are grouped by their
+    bitsets, so merging a source takes time proportional to its length, and
+    finding the names unique to a source takes time proportional to their
+    number. Names added other than through :meth:`add_source` belong to no
+    source.
+
+    Parameters
+    ----------
+    sources : mapping or iterable of (str, iterable of str), optional
+        Names, as lines of text, for each source.
+    version : str, optional
+        The version of the names registry.
+
+    Examples
+    --------
+    >>> from standard_names.registry import MergedNamesRegistry
+
+    >>> registry = MergedNamesRegistry(
+    ...     {
+    ...         "model_a.txt": ["air__temperature", "air__pressure"],
+    ...         "model_b.txt": ["air__temperature", "soil__porosity"],
+    ...     }
+    ... )
+    >>> registry.sources
+    ('model_a.txt', 'model_b.txt')
+    >>> registry.sources_of("air__temperature")
+    ('model_a.txt', 'model_b.txt')
+    >>> registry.unique_to("model_b.txt")
+    {'soil__porosity'}
+    >>> sorted(registry.names_from("model_a.txt"))
+    ['air__pressure', 'air__temperature']
+    """
+
+    def __init__(
+        self,
+        sources: Mapping[str, Iterable[str]] | Iterable[tuple[str, Iterable[str]]] = (),
+        version: str | None = None,
+    ):
+        self._sources: list[str] = []
+        self._bits: dict[str, int] = {}
+        self._masks: dict[str, int] = {}
+        self._by_mask: dict[int, set[str]] = {}
+        super().__init__(version=version)
+
+        for source, names in (
+            sources.items() if isinstance(sources, Mapping) else sources
+        ):
+            self.add_source(source, names)
+
+    @property
+    def sources(self) -> tuple[str, ...]:
+        """The sources, in the order they were first added."""
+        return tuple(self._sources)
+
+    def add_source(
+        self, source: str, names: str | Iterable[str], onerror: str = "raise"
+    ) -> None:
+        """Merge the names from a source into the registry.
+
+        Parameters
+        ----------
+        source : str
+            Label for the source (typically, a file name). Names added
+            again under the same label belong to the same source.
+        names : str or iterable of str
+            Names, as lines of text, from the source.
+        onerror : {'raise', 'warn', 'pass'}
+            What to do if a bad name is encountered.
+
+        Raises
+        ------
+        RuntimeError
+            If called within a :meth:`batch`.
+        """
+        if self._batch is not None:
+            raise RuntimeError("sources can't be added within a batch")
+
+        if isinstance(names, str):
+            names = [names]
+        parsed = load_names_from_txt(names, onerror=onerror)
+        self.add_many(parsed)
+
+        try:
+            bit = self._bits[source]
+        except KeyError:
+            bit = self._bits[source] = 1 << len(self._sources)
+            self._sources.append(source)
+
+        masks, by_mask = self._masks, self._by_mask
+        for name in parsed:
+            old = masks[name.name]
+            if not old & bit:
+                by_mask[old].discard(name.name)
+                if not by_mask[old]:
+                    del by_mask[old]
+                masks[name.name] = old | bit
+                by_mask.setdefault(old | bit, set()).add(name.name)
+
+    def sources_of(self, name: str) -> tuple[str, ...]:
+        """The sources that contain a name, in the order they were added."""
+        mask = self._masks[name]
+        return tuple(
+            source for index, source in enumerate(self._sources) if mask >> index & 1
+        )
+
+    def names_from(self, source: str) -> set[str]:
+        """The names found in a source."""
+        bit = self._bits[source]
+        names: set[str] = set()
+        for mask, group in self._by_mask.items():
+            if mask & bit:
+                names |= group
+        return names
+
+    def unique_to(self, source: str) -> set[str]:
+        """The names found in a source, and in no other."""
+        return set(self._by_mask.get(self._bits[source], ()))
+
+    def _apply(
+        self,
+        added: Iterable[tuple[str, str, str, tuple[str, ...]]] = (),
+        removed: Iterable[tuple[str, str, str, tuple[str, ...]]] = (),
+    ) -> None:
+        added, removed = list(added), list(removed)
+        super()._apply(added=added, removed=removed)
+
+        masks, by_mask = self._masks, self._by_mask
+        for name, *_ in removed:
+            mask = masks.pop(name)
+            by_mask[mask].discard(name)
+            if not by_mask[mask]:
+                del by_mask[mask]
+        if added:
+            masks.update((name, 0) for name, *_ in added)
+            by_mask.setdefault(0, set()).update(name for name, *_ in added)
+
+    def copy(self) -> MergedNamesRegistry:
+        new = cast(MergedNamesRegistry, super().copy())
+        new._sources = list(self._sources)
+        new._bits = dict(self._bits)
+        new._masks = dict(self._masks)
+        new._by_mask = {mask: set(group) for mask, group in self._by_mask.items()}
+        return new
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = super().__getstate__()
+        masks = [self._masks[name] for name in _split_lines(state["names"])]
+        state["sources"] = list(self._sources)
+        state["masks"] = array("Q", masks) if len(self._sources) <= 64 else masks
+        return state
+
+    def _setstate(self, state: dict[str, Any], names: list[str]) -> None:
+        super()._setstate(state, names)
+        self._sources = list(state["sources"])
+        self._bits = {source: 1 << bit for bit, source in enumerate(self._sources)}
+        self._masks = dict(zip(names, state["masks"]))
+        self._by_mask = {}
+        for name, mask in self._masks.items():
+            self._by_mask.setdefault(mask, set()).add(name)
+
+
+class ConcurrentNamesRegistry(MutableSet[str]):
+
+    """A registry of CSDMS Standard Names that can be shared between threads.
+
+    The names live in a :class:`NamesRegistry` that is never changed once
+    it has been published. Readers work with the current one (a
+    *snapshot*) and can keep using it, or iterating over it, no matter
+    what writers do. Writers are serialized: each batch of changes is
+    applied to a copy of the current snapshot, which then replaces it.
+    Single changes (:meth:`add` and :meth:`discard`) are collected in one
+    pending copy, which is published the next time the registry is read,
+    so that adding names one at a time copies the registry only once per
+    read rather than once per name. Readers take no locks unless there
+    are pending changes to publish.
+
+    Parameters
+    ----------
+    names : str or iterable of str, optional
+        Name(s) to add to the registry.
+    version : str, optional
+        The version of the names registry.
+
+    Examples
+    --------
+    >>> from standard_names.registry import ConcurrentNamesRegistry
+
+    >>> registry = ConcurrentNamesRegistry(["air__temperature"])
+    >>> snapshot = registry.snapshot()
+    >>> registry.add("water__temperature")
+    >>> len(snapshot), len(registry)
+    (1, 2)
+
+    Group changes into a batch to apply them all at once.
+
+    >>> with registry.batch() as draft:
+    ...     draft.add("ice__temperature")
+    ...     draft.discard("air__temperature")
+    >>> sorted(registry)
+    ['ice__temperature', 'water__temperature']
+    """
+
+    def __init__(self, names: str | Iterable[str] = (), version: str | None = None):
+        snapshot = NamesRegistry(names, version=version)
+        snapshot._read_only = True
+
+        self._snapshot = snapshot
+        self._lock = threading.RLock()
+        self._draft: NamesRegistry | None = None
+        self._pending: NamesRegistry | None = None
+
+    def snapshot(self) -> NamesRegistry:
+        """The current state of the registry.
+
+        Returns
+        -------
+        NamesRegistry
+            A read-only registry that later changes won't affect.
+        """
+        if self._pending is not None:
+            self._publish()
+        return self._snapshot
+
+    def _publish(self) -> None:
+        """Make pending single changes the new snapshot."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending._read_only = True
+                self._snapshot, self._pending = self._pending, None
+
+    def _writable(self) -> NamesRegistry:
+        """The copy that single changes go to (the lock must be held)."""
+        if self._draft is not None:
+            return self._draft
+        if self._pending is None:
+            self._pending = self._snapshot.copy()
+        return self._pending
+
+    @contextmanager
+    def batch(self) -> Iterator[NamesRegistry]:
+        """Change the registry in a single, serialized, transaction.
+
+        The block is given a writable copy of the registry (the *draft*).
+        Changes to the draft are applied, as with
+        :meth:`NamesRegistry.batch`, when the block exits, and the draft
+        then becomes the registry's new snapshot. If the block raises, the
+        registry is left as it was. Other writers wait until the block
+        exits; readers don't.
+        """
+        with self._lock:
+            if self._draft is not None:
+                yield self._draft
+                return
+
+            self._publish()
+            draft = self._snapshot.copy()
+            self._draft = draft
+            try:
+                with draft.batch():
+                    yield draft
+            finally:
+                self._draft = None
+
+            draft._read_only = True
+            self._snapshot = draft
+
+    def add(self, name: str | StandardName) -> None:
+        with self._lock:
+            self._writable().add(name)
+
+    def discard(self, name: str | StandardName) -> None:
+        with self._lock:
+            self._writable().discard(name)
+
+    def add_many(self, names: Iterable[str | StandardName]) -> None:
+        """Add names to the registry, all at once."""
+        with self.batch() as draft:
+            draft.add_many(names)
+
+    def discard_many(self, names: Iterable[str | StandardName]) -> None:
+        """Remove names from the registry, all at once."""
+        with self.batch() as draft:
+            draft.discard_many(names)
+
+    def __ior__(self, names: Set[Any]) -> Self:  # type: ignore[misc]
+        self.add_many(names)
+        return self
+
+    def __isub__(self, names: Set[Any]) -> Self:
+        self.discard_many(list(names))
+        return self
+
+    def clear(self) -> None:
+        with self.batch() as draft:
+            draft.clear()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.snapshot()
+
+    def __len__(self) -> int:
+        return len(self.snapshot())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.snapshot())
+
+    @property
+    def version(self) -> str:
+        """The version of the names database."""
+        return self.snapshot().version
+
+    @property
+    def names(self) -> frozenset[str]:
+        """All names in the registry."""
+        return self.snapshot().names
+
+    @property
+    def objects(self) -> frozenset[str]:
+        """All objects in the registry."""
+        return self.snapshot().objects
+
+    @property
+    def quantities(self) -> frozenset[str]:
+        """All quantities in the registry."""
+        return self.snapshot().quantities
+
+    @property
+    def operators(self) -> frozenset[str]:
+        """All operators in the registry."""
+        return self.snapshot().operators
+
+    def search(self, name: str) -> set[str]:
+        """Search the registry for a name (see :meth:`NamesRegistry.search`)."""
+        return self.snapshot().search(name)
+
+    def match(self, pattern: str) -> set[str]:
+        """Search for names that match a pattern (see :meth:`NamesRegistry.match`)."""
+        return self.snapshot().match(pattern)
+
+    def names_with(self, parts: str | Iterable[str]) -> set[str]:
+        """Search for names with words (see :meth:`NamesRegistry.names_with`)."""
+        return self.snapshot().names_with(parts)
+
+    def dumps(self, *args: Any, **kwds: Any) -> str:
+        """Format the registry (see :meth:`NamesRegistry.dumps`)."""
+        return self.snapshot().dumps(*args, **kwds)
+
+
+class ShardedNamesRegistry(MutableSet[str]):
+
+    """A registry of CSDMS Standard Names split into shards.
+
+    Names are partitioned, by their objects, among a number of
+    :class:`NamesRegistry` *shards*. A name always lives in the same shard,
+    which is chosen by a (stable) hash of either its whole object
+    (``partition="hash"``) or only the first ``_``-separated token of its
+    object (``partition="prefix"``), which keeps objects like
+    ``atmosphere_air`` and ``atmosphere_water`` together.
+
+    Shards are independent of one another and so, for large registries,
+    are built in parallel, by separate processes. Lookups, and changes,
+    go only to the shard that holds a name, as do patterns that give
+    enough of the object to pick out a shard. Other queries are asked of
+    every shard and their results merged.
+
+    Parameters
+    ----------
+    names : str or iterable of str, optional
+        Name(s) to add to the registry.
+    version : str, optional
+        The version of the names registry.
+    n_shards : int, optional
+        Number of shards.
+    partition : {'hash', 'prefix'}, optional
+        How names are assigned to shards.
+    processes : int, optional
+        Number of processes with which to build the shards. By default,
+        small registries are built in this process and larger ones use
+        all available CPUs.
+
+    Examples
+    --------
+    >>> from standard_names.registry import ShardedNamesRegistry
+
+    >>> registry = ShardedNamesRegistry(
+    ...     [
+    ...         "atmosphere_air__temperature",
+    ...         "atmosphere_water__temperature",
+    ...         "soil__porosity",
+    ...     ],
+    ...     n_shards=4,
+    ...     partition="prefix",
+    ... )
+    >>> len(registry)
+    3
+    >>> registry.shard_for("atmosphere_air__pressure") is registry.shard_for(
+    ...     "atmosphere_water__temperature"
+    ... )
+    True
+    >>> sorted(registry.match("atmosphere_*"))
+    ['atmosphere_air__temperature', 'atmosphere_water__temperature']
+    >>> sorted(registry.objects)
+    ['atmosphere_air', 'atmosphere_water', 'soil']
+    """
+
+    PARTITIONS = ("hash", "prefix")
+
+    # Registries with fewer names than this are, by default, built serially.
+    PARALLEL_BUILD_SIZE = 100000
+
+    def __init__(
+        self,
+        names: str | Iterable[str] = (),
+        version: str | None = None,
+        n_shards: int = 16,
+        partition: str = "hash",
+        processes: int | None = None,
+    ):
+        if partition not in self.PARTITIONS:
+            raise ValueError(
+                f"unknown partition: {partition!r} is not one of"
+                f" {', '.join(repr(p) for p in self.PARTITIONS)}"
+            )
+        if n_shards < 1:
+            raise ValueError(f"number of shards must be positive ({n_shards})")
+
+        if isinstance(names, str):
+            names = [names]
+
+        self._version = version or "0.0.0"
+        self._partition = partition
+
+        groups: list[list[str]] = [[] for _ in range(n_shards)]
+        appends = [group.append for group in groups]
+        shard_index = self._shard_index
+        for name in names:
+            name = name.strip()
+            if name:
+                appends[shard_index(name, n_shards)](name)
+        n_names = sum(len(group) for group in groups)
+
+        if processes is None:
+            processes = 1 if n_names < self.PARALLEL_BUILD_SIZE else os.cpu_count() or 1
+
+        if processes <= 1 or n_shards == 1:
+            built = [_build_shard(group, self._version) for group in groups]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(min(processes, n_shards)) as executor:
+                built = list(
+                    executor.map(
+                        _build_shard, groups, [self._version] * n_shards, chunksize=1
+                    )
+                )
+
+        bad_names = [
+            name for shard in built if isinstance(shard, list) for name in shard
+        ]
+        if bad_names:
+            raise BadRegistryError(bad_names)
+        self._shards = cast(list[NamesRegistry], built)
+
+    def _shard_index(self, name: str, n_shards: int | None = None) -> int:
+        object_ = name.partition("__")[0]
+        if self._partition == "prefix":
+            object_ = object_.partition("_")[0]
+        return zlib.crc32(object_.encode()) % (n_shards or len(self._shards))
+
+    @property
+    def shards(self) -> tuple[NamesRegistry, ...]:
+        """The shards of the registry.
+
+        Returns
+        -------
+        tuple of NamesRegistry
+            The registries that together hold the names. Names should be
+            added to, or removed from, the sharded registry rather than to
+            the shards themselves.
+        """
+        return tuple(self._shards)
+
+    @property
+    def partition(self) -> str:
+        """How names are assigned to shards."""
+        return self._partition
+
+    def shard_for(self, name: str | StandardName) -> NamesRegistry:
+        """The shard that holds, or would hold, a name.
+
+        Parameters
+        ----------
+        name : str
+            A Standard Name.
+
+        Returns
+        -------
+        NamesRegistry
+            The name's shard.
+        """
+        if isinstance(name, StandardName):
+            name = name.name
+        return self._shards[self._shard_index(name)]
+
+    def _shards_for_pattern(self, pattern: str) -> list[NamesRegistry]:
+        """The shards that could hold names that match a glob-style pattern."""
+        import re
+
+        literal = re.split(r"[*?\[]", pattern, maxsplit=1)[0]
+        if "__" in literal or (self._partition == "prefix" and "_" in literal):
+            return [self._shards[self._shard_index(literal)]]
+        return self._shards
+
+    def _group(
+        self, names: Iterable[str | StandardName]
+    ) -> dict[int, list[str | StandardName]]:
+        groups: dict[int, list[str | StandardName]] = defaultdict(list)
+        for name in names:
+            key = name.name if isinstance(name, StandardName) else name
+            groups[self._shard_index(key)].append(name)
+        return groups
+
+    def add(self, name: str | StandardName) -> None:
+        self.shard_for(name).add(name)
+
+    def discard(self, name: str | StandardName) -> None:
+        self.shard_for(name).discard(name)
+
+    def add_many(self, names: Iterable[str | StandardName]) -> None:
+        """Add names to the registry, all at once.
+
+        Raises
+        ------
+        BadNameError
+            If any of the names are not valid names (in which case, none
+            of them are added).
+        """
+        names = list(names)
+        for name in names:
+            if not isinstance(name, StandardName) and not standardname.is_valid_name(
+                name
+            ):
+                raise BadNameError(name)
+
+        for index, group in self._group(names).items():
+            self._shards[index].add_many(group)
+
+    def discard_many(self, names: Iterable[str | StandardName]) -> None:
+        """Remove names from the registry, all at once.
+
+        Raises
+        ------
+        KeyError
+            If any of the names are not in the registry (in which case,
+            none of them are removed).
+        """
+        keys = [name.name if isinstance(name, StandardName) else name for name in names]
+        seen = set()
+        for key in keys:
+            if key in seen or key not in self:
+                raise KeyError(key)
+            seen.add(key)
+
+        for index, group in self._group(keys).items():
+            self._shards[index].discard_many(group)
+
+    # As in MutableSet, the result is not the Set[str | T] that | gives.
+    def __ior__(self, names: Set[Any]) -> Self:  # type: ignore[misc]
+        self.add_many(names)
+        return self
+
+    def __isub__(self, names: Set[Any]) -> Self:
+        self.discard_many(list(names))
+        return self
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            shard.clear()
+
+    def __contains__(self, name: object) -> bool:
+        if isinstance(name, StandardName):
+            name = name.name
+        elif not isinstance(name, str):
+            return False
+        return name in self._shards[self._shard_index(name)]._names
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def __iter__(self) -> Iterator[str]:
+        for shard in self._shards:
+            yield from shard
+
+    @property
+    def version(self) -> str:
+        """The version of the names database."""
+        return self._version
+
+    @property
+    def names(self) -> frozenset[str]:
+        """All names in the registry."""
+        return frozenset(self)
+
+    @property
+    def objects(self) -> frozenset[str]:
+        """All objects in the registry."""
+        return frozenset().union(*(shard._objects for shard in self._shards))
+
+    @property
+    def quantities(self) -> frozenset[str]:
+        """All quantities in the registry."""
+        return frozenset().union(*(shard._quantities for shard in self._shards))
+
+    @property
+    def operators(self) -> frozenset[str]:
+        """All operators in the registry."""
+        return frozenset().union(*(shard._operators for shard in self._shards))
+
+    def search(self, name: str) -> set[str]:
+        """Search the registry for a name (see :meth:`NamesRegistry.search`).
+
+        The closest matches overall are among the closest matches in each
+        shard, so only those are compared with one another.
+        """
+        from difflib import get_close_matches
+
+        candidates = set().union(*(shard.search(name) for shard in self._shards))
+        return set(get_close_matches(name, candidates))
+
+    def match(self, pattern: str) -> set[str]:
+        """Search for names that match a pattern (see :meth:`NamesRegistry.match`).
+
+        If the pattern starts with a whole object (or, when partitioned by
+        prefix, with the first token of an object), only the shard that
+        holds names with that object is searched.
+        """
+        return set().union(
+            *(shard.match(pattern) for shard in self._shards_for_pattern(pattern))
+        )
+
+    def names_with(self, parts: str | Iterable[str]) -> set[str]:
+        """Search for names with words (see :meth:`NamesRegistry.names_with`)."""
+        if not isinstance(parts, str):
+            parts = list(parts)
+        return set().union(*(shard.names_with(parts) for shard in self._shards))
+
+
+def _build_shard(names: list[str], version: str) -> NamesRegistry | list[str]:
+    """Build a shard or, if some of the names are bad, return them."""
+    shard = NamesRegistry(version=version)
+    try:
+        shard.add_many(names)
+    except BadNameError:
+        return [name for name in names if not standardname.is_valid_name(name)]
+    return shard
+
+
+_FROZEN_MAGIC = b"SNFR"
+_FROZEN_HEADER = struct.Struct("<4sI")
+
+
+class FrozenNamesRegistry(Set[str]):
+
+    """A read-only registry of CSDMS Standard Names.
+
+    Names, objects, quantities, and operators are each kept, in sorted
+    order, in a :class:`~standard_names._frontcode.FrontCodedNames`
+    dictionary, and the parts of each name in arrays of indices into
+    those. A frozen registry takes a fraction of the memory of a
+    :class:`NamesRegistry` and can be written to, and read from, a
+    single buffer.
+
+    Parameters
+    ----------
+    names : str or iterable of str, optional
+        Name(s) in the registry.
+    version : str, optional
+        The version of the names registry.
+
+    Examples
+    --------
+    >>> from standard_names import NamesRegistry
+    >>> from standard_names.registry import FrozenNamesRegistry
+
+    >>> registry = FrozenNamesRegistry(
+    ...     ["air__temperature", "air__log_of_pressure", "water__temperature"]
+    ... )
+    >>> "air__temperature" in registry
+    True
+    >>> list(registry)
+    ['air__log_of_pressure', 'air__temperature', 'water__temperature']
+    >>> list(registry.objects)
+    ['air', 'water']
+    >>> registry.decompose("air__log_of_pressure")
+    ('air', 'pressure', ('log',))
+    >>> list(registry.startswith("air__"))
+    ['air__log_of_pressure', 'air__temperature']
+
+    >>> FrozenNamesRegistry.frombytes(registry.tobytes()) == registry
+    True
+    >>> NamesRegistry(["air__temperature"]).freeze() == {"air__temperature"}
+    True
+    """
+
+    # The block of shared memory the registry reads from, if any.
+    _shm: SharedMemory | None = None
+
+    _object_ids: array[int] | memoryview
+    _quantity_ids: array[int] | memoryview
+    _operator_ids: array[int] | memoryview
+    _operator_offsets: array[int] | memoryview
+
+    def __init__(self, names: str | Iterable[str] = (), version: str | None = None):
+        if isinstance(names, str):
+            names = [names]
+
+        parts = (
+            (name.name, name.object, name.quantity, name.operators)
+            for name in load_names_from_txt(names, onerror="raise")
+        )
+        self._init_from_parts(parts, version=version)
+
+    @classmethod
+    def _from_parts(
+        cls,
+        parts: Iterable[tuple[str, str, str, tuple[str, ...]]],
+        version: str | None = None,
+    ) -> FrozenNamesRegistry:
+        self = cls.__new__(cls)
+        self._init_from_parts(parts, version=version)
+        return self
+
+    def _init_from_parts(
+        self,
+        parts: Iterable[tuple[str, str, str, tuple[str, ...]]],
+        version: str | None = None,
+    ) -> None:
+        parts = sorted(parts)
+
+        self._version = version or "0.0.0"
+        self._names = FrontCodedNames(name for name, _, _, _ in parts)
+        self._objects = FrontCodedNames(object_ for _, object_, _, _ in parts)
+        self._quantities = FrontCodedNames(quantity for _, _, quantity, _ in parts)
+        self._operators = FrontCodedNames(
+            op for _, _, _, operators in parts for op in operators
+        )
+
+        objects = {object_: i for i, object_ in enumerate(self._objects)}
+        quantities = {quantity: i for i, quantity in enumerate(self._quantities)}
+        operators = {op: i for i, op in enumerate(self._operators)}
+
+        operator_ids: list[int] = []
+        operator_offsets = [0]
+        for _, _, _, chain in parts:
+            operator_ids.extend(operators[op] for op in chain)
+            operator_offsets.append(len(operator_ids))
+
+        self._object_ids = _index_array([objects[part[1]] for part in parts])
+        self._quantity_ids = _index_array([quantities[part[2]] for part in parts])
+        self._operator_ids = _index_array(operator_ids)
+        self._operator_offsets = _index_array(operator_offsets)
+
+    @classmethod
+    def _from_iterable(cls, names: Iterable[Any]) -> Set[Any]:
+        return cls(names)
+
+    @classmethod
+    def from_path(
+        cls, paths: str | Iterable[str], version: str | None = None
+    ) -> FrozenNamesRegistry:
+        """Create a frozen registry from text files of names."""
+        return NamesRegistry.from_path(paths, version=version).freeze()
+
+    @classmethod
+    def from_latest(cls) -> FrozenNamesRegistry:
+        """Create a frozen registry of the latest bundled names."""
+        return NamesRegistry.from_latest().freeze()
+
+    @classmethod
+    def frombytes(cls, buffer: bytes | memoryview) -> FrozenNamesRegistry:
+        """Create a frozen registry from the output of :meth:`tobytes`.
+
+        If *buffer* is a ``memoryview``, the registry reads from it without
+        making a copy, and so it must not be changed, or released, while
+        the registry is in use.
+        """
+        magic, n_sections = _FROZEN_HEADER.unpack_from(buffer)
+        if magic != _FROZEN_MAGIC:
+            raise ValueError("not a frozen names registry")
+
+        sections = []
+        offset = _FROZEN_HEADER.size
+        for _ in range(n_sections):
+            (size,) = struct.unpack_from("<Q", buffer, offset)
+            offset += 8
+            sections.append(buffer[offset : offset + size])
+            offset += size
+
+        version, names, objects, quantities, operators = sections[:5]
+        self = cls.__new__(cls)
+        self._version = bytes(version).decode("utf-8")
+        self._names = FrontCodedNames.frombytes(names)
+        self._objects = FrontCodedNames.frombytes(objects)
+        self._quantities = FrontCodedNames.frombytes(quantities)
+        self._operators = FrontCodedNames.frombytes(operators)
+        (
+            self._object_ids,
+            self._quantity_ids,
+            self._operator_ids,
+            self._operator_offsets,
+        ) = (_array_frombytes(section) for section in sections[5:])
+        return self
+
+    def tobytes(self) -> bytes:
+        """Serialize the registry.
+
+        Returns
+        -------
+        bytes
+            The registry, in a form that can be read by :meth:`frombytes`.
+        """
+        sections = [
+            self._version.encode("utf-8"),
+            self._names.tobytes(),
+            self._objects.tobytes(),
+            self._quantities.tobytes(),
+            self._operators.tobytes(),
+        ] + [
+            _array_tobytes(ids)
+            for ids in (
+                self._object_ids,
+                self._quantity_ids,
+                self._operator_ids,
+                self._operator_offsets,
+            )
+        ]
+        return _FROZEN_HEADER.pack(_FROZEN_MAGIC, len(sections)) + b"".join(
+            struct.pack("<Q", len(section)) + section for section in sections
+        )
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Pickled as the output of tobytes; a registry in shared memory is
+        # unpickled as a copy.
+        return type(self).frombytes, (self.tobytes(),)
+
+    def to_shared_memory(self, name: str | None = None) -> SharedMemory:
+        """Publish the registry in a block of shared memory.
+
+        Other processes, such as the workers of a process pool, can then
+        attach to the registry with :meth:`from_shared_memory`, by the
+        block's name, rather than each building its own.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the shared memory block to create. If not given, a
+            unique name is made up.
+
+        Returns
+        -------
+        SharedMemory
+            The block that holds the registry. It belongs to the caller,
+            who should ``close`` and ``unlink`` it once the other processes
+            are done with it.
+
+        Examples
+        --------
+        >>> from standard_names.registry import FrozenNamesRegistry
+
+        >>> registry = FrozenNamesRegistry(["air__temperature", "air__log_of_pressure"])
+        >>> shm = registry.to_shared_memory()
+        >>> shared = FrozenNamesRegistry.from_shared_memory(shm.name)
+        >>> "air__temperature" in shared
+        True
+        >>> shared.decompose("air__log_of_pressure")
+        ('air', 'pressure', ('log',))
+
+        >>> shared.close()
+        >>> shm.close()
+        >>> shm.unlink()
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        data = self.tobytes()
+        shm = SharedMemory(name=name, create=True, size=len(data))
+        # The buffer is only None once the block has been closed.
+        buffer = cast(memoryview, shm.buf)
+        buffer[: len(data)] = data
+        return shm
+
+    @classmethod
+    def from_shared_memory(cls, name: str) -> FrozenNamesRegistry:
+        """Attach to a registry published with :meth:`to_shared_memory`.
+
+        Names and their parts are looked up straight from the shared block,
+        without copying it. The block stays attached until the registry is
+        closed, either with :meth:`close` or by using it as a context
+        manager, or else for as long as it, or any of its tables (such as
+        :attr:`names`), is in use.
+
+        Parameters
+        ----------
+        name : str
+            Name of the shared memory block.
+
+        Returns
+        -------
+        FrozenNamesRegistry
+            A registry that reads from the shared block.
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        if sys.version_info >= (3, 13):
+            # The block belongs to the process that published it.
+            shm = SharedMemory(name=name, track=False)
+        else:
+            shm = SharedMemory(name=name)
+
+        self = cls.frombytes(cast(memoryview, shm.buf))
+        # Set last so that, on deletion, the views into the block are
+        # released before the block is closed. Tables taken from the
+        # registry keep the block open after the registry itself is gone.
+        for table in self._tables():
+            table._owner = shm
+        self._shm = shm
+        return self
+
+    def close(self) -> None:
+        """Detach from the shared memory block the registry reads from.
+
+        The registry, and any tables taken from it, can't be used once it
+        is closed. Registries that don't read from shared memory have
+        nothing to close.
+
+        Examples
+        --------
+        >>> from standard_names.registry import FrozenNamesRegistry
+
+        >>> shm = FrozenNamesRegistry(["air__temperature"]).to_shared_memory()
+        >>> with FrozenNamesRegistry.from_shared_memory(shm.name) as shared:
+        ...     names = shared.names
+        ...     list(names)
+        ['air__temperature']
+        >>> shm.close()
+        >>> shm.unlink()
+        """
+        if self._shm is None:
+            return
+
+        for table in self._tables():
+            table._release()
+        for ids in (
+            self._object_ids,
+            self._quantity_ids,
+            self._operator_ids,
+            self._operator_offsets,
+        ):
+            if isinstance(ids, memoryview):
+                ids.release()
+        self._shm.close()
+        self._shm = None
+
+    def __enter__(self) -> FrozenNamesRegistry:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _tables(self) -> tuple[FrontCodedNames, ...]:
+        return (self._names, self._objects, self._quantities, self._operators)
+
+    def thaw(self) -> NamesRegistry:
+        """A mutable copy of the registry."""
+        return NamesRegistry(self, version=self._version)
+
+    @property
+    def version(self) -> str:
+        """The version of the names database."""
+        return self._version
+
+    @property
+    def names(self) -> FrontCodedNames:
+        """All names in the registry, sorted."""
+        return self._names
+
+    @property
+    def objects(self) -> FrontCodedNames:
+        """All objects in the registry, sorted."""
+        return self._objects
+
+    @property
+    def quantities(self) -> FrontCodedNames:
+        """All quantities in the registry, sorted."""
+        return self._quantities
+
+    @property
+    def operators(self) -> FrontCodedNames:
+        """All operators in the registry, sorted."""
+        return self._operators
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used to store the registry."""
+        return sum(table.nbytes for table in self._tables()) + sum(
+            ids.itemsize * len(ids)
+            for ids in (
+                self._object_ids,
+                self._quantity_ids,
+                self._operator_ids,
+                self._operator_offsets,
+            )
+        )
+
+    def decompose(self, name: str) -> tuple[str, str, tuple[str, ...]]:
+        """The parts of a name in the registry.
+
+        Parameters
+        ----------
+        name : str
+            A name in the registry.
+
+        Returns
+        -------
+        tuple
+            The parts of the name as ``(object, quantity, operators)``.
+        """
+        try:
+            index = self._names.index(name)
+        except ValueError:
+            raise KeyError(name) from None
+
+        start, stop = self._operator_offsets[index : index + 2]
+        return (
+            self._objects.select(self._object_ids[index]),
+            self._quantities.select(self._quantity_ids[index]),
+            tuple(self._operators.select(i) for i in self._operator_ids[start:stop]),
+        )
+
+    def startswith(self, prefix: str) -> Iterator[str]:
+        """Iterate, in order, over the names that start with a prefix."""
+        return self._names.startswith(prefix)
+
+    def __contains__(self, name: object) -> bool:
+        if isinstance(name, StandardName):
+            name = name.name
+        return name in self._names
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+
+def _split_lines(lines: str) -> list[str]:
+    return lines.split("\n") if lines else []
+
+
+def _index_array(values: list[int]) -> array[int]:
+    """An array of non-negative integers with the smallest item size."""
+    largest = max(values, default=0)
+    typecode = "B" if largest < 2**8 else "H" if largest < 2**16 else "I"
+    return array(typecode, values)
+
+
+def _array_tobytes(ids: array[int] | memoryview) -> bytes:
+    typecode = ids.typecode if isinstance(ids, array) else ids.format
+    if sys.byteorder == "big":
+        ids = array(typecode, ids)
+        ids.byteswap()
+    return typecode.encode() + ids.tobytes()
+
+
+def _array_frombytes(buffer: bytes | memoryview) -> array[int] | memoryview:
+    # Arrays are only ever written by _index_array.
+    typecode = cast(Literal["B", "H", "I"], chr(buffer[0]))
+    if isinstance(buffer, memoryview) and sys.byteorder == "little":
+        return buffer[1:].cast(typecode)
+
+    ids = array(typecode)
+    ids.frombytes(buffer[1:])
+    if sys.byteorder == "big":
+        ids.byteswap()
+    return ids
+
 
 # REGISTRY = NamesRegistry.from_latest()
 
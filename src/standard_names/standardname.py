@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from typing import Any
 
+from standard_names import _stats
 from standard_names.error import BadNameError
 from standard_names.regex import STANDARD_NAME_REGEX
 
@@ -19,8 +20,20 @@ def is_valid_name(name: str) -> bool:
     -------
     bool
         ``True`` if the string is a valid standard name
+
+    Examples
+    --------
+    >>> from standard_names import is_valid_name
+    >>> is_valid_name("air__temperature")
+    True
+    >>> is_valid_name("air__temperature\\n")
+    False
     """
-    return bool(STANDARD_NAME_REGEX.match(name))
+    if _stats._enabled:
+        with _stats.timer("validate"):
+            return bool(STANDARD_NAME_REGEX.fullmatch(name))
+    # The whole string must match, as "$" also matches before a final newline.
+    return bool(STANDARD_NAME_REGEX.fullmatch(name))
 
 
 class StandardName:
@@ -73,6 +86,14 @@ class StandardName:
             name
         )
 
+    @classmethod
+    def _from_valid_name(cls, name: str) -> StandardName:
+        """Create a standard name from a string already known to be valid."""
+        self = cls.__new__(cls)
+        self._name = name
+        (self._object, self._quantity, self._operators) = cls.decompose_name(name)
+        return self
+
     @staticmethod
     def decompose_name(name: str) -> tuple[str, str, tuple[str, ...]]:
         """Decompose a name into its parts.
@@ -104,6 +125,13 @@ class StandardName:
         ... except BadNameError:
         ...     pass
         """
+        if _stats._enabled:
+            with _stats.timer("decompose"):
+                return StandardName._decompose_name(name)
+        return StandardName._decompose_name(name)
+
+    @staticmethod
+    def _decompose_name(name: str) -> tuple[str, str, tuple[str, ...]]:
         try:
             (object_part, quantity_clause) = name.split("__")
         except ValueError as error:
@@ -241,3 +269,12 @@ class StandardName:
 
     def __hash__(self) -> int:
         return hash(self.name)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # A name is pickled as just its string; the parts are worked out again.
+        # It isn't validated again, as the setters don't validate either.
+        return _unpickle_name, (type(self), self._name)
+
+
+def _unpickle_name(cls: type[StandardName], name: str) -> StandardName:
+    return cls._from_valid_name(name)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""Unit tests for validating and decomposing arrays of names."""
+import sys
+
+import pytest
+
+from standard_names.arrays import decompose_array
+from standard_names.arrays import validate_array
+from standard_names.error import BadRegistryError
+from standard_names.registry import NamesRegistry
+from standard_names.standardname import StandardName
+from standard_names.standardname import is_valid_name
+
+NAMES = [
+    "air__temperature",
+    "Air__temperature",
+    "air__log_of_mean_of_pressure",
+    "air_temperature",
+    "air__temperature",
+    "",
+    "atmosphere_air__east_derivative_of_temperature",
+    "air__temperature\n",
+]
+
+
+def test_validate_numpy():
+    np = pytest.importorskip("numpy")
+
+    mask = validate_array(np.array(NAMES))
+    assert mask.dtype == bool
+    assert mask.tolist() == [is_valid_name(name) for name in NAMES]
+
+    mask = validate_array(np.array([name.encode() for name in NAMES]))
+    assert mask.tolist() == [is_valid_name(name) for name in NAMES]
+
+    mask = validate_array(np.array(NAMES + [None], dtype=object))
+    assert mask.tolist() == [is_valid_name(name) for name in NAMES] + [False]
+
+
+def test_decompose_numpy():
+    np = pytest.importorskip("numpy")
+
+    parts = decompose_array(np.array(NAMES))
+    for i, name in enumerate(NAMES):
+        if is_valid_name(name):
+            assert parts.valid[i]
+            assert (
+                parts.object[i],
+                parts.quantity[i],
+                parts.operators[i],
+            ) == StandardName.decompose_name(name)
+        else:
+            assert not parts.valid[i]
+            assert parts.object[i] == parts.quantity[i] == ""
+            assert parts.operators[i] == ()
+
+
+def test_sequences_do_not_need_numpy(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)
+
+    assert validate_array(NAMES) == [is_valid_name(name) for name in NAMES]
+
+    parts = decompose_array(iter(NAMES))
+    assert parts.valid == [is_valid_name(name) for name in NAMES]
+    assert parts.object[0] == "air"
+    assert parts.quantity[2] == "pressure"
+    assert parts.operators[2] == ("log", "mean")
+    assert parts.object[1] == parts.quantity[1] == ""
+
+
+def test_trailing_newline_is_invalid_everywhere():
+    names = ["air__temperature\n", "air__temperature"]
+
+    assert validate_array(names) == [False, True]
+    np = pytest.importorskip("numpy")
+    assert validate_array(np.array(names)).tolist() == [False, True]
+    pa = pytest.importorskip("pyarrow")
+    assert validate_array(pa.array(names)).to_pylist() == [False, True]
+
+
+def test_validate_arrow():
+    pa = pytest.importorskip("pyarrow")
+
+    mask = validate_array(pa.array(NAMES + [None]))
+    assert mask.to_pylist() == [is_valid_name(name) for name in NAMES] + [False]
+
+    mask = validate_array(pa.chunked_array([NAMES[:3], NAMES[3:]]))
+    assert mask.to_pylist() == [is_valid_name(name) for name in NAMES]
+
+
+def test_arrow_matches_regex():
+    pa = pytest.importorskip("pyarrow")
+
+    names = []
+    for name in NamesRegistry.from_latest():
+        names += [name, name.capitalize(), "_" + name, "9" + name, name + "\n"]
+    mask = validate_array(pa.array(names))
+    assert mask.to_pylist() == [is_valid_name(name) for name in names]
+
+
+def test_decompose_arrow():
+    pa = pytest.importorskip("pyarrow")
+
+    parts = decompose_array(pa.chunked_array([NAMES[:3], NAMES[3:] + [None]]))
+    expected = [
+        StandardName.decompose_name(name) if is_valid_name(name) else None
+        for name in NAMES
+    ] + [None]
+    assert parts.valid.to_pylist() == [part is not None for part in expected]
+    assert parts.object.to_pylist() == [part and part[0] for part in expected]
+    assert parts.quantity.to_pylist() == [part and part[1] for part in expected]
+    assert parts.operators.to_pylist() == [part and list(part[2]) for part in expected]
+
+
+def test_registry_arrow_roundtrip():
+    pytest.importorskip("pyarrow")
+
+    registry = NamesRegistry.from_latest()
+    table = registry.to_arrow()
+
+    assert table.column_names == ["name", "object", "quantity", "operators"]
+    assert table.column("name").to_pylist() == sorted(registry)
+    assert set(table.column("object").to_pylist()) == registry.objects
+
+    copy = NamesRegistry.from_arrow(table)
+    assert copy == registry
+    assert copy.version == registry.version
+
+
+def test_registry_from_arrow_array():
+    pa = pytest.importorskip("pyarrow")
+
+    registry = NamesRegistry.from_arrow(
+        pa.array(["air__temperature", None, "water__temperature"]), version="1.0"
+    )
+    assert registry.names == {"air__temperature", "water__temperature"}
+    assert registry.version == "1.0"
+
+    with pytest.raises(BadRegistryError):
+        NamesRegistry.from_arrow(pa.array(["air__temperature", "Air__temperature"]))
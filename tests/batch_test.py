@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""Unit tests for batched changes to a NamesRegistry."""
+import random
+
+import pytest
+
+from standard_names.error import BadNameError
+from standard_names.registry import NamesRegistry
+from standard_names.registry import SortedNamesRegistry
+from standard_names.standardname import StandardName
+
+
+def assert_consistent(registry):
+    """Check a registry's counters and indexes against its names."""
+    expected = NamesRegistry()
+    for name in registry:
+        expected.add(name)
+
+    assert registry.objects == expected.objects
+    assert registry.quantities == expected.quantities
+    assert registry.operators == expected.operators
+    assert dict(registry._objects) == dict(expected._objects)
+    assert dict(registry._quantities) == dict(expected._quantities)
+    assert dict(registry._operators) == dict(expected._operators)
+    assert len(registry.operator_trie) == len(registry)
+    assert len(registry.object_tree) == len(registry)
+    assert registry.object_tree.objects() == registry.objects
+    for quantity in registry.quantities:
+        assert registry.operator_trie.applied_to(quantity)
+
+
+@pytest.mark.parametrize("cls", (NamesRegistry, SortedNamesRegistry))
+def test_add_many_discard_many(cls):
+    names = sorted(NamesRegistry.from_latest())
+    rng = random.Random(1945)
+
+    registry = cls()
+    expected = set()
+    for _ in range(10):
+        batch = rng.sample(names, 200)
+        registry.add_many(batch)
+        expected |= set(batch)
+
+        removed = rng.sample(sorted(expected), 50)
+        registry.discard_many(removed)
+        expected -= set(removed)
+
+        assert set(registry) == expected
+        assert_consistent(registry)
+    if cls is SortedNamesRegistry:
+        assert list(registry) == sorted(expected)
+
+
+@pytest.mark.parametrize("cls", (NamesRegistry, SortedNamesRegistry))
+def test_in_place_operators(cls):
+    registry = cls(["air__temperature"])
+    same = registry
+    registry |= {"water__temperature", "ice__depth"}
+    registry -= {"ice__depth"}
+    assert registry is same
+    assert registry.names == {"air__temperature", "water__temperature"}
+
+    registry -= registry
+    assert registry is same
+    assert len(registry) == 0
+    assert_consistent(registry)
+
+
+def test_add_many_is_atomic():
+    registry = NamesRegistry(["air__temperature"])
+    with pytest.raises(BadNameError):
+        registry.add_many(["water__temperature", "Ice__temperature", "ice__depth"])
+
+    assert registry.names == {"air__temperature"}
+    assert_consistent(registry)
+
+
+def test_discard_many_is_atomic():
+    registry = NamesRegistry(["air__temperature", "water__temperature"])
+    with pytest.raises(KeyError):
+        registry.discard_many(["air__temperature", "ice__depth"])
+
+    assert registry.names == {"air__temperature", "water__temperature"}
+
+
+def test_add_many_standard_names():
+    registry = NamesRegistry()
+    registry.add_many(
+        [StandardName("air__log_of_temperature"), "air__log_of_temperature"]
+    )
+    assert registry.names == {"air__log_of_temperature"}
+    assert registry.operators == {"log"}
+
+
+def test_batch_applied_on_exit():
+    registry = NamesRegistry(["air__temperature"])
+    with registry.batch():
+        registry.add("water__temperature")
+        registry.add("water__log_of_temperature")
+        registry.discard("air__temperature")
+        registry.discard("water__temperature")
+        assert registry.names == {"air__temperature"}
+
+    assert registry.names == {"water__log_of_temperature"}
+    assert_consistent(registry)
+
+
+def test_batch_rolls_back_on_bad_name():
+    registry = NamesRegistry(["air__temperature"])
+    with pytest.raises(BadNameError):
+        with registry.batch():
+            registry.add("water__temperature")
+            registry.discard("air__temperature")
+            registry.add("Water__temperature")
+
+    assert registry.names == {"air__temperature"}
+    assert_consistent(registry)
+
+    registry.add("ice__depth")
+    assert registry.names == {"air__temperature", "ice__depth"}
+
+
+def test_batch_rolls_back_on_error():
+    registry = NamesRegistry(["air__temperature"])
+    with pytest.raises(RuntimeError):
+        with registry.batch():
+            registry.add("water__temperature")
+            raise RuntimeError()
+
+    assert registry.names == {"air__temperature"}
+
+    with pytest.raises(KeyError):
+        with registry.batch():
+            registry.discard("air__temperature")
+            registry.discard("air__temperature")
+    assert registry.names == {"air__temperature"}
+
+
+def test_nested_batches():
+    registry = NamesRegistry()
+    with registry.batch():
+        registry.add("air__temperature")
+        with registry.batch():
+            registry.add_many(["water__temperature"])
+        assert len(registry) == 0
+    assert len(registry) == 2
+
+
+def test_batch_refreshes_indexes_once():
+    registry = NamesRegistry(["air__temperature"])
+    assert registry.suggest("air__temp")["air__temp"] == ["air__temperature"]
+    with registry.batch():
+        registry.add("air__temporary_pressure")
+    assert "air__temporary_pressure" in registry.suggest("air__tempor")["air__tempor"]
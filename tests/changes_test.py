@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""Unit tests for following changes to a NamesRegistry."""
+import random
+
+import pytest
+
+from standard_names.error import BadNameError
+from standard_names.registry import ConcurrentNamesRegistry
+from standard_names.registry import NamesRegistry
+from standard_names.registry import SortedNamesRegistry
+
+
+@pytest.fixture(scope="module")
+def names():
+    return sorted(NamesRegistry.from_latest())
+
+
+def test_created_at_sequence_zero(names):
+    registry = NamesRegistry(names)
+    assert registry.sequence == 0
+    assert registry.changes_since(0) == []
+
+
+def test_one_change_per_batch():
+    registry = NamesRegistry()
+    changes = []
+    registry.subscribe(changes.append)
+
+    registry.add("air__temperature")
+    registry.add("air__temperature")
+    registry.add_many(["water__temperature", "air__pressure"])
+    with registry.batch():
+        registry.discard("air__temperature")
+        registry.add("soil__porosity")
+        registry.discard("soil__porosity")
+
+    assert [change.sequence for change in changes] == [1, 2, 3]
+    assert changes[0].added == (("air__temperature", "air", "temperature", ()),)
+    assert {name for name, *_ in changes[1].added} == {
+        "water__temperature",
+        "air__pressure",
+    }
+    assert changes[2].added == ()
+    assert changes[2].removed == (("air__temperature", "air", "temperature", ()),)
+    assert registry.changes_since(0) == changes
+
+
+def test_failed_changes_are_not_published():
+    registry = NamesRegistry(["air__temperature"])
+    changes = []
+    registry.subscribe(changes.append)
+
+    with pytest.raises(BadNameError):
+        registry.add_many(["air__pressure", "Air__pressure"])
+    with pytest.raises(KeyError):
+        registry.discard("water__temperature")
+
+    assert changes == []
+    assert registry.sequence == 0
+
+
+def test_unsubscribe():
+    registry = NamesRegistry()
+    changes = []
+    unsubscribe = registry.subscribe(changes.append)
+
+    registry.add("air__temperature")
+    unsubscribe()
+    unsubscribe()
+    registry.add("air__pressure")
+
+    assert len(changes) == 1
+
+
+@pytest.mark.parametrize("cls", (NamesRegistry, SortedNamesRegistry))
+def test_catch_up_from_any_sequence(names, cls):
+    rng = random.Random(1945)
+    registry = cls(names[:100])
+
+    snapshots = {registry.sequence: registry.names}
+    for _ in range(50):
+        with registry.batch():
+            registry.add_many(rng.sample(names, 5))
+            registry.discard_many(rng.sample(sorted(registry), 3))
+        snapshots[registry.sequence] = registry.names
+
+    for sequence, snapshot in snapshots.items():
+        mirror = set(snapshot)
+        for change in registry.changes_since(sequence):
+            mirror.difference_update(name for name, *_ in change.removed)
+            mirror.update(name for name, *_ in change.added)
+        assert mirror == registry.names
+
+
+def test_subscribers_see_the_change_applied():
+    registry = SortedNamesRegistry(["b__x"])
+    seen = []
+    registry.subscribe(lambda change: seen.append(list(registry)))
+
+    registry.add_many(["c__x", "a__x"])
+    assert seen == [["a__x", "b__x", "c__x"]]
+
+
+def test_old_changes_are_dropped(monkeypatch):
+    monkeypatch.setattr(NamesRegistry, "CHANGE_LOG_SIZE", 4)
+    registry = NamesRegistry()
+    for n in range(10):
+        registry.add(f"air__temperature_{n}")
+
+    assert [change.sequence for change in registry.changes_since(6)] == [7, 8, 9, 10]
+    with pytest.raises(ValueError, match="not available"):
+        registry.changes_since(5)
+    with pytest.raises(ValueError):
+        registry.changes_since(11)
+
+
+def test_copies_keep_the_log_not_subscribers():
+    registry = NamesRegistry()
+    changes = []
+    registry.subscribe(changes.append)
+    registry.add("air__temperature")
+
+    other = registry.copy()
+    other.add("air__pressure")
+
+    assert len(changes) == 1
+    assert other.sequence == 2
+    assert [change.sequence for change in other.changes_since(0)] == [1, 2]
+    assert registry.sequence == 1
+
+
+def test_concurrent_snapshots_are_sequenced():
+    registry = ConcurrentNamesRegistry(["air__temperature"])
+    seen = registry.snapshot().sequence
+
+    registry.add("air__pressure")
+    with registry.batch() as draft:
+        draft.discard("air__temperature")
+        draft.add("water__temperature")
+
+    changes = registry.snapshot().changes_since(seen)
+    assert [change.sequence for change in changes] == [1, 2]
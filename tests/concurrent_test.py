@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+"""Unit tests for standard_names.ConcurrentNamesRegistry"""
+import random
+import threading
+import time
+
+import pytest
+
+from standard_names.registry import ConcurrentNamesRegistry
+from standard_names.registry import NamesRegistry
+from standard_names.standardname import StandardName
+
+
+def check_counters(registry):
+    objects, quantities, operators = {}, {}, {}
+    for name in registry:
+        object_, quantity, ops = StandardName.decompose_name(name)
+        objects[object_] = objects.get(object_, 0) + 1
+        quantities[quantity] = quantities.get(quantity, 0) + 1
+        for op in ops:
+            operators[op] = operators.get(op, 0) + 1
+
+    assert dict(registry._objects) == objects
+    assert dict(registry._quantities) == quantities
+    assert dict(registry._operators) == operators
+    assert len(registry.operator_trie) == len(registry.object_tree) == len(registry)
+
+
+def test_snapshots_are_isolated():
+    registry = ConcurrentNamesRegistry(["air__temperature"], version="1.0")
+    snapshot = registry.snapshot()
+
+    registry.add("water__temperature")
+    registry.discard("air__temperature")
+
+    assert snapshot.names == {"air__temperature"}
+    assert registry.names == {"water__temperature"}
+    assert registry.version == "1.0"
+    check_counters(snapshot)
+    check_counters(registry.snapshot())
+
+
+def test_snapshots_are_read_only():
+    registry = ConcurrentNamesRegistry(["air__temperature"])
+    with pytest.raises(TypeError):
+        registry.snapshot().add("water__temperature")
+    with pytest.raises(TypeError):
+        registry.snapshot().discard("air__temperature")
+    assert registry.names == {"air__temperature"}
+
+
+def test_failed_batch_leaves_registry_unchanged():
+    registry = ConcurrentNamesRegistry(["air__temperature"])
+    snapshot = registry.snapshot()
+
+    with pytest.raises(KeyError):
+        with registry.batch() as draft:
+            draft.add("water__temperature")
+            draft.discard("ice__depth")
+
+    assert registry.snapshot() is snapshot
+    registry.add("ice__depth")
+    assert registry.names == {"air__temperature", "ice__depth"}
+
+
+@pytest.fixture
+def copies(monkeypatch):
+    counted = []
+    copy = NamesRegistry.copy
+
+    def _copy(self):
+        counted.append(len(self))
+        return copy(self)
+
+    monkeypatch.setattr(NamesRegistry, "copy", _copy)
+    return counted
+
+
+def test_single_writes_copy_once_per_read(copies):
+    names = sorted(NamesRegistry.from_latest())[:1000]
+    registry = ConcurrentNamesRegistry()
+
+    for name in names:
+        registry.add(name)
+    assert len(copies) == 1
+    assert registry.names == set(names)
+
+    snapshot = registry.snapshot()
+    for name in names[:10]:
+        registry.discard(name)
+        assert name not in registry
+    assert len(copies) == 11
+    assert snapshot.names == set(names)
+    check_counters(registry.snapshot())
+
+
+def test_many_writes_copy_once(copies):
+    names = sorted(NamesRegistry.from_latest())[:1000]
+    registry = ConcurrentNamesRegistry()
+
+    registry.add_many(names)
+    assert len(copies) == 1
+    registry |= set(names[500:])
+    registry -= set(names[:500])
+    registry.discard_many(names[500:600])
+    assert len(copies) == 4
+    assert registry.names == set(names[600:])
+
+
+def test_single_writes_then_batch():
+    registry = ConcurrentNamesRegistry(["air__temperature"])
+    registry.add("water__temperature")
+    with registry.batch() as draft:
+        assert "water__temperature" in draft
+        draft.add("ice__depth")
+    assert registry.names == {"air__temperature", "water__temperature", "ice__depth"}
+    with pytest.raises(TypeError):
+        registry.snapshot().add("soil__depth")
+
+
+def test_stress_readers_and_writers():
+    names = sorted(NamesRegistry.from_latest())
+    n_writers, n_readers, n_rounds = 4, 6, 25
+
+    registry = ConcurrentNamesRegistry(names[:500])
+    pools = [names[500 + i :: n_writers] for i in range(n_writers)]
+    expected = [set() for _ in range(n_writers)]
+    done = threading.Event()
+    errors = []
+
+    def write(i):
+        rng = random.Random(i)
+        try:
+            for _ in range(n_rounds):
+                added = rng.sample(pools[i], 20)
+                if rng.random() < 0.5:
+                    registry.add_many(added)
+                else:
+                    for name in added[:5]:
+                        registry.add(name)
+                    with registry.batch() as draft:
+                        draft.add_many(added[5:])
+                expected[i] |= set(added)
+
+                removed = rng.sample(sorted(expected[i]), 10)
+                registry.discard_many(removed)
+                expected[i] -= set(removed)
+        except Exception as error:  # pragma: no cover
+            errors.append(error)
+
+    def read():
+        try:
+            while not done.is_set():
+                snapshot = registry.snapshot()
+                assert sum(snapshot._objects.values()) == len(snapshot)
+                assert sum(snapshot._quantities.values()) == len(snapshot)
+                assert len(snapshot.object_tree) == len(snapshot)
+                assert sum(1 for _ in snapshot) == len(snapshot)
+                assert sum(1 for _ in registry) >= 500
+                time.sleep(0.001)
+        except Exception as error:  # pragma: no cover
+            errors.append(error)
+
+    readers = [threading.Thread(target=read) for _ in range(n_readers)]
+    writers = [threading.Thread(target=write, args=(i,)) for i in range(n_writers)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert registry.names == set(names[:500]).union(*expected)
+    check_counters(registry.snapshot())
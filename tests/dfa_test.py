@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""Unit tests for standard_names.dfa"""
+import random
+
+import pytest
+
+from standard_names import dfa
+from standard_names.dfa import MESSAGES
+from standard_names.dfa import diagnose_name
+from standard_names.dfa import diagnose_names
+from standard_names.error import BadNameError
+from standard_names.regex import STANDARD_NAME_REGEX
+from standard_names.registry import NamesRegistry
+from standard_names.standardname import StandardName
+
+
+@pytest.mark.parametrize(
+    "name,offset,reason",
+    [
+        ("", 0, "empty"),
+        ("Air__temperature", 0, "uppercase_first_letter"),
+        ("air__Temperature", 5, "uppercase_first_letter"),
+        ("1air__temperature", 0, "bad_first_character"),
+        ("air__1temperature", 5, "bad_first_character"),
+        ("_air__temperature", 0, "bad_first_character"),
+        ("air__tempera ture", 12, "bad_character"),
+        ("air__temperature\n", 16, "bad_character"),
+        ("air__température", 9, "bad_character"),
+        ("air-~water__temperature", 4, "bad_separator"),
+        ("air__max__of_temperature", 9, "extra_double_underscore"),
+        ("air___temperature", 5, "bad_separator"),
+        ("air__-temperature", 5, "bad_separator"),
+        ("air_-_water__temperature", 4, "bad_separator"),
+        ("air_temperature", 15, "missing_double_underscore"),
+        ("air_", 4, "missing_double_underscore"),
+        ("air__", 5, "missing_quantity"),
+        ("air__temperature_", 17, "trailing_separator"),
+        ("air__temperature~", 17, "trailing_separator"),
+    ],
+)
+def test_diagnose_bad_names(name, offset, reason):
+    diagnosis = diagnose_name(name)
+    assert diagnosis == (offset, reason)
+    assert not diagnosis.valid
+    assert diagnosis.message == MESSAGES[reason]
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["air__temperature", "a1__b", "aB__cD", "air~dry__mass-per-area_density"],
+)
+def test_diagnose_good_names(name):
+    diagnosis = diagnose_name(name)
+    assert diagnosis.valid
+    assert diagnosis == (None, None)
+    assert diagnosis.message is None
+
+
+def test_dfa_agrees_with_regex():
+    rng = random.Random(1945)
+    alphabet = "aZ9_-~_!"
+    for _ in range(20000):
+        name = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 10)))
+        diagnosis = diagnose_name(name)
+        assert diagnosis.valid is bool(STANDARD_NAME_REGEX.match(name))
+        if not diagnosis.valid:
+            assert 0 <= diagnosis.offset <= len(name)
+
+
+def test_diagnose_names_batch():
+    names = sorted(NamesRegistry.from_latest())[:200]
+    bad = ["air__", "Air__temperature", "air__", ""]
+    diagnoses = diagnose_names(names + bad)
+
+    assert all(diagnosis.valid for diagnosis in diagnoses[: len(names)])
+    assert diagnoses[len(names) :] == [diagnose_name(name) for name in bad]
+
+
+def test_bad_name_error_diagnosis():
+    with pytest.raises(BadNameError) as excinfo:
+        StandardName("air__temperature__")
+    assert excinfo.value.offset == 17
+    assert excinfo.value.reason == "extra_double_underscore"
+    assert str(excinfo.value) == "air__temperature__"
+
+
+def _walk(name):
+    """Run the DFA one character at a time."""
+    state = dfa._START
+    for offset, char in enumerate(name):
+        state = dfa._TRANSITIONS[state][dfa._CLASSES.get(char, dfa._OTHER)]
+        if isinstance(state, str):
+            return offset, state
+    reason = dfa._AT_END[state]
+    return (None, None) if reason is None else (len(name), reason)
+
+
+def test_diagnosis_matches_stepping_through_dfa():
+    rng = random.Random(2024)
+    alphabet = "aZ9_-~_!"
+    for _ in range(20000):
+        name = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        assert diagnose_name(name) == _walk(name)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""Unit tests for front-coded dictionaries and frozen registries."""
+import pytest
+
+from standard_names._frontcode import FrontCodedNames
+from standard_names.error import BadRegistryError
+from standard_names.registry import FrozenNamesRegistry
+from standard_names.registry import NamesRegistry
+from standard_names.standardname import StandardName
+
+
+@pytest.mark.parametrize("block_size", (1, 3, 16))
+def test_frontcode_rank_select(block_size):
+    words = sorted(NamesRegistry.from_latest())
+    names = FrontCodedNames(reversed(words), block_size=block_size)
+
+    assert len(names) == len(words)
+    assert list(names) == words
+    for rank in range(0, len(words), 7):
+        word = words[rank]
+        assert names.select(rank) == word
+        assert names.rank(word) == rank
+        assert names.index(word) == rank
+        assert word in names
+    assert names[-1] == words[-1]
+
+
+def test_frontcode_missing():
+    names = FrontCodedNames(["air__temperature", "water__temperature"])
+
+    assert "air__pressure" not in names
+    assert "" not in names
+    assert 1 not in names
+    assert names.rank("air__pressure") == 0
+    assert names.rank("zebra__speed") == 2
+    with pytest.raises(ValueError):
+        names.index("air__pressure")
+    with pytest.raises(IndexError):
+        names.select(2)
+
+
+@pytest.mark.parametrize("prefix", ("", "a", "atmosphere_air", "soil_", "zzz"))
+def test_frontcode_prefix(prefix):
+    words = sorted(NamesRegistry.from_latest())
+    names = FrontCodedNames(words)
+
+    expected = [word for word in words if word.startswith(prefix)]
+    assert list(names.startswith(prefix)) == expected
+    start, stop = names.prefix_range(prefix)
+    assert stop - start == len(expected)
+
+
+def test_frontcode_empty():
+    names = FrontCodedNames()
+    assert len(names) == 0
+    assert list(names) == []
+    assert list(names.startswith("")) == []
+    assert FrontCodedNames.frombytes(names.tobytes()) == names
+
+
+def test_frontcode_roundtrip():
+    words = ["é__x", "air__temperature", "air__temperature", "ice__depth"]
+    names = FrontCodedNames(words, block_size=2)
+
+    copy = FrontCodedNames.frombytes(names.tobytes())
+    assert list(copy) == ["air__temperature", "ice__depth", "é__x"]
+    assert copy.select(2) == "é__x"
+
+    with pytest.raises(ValueError):
+        FrontCodedNames.frombytes(b"garbage" * 4)
+
+
+def test_frozen_registry_latest():
+    registry = NamesRegistry.from_latest()
+    frozen = registry.freeze()
+
+    assert frozen == registry
+    assert frozen.version == registry.version
+    assert set(frozen.objects) == registry.objects
+    assert set(frozen.quantities) == registry.quantities
+    assert set(frozen.operators) == registry.operators
+    assert frozen.names.nbytes < sum(len(name) for name in registry)
+
+    copy = FrozenNamesRegistry.frombytes(frozen.tobytes())
+    assert copy == frozen
+    assert copy.version == frozen.version
+    for name in list(registry)[::11]:
+        assert copy.decompose(name) == StandardName.decompose_name(name)
+
+
+def test_frozen_registry_thaw():
+    frozen = FrozenNamesRegistry(["air__temperature"], version="1.2.3")
+    registry = frozen.thaw()
+    registry.add("water__temperature")
+
+    assert registry.version == "1.2.3"
+    assert len(frozen) == 1
+    with pytest.raises(KeyError):
+        frozen.decompose("water__temperature")
+
+
+def test_frozen_registry_bad_name():
+    with pytest.raises(BadRegistryError):
+        FrozenNamesRegistry(["air__temperature", "Air__temperature"])
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""Check that importing standard_names, and starting the cli, stays quick."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = (
+    "concurrent.futures",
+    "difflib",
+    "glob",
+    "packaging.version",
+    "sqlite3",
+    "standard_names.registry",
+    "urllib.request",
+)
+
+# Cumulative import times, in milliseconds, as reported by "python -X importtime".
+BUDGET_MS = {
+    "standard_names": float(os.environ.get("STANDARD_NAMES_IMPORT_BUDGET_MS", 50.0)),
+    "standard_names.cli.main": float(
+        os.environ.get("STANDARD_NAMES_CLI_IMPORT_BUDGET_MS", 100.0)
+    ),
+}
+
+
+def _import_times(*args):
+    """Run python with -X importtime and parse the cumulative times (in ms)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        try:
+            times[module.strip()] = int(cumulative) / 1000.0
+        except ValueError:
+            pass
+    return times
+
+
+def _best_of(n, *args):
+    runs = [_import_times(*args) for _ in range(n)]
+    return {module: min(run.get(module, 0.0) for run in runs) for module in runs[0]}
+
+
+@pytest.mark.parametrize(
+    "args,module",
+    [
+        (("-c", "import standard_names"), "standard_names"),
+        (("-m", "standard_names", "--version"), "standard_names.cli.main"),
+    ],
+)
+def test_import_time_budget(args, module):
+    times = _best_of(3, *args)
+
+    assert module in times
+    assert times[module] < BUDGET_MS[module]
+    assert not set(HEAVY_MODULES) & set(times)
+
+
+def test_lazy_attributes():
+    code = "; ".join(
+        [
+            "import sys",
+            "import standard_names",
+            "assert 'standard_names.registry' not in sys.modules",
+            "assert standard_names.NamesRegistry.__name__ == 'NamesRegistry'",
+            "assert 'standard_names.registry' in sys.modules",
+            "assert standard_names.is_valid_name('air__temperature')",
+            "assert 'stats' in dir(standard_names)",
+        ]
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
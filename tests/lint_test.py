@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Unit tests for checking names against a reference vocabulary."""
+import pytest
+
+from standard_names.cli.main import main
+from standard_names.lint import Linter
+from standard_names.registry import NamesRegistry
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return NamesRegistry.from_latest()
+
+
+@pytest.fixture(scope="module")
+def linter(reference):
+    return Linter(reference)
+
+
+def test_registered_names_are_clean(reference, linter):
+    assert all(linter.lint(name) == [] for name in reference)
+
+
+def test_new_combinations_are_clean(reference, linter):
+    objects = sorted(reference.objects)[:20]
+    quantities = sorted(reference.quantities)[:20]
+    for object_, quantity in zip(objects, reversed(quantities)):
+        assert linter.lint(f"{object_}__{quantity}") == []
+
+
+def test_issues(linter):
+    issues = linter.lint("atmosphere_aire__tim_derivative_of_temprature")
+    assert [(issue.code, issue.part) for issue in issues] == [
+        ("unknown_quantity", "temprature"),
+        ("unknown_operator", "tim_derivative"),
+        ("near_miss_object", "atmosphere_aire"),
+    ]
+    assert issues[0].hints[0] == "temperature"
+    assert issues[1].hints[0] == "time_derivative"
+    assert issues[2].hints[0] == "atmosphere_air"
+
+
+def test_unknown_parts_without_hints(linter):
+    (issue,) = linter.lint("zzyzx__qqqqq")
+    assert issue.code == "unknown_quantity"
+    assert issue.hints == ()
+    assert issue.message == "unknown quantity 'qqqqq'"
+
+
+def test_invalid_name(linter):
+    (issue,) = linter.lint("air__Temperature")
+    assert issue.code == "invalid_name"
+    assert "at 5" in issue.message
+
+
+@pytest.mark.parametrize("processes", (1, 2))
+def test_lint_many(reference, linter, processes):
+    names = [name.replace("e", "a", 1) for name in sorted(reference)[::3]]
+    names += ["Air__temperature"]
+
+    results = list(linter.lint_many(iter(names), processes=processes, chunksize=100))
+    assert [name for name, _ in results] == names
+    assert [issues for _, issues in results] == [linter.lint(name) for name in names]
+
+
+def test_cli_lint(capsys, tmpdir):
+    with tmpdir.as_cwd():
+        with open("names.txt", "w") as fp:
+            fp.write("atmosphere_air__temperature\n\nsea_water__temprature\n")
+        assert main(["lint", "names.txt"]) == 1
+
+    out, err = capsys.readouterr()
+    assert out.splitlines() == [
+        "sea_water__temprature: unknown quantity 'temprature'"
+        " (did you mean 'temperature'?)"
+    ]
+    assert "1 issue" in err
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""Unit tests for standard_names.MergedNamesRegistry"""
+import random
+import sqlite3
+
+import pytest
+
+from standard_names.cli.main import main
+from standard_names.error import BadRegistryError
+from standard_names.registry import MergedNamesRegistry
+from standard_names.registry import NamesRegistry
+
+
+@pytest.fixture(scope="module")
+def sources():
+    names = sorted(NamesRegistry.from_latest())
+    rng = random.Random(1945)
+    return {f"model_{n}.txt": rng.sample(names, 200) for n in range(40)}
+
+
+def test_provenance_matches_sources(sources):
+    registry = MergedNamesRegistry(sources)
+
+    assert registry.sources == tuple(sources)
+    assert registry.names == set().union(*sources.values())
+    for name in list(registry)[::7]:
+        assert registry.sources_of(name) == tuple(
+            source for source, names in sources.items() if name in names
+        )
+    for source, names in sources.items():
+        others = set().union(*(n for s, n in sources.items() if s != source))
+        assert registry.names_from(source) == set(names)
+        assert registry.unique_to(source) == set(names) - others
+
+
+def test_add_source_again():
+    registry = MergedNamesRegistry([("a", ["air__temperature"])])
+    registry.add_source("b", ["air__temperature", "air__pressure"])
+    registry.add_source("a", ["air__pressure"])
+
+    assert registry.sources == ("a", "b")
+    assert registry.sources_of("air__pressure") == ("a", "b")
+    assert registry.unique_to("a") == registry.unique_to("b") == set()
+
+
+def test_names_without_source():
+    registry = MergedNamesRegistry({"a": ["air__temperature"]})
+    registry.add("air__pressure")
+    registry.add("air__temperature")
+
+    assert registry.sources_of("air__pressure") == ()
+    assert registry.sources_of("air__temperature") == ("a",)
+
+    registry.add_source("b", ["air__pressure"])
+    assert registry.unique_to("b") == {"air__pressure"}
+
+    registry.discard("air__pressure")
+    assert registry.unique_to("b") == set()
+    with pytest.raises(KeyError):
+        registry.sources_of("air__pressure")
+
+
+def test_copy_is_independent():
+    registry = MergedNamesRegistry({"a": ["air__temperature"]})
+    other = registry.copy()
+    other.add_source("b", ["air__temperature", "air__pressure"])
+
+    assert registry.sources == ("a",)
+    assert registry.sources_of("air__temperature") == ("a",)
+    assert other.sources_of("air__temperature") == ("a", "b")
+
+
+def test_bad_source_is_not_merged():
+    registry = MergedNamesRegistry({"a": ["air__temperature"]})
+    with pytest.raises(BadRegistryError):
+        registry.add_source("b", ["air__pressure", "Air__pressure"])
+    assert registry.sources == ("a",)
+    assert "air__pressure" not in registry
+
+    with registry.batch():
+        with pytest.raises(RuntimeError):
+            registry.add_source("c", ["air__pressure"])
+
+
+def test_cli_dump_sources(capsys, tmpdir):
+    with tmpdir.as_cwd():
+        with open("a.txt", "w") as fp:
+            fp.write("air__temperature\nair__pressure\n")
+        with open("b.txt", "w") as fp:
+            fp.write("air__temperature\nsoil__porosity\n")
+        assert main(["dump", "--sources", "a.txt", "b.txt"]) == 0
+
+    out, _ = capsys.readouterr()
+    assert out.splitlines() == [
+        "air__pressure: a.txt",
+        "air__temperature: a.txt, b.txt",
+        "soil__porosity: b.txt",
+    ]
+
+
+def test_cli_build_sources(capsys, tmpdir):
+    with tmpdir.as_cwd():
+        with open("a.txt", "w") as fp:
+            fp.write("air__temperature\nair__pressure\n")
+        with open("b.txt", "w") as fp:
+            fp.write("air__temperature\n")
+        assert main(["build", "--sources", "a.txt", "b.txt"]) == 0
+
+    out, _ = capsys.readouterr()
+    lines = out.splitlines()
+    assert lines[: lines.index("")] == [
+        "names:",
+        "  - air__pressure",
+        "  - air__temperature",
+    ]
+    assert lines[lines.index("sources:") :] == [
+        "sources:",
+        "  air__pressure:",
+        "    - a.txt",
+        "  air__temperature:",
+        "    - a.txt",
+        "    - b.txt",
+    ]
+
+
+def test_cli_sql_sources(capsys, tmpdir):
+    with tmpdir.as_cwd():
+        with open("a.txt", "w") as fp:
+            fp.write("air__temperature\nair__pressure\n")
+        with open("b.txt", "w") as fp:
+            fp.write("air__temperature\n")
+        assert main(["sql", "--sources", "a.txt", "b.txt"]) == 0
+
+    out, _ = capsys.readouterr()
+    db = sqlite3.connect(":memory:")
+    db.executescript(out)
+    rows = db.execute(
+        "SELECT names.name, sources.name FROM name_sources"
+        " JOIN names ON names.id = name_id JOIN sources ON sources.id = source_id"
+        " ORDER BY 1, 2"
+    ).fetchall()
+    assert rows == [
+        ("air__pressure", "a.txt"),
+        ("air__temperature", "a.txt"),
+        ("air__temperature", "b.txt"),
+    ]
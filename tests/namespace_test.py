@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""Unit tests for enumerating the names made from a vocabulary."""
+import itertools
+
+import pytest
+
+from standard_names.namespace import NameSpace
+from standard_names.registry import NamesRegistry
+from standard_names.standardname import StandardName
+from standard_names.standardname import is_valid_name
+
+OBJECTS = ["air", "sea_water", "soil"]
+QUANTITIES = ["temperature", "mass-per-volume_density"]
+OPERATORS = ["log", "gradient", "time_derivative"]
+
+
+@pytest.fixture(scope="module")
+def latest():
+    return NamesRegistry.from_latest()
+
+
+@pytest.mark.parametrize("distinct", (True, False))
+@pytest.mark.parametrize("max_operators", (0, 1, 2, 3, 4))
+def test_names_match_brute_force(max_operators, distinct):
+    space = NameSpace(OBJECTS, QUANTITIES, OPERATORS, max_operators, distinct)
+
+    expected = set()
+    for depth in range(max_operators + 1):
+        for chain in itertools.product(OPERATORS, repeat=depth):
+            if distinct and len(set(chain)) < len(chain):
+                continue
+            for object_, quantity in itertools.product(OBJECTS, QUANTITIES):
+                expected.add(StandardName.compose_name(object_, quantity, chain))
+
+    names = list(space)
+    assert len(names) == len(expected) == len(space) == space.size
+    assert set(names) == expected
+    assert all(is_valid_name(name) for name in names)
+    assert sum(space.count(depth) for depth in space.depths) == space.size
+
+
+def test_index_and_iteration_agree():
+    space = NameSpace(OBJECTS, QUANTITIES, OPERATORS, max_operators=3)
+    names = list(space)
+
+    assert [space[index] for index in range(space.size)] == names
+    assert space[-1] == names[-1]
+    for start, stop in ((0, 7), (5, 40), (100, 100), (3, space.size + 10)):
+        assert space.names_between(start, stop) == names[start:stop]
+    with pytest.raises(IndexError):
+        space[space.size]
+
+
+def test_contains():
+    space = NameSpace(OBJECTS, QUANTITIES, OPERATORS, max_operators=2)
+
+    assert all(name in space for name in space)
+    assert "air__log_of_gradient_of_temperature" in space
+    assert "air__log_of_log_of_temperature" not in space
+    assert "air__log_of_gradient_of_time_derivative_of_temperature" not in space
+    assert "ice__temperature" not in space
+    assert "air__pressure" not in space
+    assert "air_temperature" not in space
+    assert 1 not in space
+
+
+def test_from_registry_is_counted(latest):
+    space = NameSpace.from_registry(latest, max_operators=2)
+
+    n_objects, n_quantities, n_operators = (
+        len(latest.objects),
+        len(latest.quantities),
+        len(latest.operators),
+    )
+    assert space.size == n_objects * n_quantities * (
+        1 + n_operators + n_operators * (n_operators - 1)
+    )
+    assert sum(name in space for name in latest) > 0.95 * len(latest)
+    assert all(name in space for name in space.sample(100, seed=1945))
+
+
+def test_sample():
+    space = NameSpace(OBJECTS, QUANTITIES, OPERATORS, max_operators=3)
+
+    sample = space.sample(20, seed=1945)
+    assert len(set(sample)) == 20
+    assert sample == space.sample(20, seed=1945)
+    assert sorted(space.sample(space.size)) == sorted(space)
+    assert space.sample(0) == []
+    with pytest.raises(ValueError):
+        space.sample(space.size + 1)
+
+
+def test_sample_from_huge_space(latest):
+    space = NameSpace.from_registry(latest, max_operators=7)
+    assert space.size > 2**63
+
+    sample = space.sample(100, seed=1945)
+    assert len(set(sample)) == 100
+    assert sample == space.sample(100, seed=1945)
+    assert all(name in space for name in sample)
+
+
+@pytest.mark.parametrize("processes", (1, 2))
+def test_chunks(processes):
+    space = NameSpace(OBJECTS, QUANTITIES, OPERATORS, max_operators=3)
+    names = list(space)
+
+    chunks = list(space.chunks(chunksize=7, processes=processes))
+    assert all(len(chunk) == 7 for chunk in chunks[:-1])
+    assert [name for chunk in chunks for name in chunk] == names
+
+    chunks = list(space.chunks(chunksize=10, start=15, stop=52, processes=processes))
+    assert [name for chunk in chunks for name in chunk] == names[15:52]
+
+
+@pytest.mark.parametrize(
+    "parts",
+    (
+        (["Air"], QUANTITIES, OPERATORS),
+        (OBJECTS, ["temperature_of_x"], OPERATORS),
+        (OBJECTS, QUANTITIES, ["of"]),
+        (OBJECTS, QUANTITIES, ["x__y"]),
+    ),
+)
+def test_bad_parts(parts):
+    with pytest.raises(ValueError):
+        NameSpace(*parts)
+
+
+def test_empty_space():
+    space = NameSpace([], QUANTITIES, OPERATORS)
+    assert space.size == 0
+    assert list(space) == []
+    assert list(space.chunks()) == []
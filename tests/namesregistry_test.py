@@ -162,3 +162,28 @@ def test_unique_operators():
     assert len(operators) == 2
     assert "log" in operators
     assert "mean" in operators
+
+
+def test_search_components_latest():
+    """Search by parts finds names with typos in any part."""
+    nreg = NamesRegistry.from_latest()
+
+    assert nreg.search_components("sea_watr__temperature", k=1) == [
+        ("sea_water__temperature", 0.889)
+    ]
+    names = [name for name, _ in nreg.search_components("land_surface__temprature")]
+    assert "land_surface__temperature" in names[:3]
+
+
+def test_search_components_updated():
+    """Component indexes are rebuilt after the registry changes."""
+    nreg = NamesRegistry(["air__temperature"])
+    assert nreg.search_components("water__temp") == []
+
+    nreg.add("water__temperature")
+    assert [name for name, _ in nreg.search_components("water__temp")] == [
+        "water__temperature"
+    ]
+
+    nreg.discard("water__temperature")
+    assert nreg.search_components("water__temp") == []
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""Unit tests for normalizing almost-valid names."""
+import pytest
+
+from standard_names.cli.main import NORMALIZE_RULES
+from standard_names.cli.main import main
+from standard_names.normalize import RULES
+from standard_names.normalize import Normalizer
+from standard_names.registry import NamesRegistry
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return NamesRegistry.from_latest()
+
+
+@pytest.mark.parametrize(
+    "name,candidate,rules",
+    (
+        ("air__temperature", "air__temperature", ()),
+        ("  air__temperature ", "air__temperature", ()),
+        ("Water__Temperature", "water__temperature", ("lowercase_first_letter",)),
+        ("air___temperature", "air__temperature", ("collapse_separators",)),
+        ("air -temperature", "air__temperature", None),
+        ("_air__temperature_", "air__temperature", ("collapse_separators",)),
+        ("air__x__temperature", "air__x_temperature", ("double_underscore",)),
+        ("air__log-OF-temperature", "air__log_of_temperature", ("canonical_of",)),
+        ("air__log_of_of_temperature", "air__log_of_temperature", ("canonical_of",)),
+        ("air__of_temperature", "air__temperature", ("canonical_of",)),
+        ("air__temperature_of", "air__temperature", ("canonical_of",)),
+        ("office__temperature", "office__temperature", ()),
+        ("temperature", None, ()),
+        ("air__temperature%", None, ()),
+    ),
+)
+def test_normalize(name, candidate, rules):
+    result = Normalizer().normalize(name)
+    assert result.name == name
+    assert result.candidate == candidate
+    if rules is not None:
+        assert result.rules == rules
+    assert result.registered is None
+    if candidate is None:
+        assert result.confidence == 0.0
+    elif result.rules:
+        assert 0.0 < result.confidence < 1.0
+    else:
+        assert result.confidence == 1.0
+
+
+def test_normalize_is_idempotent(registry):
+    normalizer = Normalizer(registry)
+    for name in list(registry)[::10]:
+        result = normalizer.normalize(name)
+        assert result.candidate == name
+        assert result.confidence == 1.0
+        assert result.registered
+
+
+def test_registry_chooses_split(registry):
+    normalizer = Normalizer(registry)
+    names = [name for name in registry if "_of_" not in name][::5]
+
+    fixed = [normalizer.normalize(name.replace("__", "_")) for name in names]
+    assert sum(
+        result.candidate == name for result, name in zip(fixed, names)
+    ) > 0.9 * len(names)
+    for result in fixed:
+        assert result.registered == (result.candidate in registry)
+        if not result.registered:
+            assert result.confidence <= 0.5
+
+
+def test_rules_can_be_chosen():
+    normalizer = Normalizer(rules=["lowercase_first_letter", "collapse_separators"])
+    assert normalizer.rules == ("collapse_separators", "lowercase_first_letter")
+    assert normalizer.normalize("Air__temperature").candidate == "air__temperature"
+    assert normalizer.normalize("air_temperature").candidate is None
+
+    with pytest.raises(ValueError, match="not_a_rule"):
+        Normalizer(rules=["not_a_rule"])
+
+
+def test_cli_rules_match():
+    assert NORMALIZE_RULES == RULES
+
+
+@pytest.mark.parametrize("processes", (1, 2))
+def test_normalize_many_streams(registry, processes):
+    normalizer = Normalizer(registry)
+    names = [name.replace("__", "_").capitalize() for name in sorted(registry)[:500]]
+    names += names[:100] + ["bad name%"]
+
+    def generate():
+        yield from names
+
+    results = list(
+        normalizer.normalize_many(generate(), processes=processes, chunksize=64)
+    )
+    assert results == [normalizer.normalize(name) for name in names]
+
+
+def test_cli_normalize(capsys, tmpdir):
+    with tmpdir.as_cwd():
+        with open("names.txt", "w") as fp:
+            fp.write("Sea_water__temperature\n\nsea_water_temperature\nair__x%\n")
+        assert main(["normalize", "names.txt"]) == 1
+        out, err = capsys.readouterr()
+        assert out.splitlines() == [
+            "Sea_water__temperature\tsea_water__temperature\t0.950",
+            "sea_water_temperature\tsea_water__temperature\t0.900",
+            "air__x%\t\t0.000",
+        ]
+        assert "1 name" in err
+
+        assert main(["normalize", "--min-confidence", "0.92", "names.txt"]) == 1
+        out, _ = capsys.readouterr()
+        assert [line.split("\t")[1] for line in out.splitlines()] == [
+            "sea_water__temperature",
+            "",
+            "",
+        ]
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""Unit tests for pickling registries and names."""
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from standard_names.registry import MergedNamesRegistry
+from standard_names.registry import NamesRegistry
+from standard_names.registry import ShardedNamesRegistry
+from standard_names.registry import SortedNamesRegistry
+from standard_names.standardname import StandardName
+
+
+@pytest.fixture(scope="module")
+def latest():
+    return NamesRegistry.from_latest()
+
+
+def round_trip(obj):
+    return pickle.loads(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def counts(registry):
+    return (
+        dict(registry._objects),
+        dict(registry._quantities),
+        dict(registry._operators),
+    )
+
+
+@pytest.mark.parametrize("cls", (NamesRegistry, SortedNamesRegistry))
+def test_registry_round_trip(latest, cls):
+    registry = cls(latest, version="1.2.3")
+    registry.operator_trie
+    registry.search_components("air__temprature")
+
+    copy = round_trip(registry)
+    assert type(copy) is cls
+    assert copy.version == "1.2.3"
+    assert copy.names == registry.names
+    assert counts(copy) == counts(registry)
+    assert copy.operator_trie.with_depth(2) == registry.operator_trie.with_depth(2)
+    assert copy.search_components("air__temprature") == registry.search_components(
+        "air__temprature"
+    )
+    if cls is SortedNamesRegistry:
+        assert list(copy) == sorted(registry)
+        assert copy.startswith("air__") == registry.startswith("air__")
+
+
+@pytest.mark.parametrize("cls", (NamesRegistry, SortedNamesRegistry))
+def test_unpickled_registry_can_change(cls):
+    registry = round_trip(cls(["air__temperature", "air__log_of_pressure"]))
+
+    registry.discard("air__log_of_pressure")
+    assert registry.operators == frozenset()
+    registry.add("water__temperature")
+    assert sorted(registry) == ["air__temperature", "water__temperature"]
+    assert registry.objects == {"air", "water"}
+    assert counts(registry) == counts(NamesRegistry(registry))
+
+
+def test_changes_and_subscribers_are_not_pickled():
+    registry = NamesRegistry(["air__temperature"])
+    registry.subscribe(lambda change: None)
+    registry.add("water__temperature")
+    registry._read_only = True
+
+    copy = round_trip(registry)
+    assert copy.sequence == registry.sequence == 1
+    assert copy.changes_since(copy.sequence) == []
+    with pytest.raises(ValueError):
+        copy.changes_since(0)
+    assert copy._subscribers == []
+    assert copy._read_only
+
+
+def test_pickle_is_compact(latest):
+    registry = NamesRegistry()
+    registry.add_many(latest)
+
+    size = len(pickle.dumps(registry, protocol=pickle.HIGHEST_PROTOCOL))
+    assert size < 0.6 * len(pickle.dumps(vars(registry), pickle.HIGHEST_PROTOCOL))
+
+
+def test_merged_round_trip():
+    registry = MergedNamesRegistry(
+        {"a": ["air__temperature", "air__pressure"], "b": ["air__pressure"]}
+    )
+    copy = round_trip(registry)
+
+    assert copy.sources == ("a", "b")
+    assert copy.sources_of("air__pressure") == ("a", "b")
+    assert copy.unique_to("a") == {"air__temperature"}
+    copy.add_source("c", ["air__temperature"])
+    assert copy.sources_of("air__temperature") == ("a", "c")
+
+
+def test_frozen_round_trip(latest):
+    registry = latest.freeze()
+    copy = round_trip(registry)
+    assert copy == registry
+    assert copy.decompose("air__temperature") == registry.decompose("air__temperature")
+
+
+def test_sharded_round_trip(latest):
+    registry = ShardedNamesRegistry(latest, n_shards=4)
+    copy = round_trip(registry)
+    assert copy.names == registry.names
+    assert copy.operators == registry.operators
+    assert "air__temperature" in copy.shard_for("air__temperature")
+
+
+def test_standard_name_round_trip():
+    name = StandardName("atmosphere_air__log_of_temperature")
+    copy = round_trip(name)
+    assert copy == name
+    assert (copy.object, copy.quantity, copy.operators) == (
+        "atmosphere_air",
+        "temperature",
+        ("log",),
+    )
+    assert len(pickle.dumps(name)) < len(pickle.dumps(vars(name)))
+
+
+def test_changed_standard_name_round_trip():
+    name = StandardName("air__temperature")
+    name.object = "Water"
+
+    copy = round_trip(name)
+    assert copy == name
+    assert str(copy) == "Water__temperature"
+    assert copy.object == "Water"
+
+
+def _count(registry):
+    return len(registry), sorted(registry.objects)[:3]
+
+
+def test_registry_sent_to_workers(latest):
+    registry = SortedNamesRegistry(latest)
+    with ProcessPoolExecutor(1) as executor:
+        assert executor.submit(_count, registry).result() == _count(registry)
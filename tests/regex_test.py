@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Unit tests for standard_names.regex"""
+import random
+import re
+import time
+
+import pytest
+
+from standard_names.regex import STANDARD_NAME_REGEX
+from standard_names.regex import findall
+
+# The original patterns, with nested quantifiers that backtrack
+# exponentially on long, almost-valid inputs.
+_WORDS = "[a-z]+(?:[-~_]?[a-zA-Z0-9]+)*"
+NESTED_NAME_REGEX = re.compile(f"^{_WORDS}__{_WORDS}$")
+NESTED_PATTERN = re.compile(f"(?<!\\w){_WORDS}__{_WORDS}(?=\\W|$)")
+
+ADVERSARIAL = {
+    "no_separator": lambda n: "a" * n + "!",
+    "underscores": lambda n: "a_" * n + "!",
+    "hyphens": lambda n: "a-" * n,
+    "mixed_words": lambda n: "aB1_" * n,
+    "long_quantity": lambda n: "a__" + "b" * n + "!",
+    "repeated_names": lambda n: "a__b-" * n + "_",
+    "extra_separators": lambda n: "x__a-b__" * n,
+}
+
+
+def test_same_language_as_nested_patterns():
+    rng = random.Random(1945)
+    alphabet = "aZ9_-~_ .é"
+    for _ in range(50000):
+        line = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        assert bool(STANDARD_NAME_REGEX.match(line)) is bool(
+            NESTED_NAME_REGEX.match(line)
+        )
+        assert findall(line) == NESTED_PATTERN.findall(line.strip())
+
+
+@pytest.mark.parametrize(
+    "line,names",
+    [
+        ("air__temperature", ["air__temperature"]),
+        ("  air__temperature\n", ["air__temperature"]),
+        (
+            "x-air__temperature and sea_water__depth.",
+            ["x-air__temperature", "sea_water__depth"],
+        ),
+        ("air__temperature-", ["air__temperature"]),
+        ("x__a-b__c", ["x__a", "b__c"]),
+        ("air__temperaturé", []),
+        ("Air__temperature", []),
+        ("air_temperature", []),
+    ],
+)
+def test_findall(line, names):
+    assert findall(line) == names
+    assert findall(line) == NESTED_PATTERN.findall(line.strip())
+
+
+@pytest.mark.parametrize("family", sorted(ADVERSARIAL))
+def test_adversarial_inputs_are_linear(family):
+    line = ADVERSARIAL[family](20000)
+
+    start = time.process_time()
+    STANDARD_NAME_REGEX.match(line)
+    findall(line)
+    assert time.process_time() - start < 0.5
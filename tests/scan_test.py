@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""Unit tests for checking whole files of names at once."""
+import io
+
+import pytest
+
+from standard_names import _scan
+from standard_names._scan import scan_file
+from standard_names._scan import scan_names
+from standard_names.cli._validate import validate_names
+from standard_names.error import BadRegistryError
+from standard_names.registry import NamesRegistry
+from standard_names.registry import load_names_from_txt
+from standard_names.standardname import is_valid_name
+
+CONTENTS = (
+    "air__temperature\n",
+    "\n",
+    "  water__temperature \t\n",
+    "Air__temperature\n",
+    "soil__porosity\r\n",
+    "ice__temperature\rsnow__depth\n",
+    "air__temperature\n",
+    "air__temperature__x\n",
+    "\xa0sea_water__salinity\xa0\n",
+    "\x1csea_ice__thickness\n",
+    "café__temperature\n",
+    "air __temperature\n",
+    "   \r\n",
+    "air__pressure",
+)
+
+
+def by_line(text):
+    """Names, and bad names, found by reading a text file a line at a time."""
+    lines = [line.strip() for line in io.StringIO(text, newline=None)]
+    return (
+        [line for line in lines if line and is_valid_name(line)],
+        [line for line in lines if line and not is_valid_name(line)],
+    )
+
+
+@pytest.mark.parametrize("n_lines", range(len(CONTENTS) + 1))
+def test_scan_matches_lines(n_lines):
+    text = "".join(CONTENTS[:n_lines])
+    assert scan_names(text.encode("utf-8")) == by_line(text)
+
+
+def test_scan_without_final_newline():
+    assert scan_names(b"air__temperature\nwater__temperature") == (
+        ["air__temperature", "water__temperature"],
+        [],
+    )
+    assert scan_names(b"air__temperature\nWater__temperature") == (
+        ["air__temperature"],
+        ["Water__temperature"],
+    )
+    assert scan_names(b"") == ([], [])
+
+
+def test_only_bad_lines_are_checked_in_python(monkeypatch):
+    checked = []
+    check_line = _scan._check_line
+
+    def _check_line(line, names, bad_names):
+        checked.append(line)
+        check_line(line, names, bad_names)
+
+    monkeypatch.setattr(_scan, "_check_line", _check_line)
+
+    lines = ["air__temperature"] * 100 + ["Air__x"] + ["water__x"] * 100 + ["ice__"]
+    names, bad_names = scan_names("\n".join(lines).encode())
+    assert len(names) == 200
+    assert bad_names == ["Air__x", "ice__"]
+    assert checked == ["Air__x\n", "ice__"]
+
+
+def test_scan_bad_bytes():
+    names, bad_names = scan_names(b"air__temperature\n\xff\xfe__x\nair__pressure\n")
+    assert names == ["air__temperature", "air__pressure"]
+    assert len(bad_names) == 1
+
+
+@pytest.mark.parametrize("mode", ("r", "rb"))
+def test_scan_file(tmpdir, mode):
+    text = "".join(CONTENTS)
+    with tmpdir.as_cwd():
+        with open("names.txt", "w", encoding="utf-8", newline="") as fp:
+            fp.write(text)
+        with open("names.txt", mode) as fp:
+            assert scan_file(fp) == by_line(text)
+
+        with open("names.txt", mode) as fp:
+            fp.readline()
+            assert scan_file(fp) == by_line(text.split("\n", 1)[1])
+
+        open("empty.txt", "w").close()
+        with open("empty.txt", mode) as fp:
+            assert scan_file(fp) == ([], [])
+
+
+def test_load_from_file_or_lines():
+    text = "".join(CONTENTS)
+    from_file = load_names_from_txt(io.StringIO(text), onerror="pass")
+    from_lines = load_names_from_txt(text.splitlines(), onerror="pass")
+    assert {name.name for name in from_file} == set(by_line(text)[0])
+    assert from_file == from_lines
+    assert all(name.quantity and name.object for name in from_file)
+
+    with pytest.raises(BadRegistryError) as excinfo:
+        load_names_from_txt(io.BytesIO(text.encode()))
+    assert set(excinfo.value.names) == set(by_line(text)[1])
+
+
+def test_validate_file_or_lines():
+    text = "".join(CONTENTS)
+    assert validate_names(io.StringIO(text)) == set(by_line(text)[1])
+    assert validate_names(text.splitlines()) == set(by_line(text)[1])
+
+
+def test_from_path(tmpdir):
+    with tmpdir.as_cwd():
+        with open("a.txt", "w") as fp:
+            fp.write("air__temperature\nwater__temperature")
+        with open("b.txt", "w") as fp:
+            fp.write("soil__porosity\n")
+        with open("bad.txt", "w") as fp:
+            fp.write("Soil__porosity\n")
+
+        assert sorted(NamesRegistry.from_path("a.txt")) == [
+            "air__temperature",
+            "water__temperature",
+        ]
+        assert sorted(NamesRegistry.from_path(["a.txt", "b.txt"])) == [
+            "air__temperature",
+            "soil__porosity",
+            "water__temperature",
+        ]
+        with pytest.raises(BadRegistryError):
+            NamesRegistry.from_path(["a.txt", "bad.txt"])
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+"""Unit tests for scraping names with a cache."""
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+import pytest
+
+from standard_names.cli import _scrape
+from standard_names.cli._scrape import ScrapeCache
+from standard_names.cli._scrape import ScrapeCacheError
+from standard_names.cli._scrape import scrape_names
+from standard_names.cli.main import main
+
+
+@pytest.fixture
+def scanned(monkeypatch):
+    lines = []
+    find_all_names = _scrape.find_all_names
+
+    def _find_all_names(contents):
+        contents = list(contents)
+        lines.extend(contents)
+        return find_all_names(contents)
+
+    monkeypatch.setattr(_scrape, "find_all_names", _find_all_names)
+    return lines
+
+
+def test_scrape_cache_skips_unchanged_files(tmpdir, scanned):
+    path = str(tmpdir / "model.yaml")
+    with open(path, "w") as fp:
+        fp.write("input: air__temperature\noutput: water__temperature\n")
+
+    with ScrapeCache(str(tmpdir / "cache.sqlite")) as cache:
+        registry = scrape_names([path], cache=cache)
+    assert registry.names == {"air__temperature", "water__temperature"}
+    assert len(scanned) == 2
+
+    with ScrapeCache(str(tmpdir / "cache.sqlite")) as cache:
+        registry = scrape_names([path], cache=cache)
+    assert registry.names == {"air__temperature", "water__temperature"}
+    assert len(scanned) == 2
+
+    with open(path, "a") as fp:
+        fp.write("other: soil__depth\n")
+    with ScrapeCache(str(tmpdir / "cache.sqlite")) as cache:
+        registry = scrape_names([path], cache=cache)
+    assert "soil__depth" in registry
+    assert len(scanned) == 5
+
+
+def test_scrape_cache_eviction():
+    with ScrapeCache(":memory:", max_size=100) as cache:
+        for n in range(10):
+            cache.store(f"file{n}.txt", str(n), {f"air__temperature_{n}"})
+            assert cache.size <= 100
+        assert cache.lookup("file0.txt") is None
+        assert cache.lookup("file9.txt") == ("9", {"air__temperature_9"})
+        assert len(cache) == 5
+
+
+def test_scrape_cache_url_etag(scanned):
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+            else:
+                content = b"names: air__temperature\n"
+                self.send_response(200)
+                self.send_header("ETag", '"v1"')
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/names"
+    try:
+        with ScrapeCache(":memory:") as cache:
+            assert scrape_names([url], cache=cache).names == {"air__temperature"}
+            assert scrape_names([url], cache=cache).names == {"air__temperature"}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert requests == [None, '"v1"']
+    assert len(scanned) == 1
+
+
+def test_scrape_cache_url_without_etag(scanned):
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.headers.get("If-None-Match"))
+            content = b"names: air__temperature\n"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/names"
+    try:
+        with ScrapeCache(":memory:") as cache:
+            assert scrape_names([url], cache=cache).names == {"air__temperature"}
+            assert scrape_names([url], cache=cache).names == {"air__temperature"}
+            assert cache.etag(url) is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert requests == [None, None]
+    assert len(scanned) == 1
+
+
+def test_scrape_cache_reopened(tmpdir):
+    path = str(tmpdir / "cache.sqlite")
+    with ScrapeCache(path) as cache:
+        assert len(cache) == 0
+        cache.store("a.txt", "0", {"air__temperature"}, etag='"v1"')
+    with ScrapeCache(path) as cache:
+        assert cache.lookup("a.txt") == ("0", {"air__temperature"})
+        assert cache.etag("a.txt") == '"v1"'
+
+
+def test_scrape_cache_refuses_other_databases(tmpdir):
+    path = str(tmpdir / "other.sqlite")
+    db = sqlite3.connect(path)
+    db.execute("create table entries (source, digest, names, size, accessed)")
+    db.execute("insert into entries values ('a.txt', '\"v1\"', 'air__x', 7, 0)")
+    db.commit()
+    db.close()
+
+    with pytest.raises(ScrapeCacheError, match="not a scrape cache"):
+        ScrapeCache(path)
+
+    db = sqlite3.connect(path)
+    assert db.execute("select count(*) from entries").fetchone() == (1,)
+    assert db.execute("pragma user_version").fetchone() == (0,)
+    db.close()
+
+
+def test_scrape_cache_refuses_other_files(tmpdir):
+    path = tmpdir / "names.txt"
+    path.write("air__temperature\n")
+
+    with pytest.raises(ScrapeCacheError, match="not a scrape cache"):
+        ScrapeCache(str(path))
+    assert path.read() == "air__temperature\n"
+
+
+def test_scrape_cli_cache_needs_a_path(tmpdir, capsys):
+    with tmpdir.as_cwd():
+        with open("names.txt", "w") as fp:
+            fp.write("air__temperature\n")
+
+        assert main(["scrape", "--cache", "cache.sqlite", "names.txt"]) == 0
+        assert "air__temperature" in capsys.readouterr().out.split()
+
+        assert main(["scrape", "--cache", "names.txt"]) == 1
+        assert "not a scrape cache" in capsys.readouterr().err
+        with open("names.txt") as fp:
+            assert fp.read() == "air__temperature\n"
+
+        with pytest.raises(SystemExit):
+            main(["scrape", "names.txt", "--cache"])
+
+
+@pytest.mark.parametrize("cached", (True, False))
+def test_scrape_bad_bytes(tmpdir, cached):
+    path = str(tmpdir / "model.yaml")
+    with open(path, "wb") as fp:
+        fp.write(b"input: air__temperature \xff\noutput: water__temperature\n")
+
+    if cached:
+        with ScrapeCache(":memory:") as cache:
+            registry = scrape_names([path], cache=cache)
+    else:
+        registry = scrape_names([path])
+    assert registry.names == {"air__temperature", "water__temperature"}
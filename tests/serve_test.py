@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+"""Unit tests for the standard_names registry server."""
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from standard_names.cli._serve import MAX_CONTENT_LENGTH
+from standard_names.cli._serve import RegistryServer
+from standard_names.cli._serve import RegistryService
+from standard_names.cli._serve import ServeClient
+from standard_names.cli._serve import ServeError
+from standard_names.cli._serve import _Batcher
+from standard_names.registry import NamesRegistry
+
+
+@pytest.fixture(scope="module")
+def server():
+    registries = {
+        "a": NamesRegistry(["air__temperature", "water__temperature"]),
+        "b": NamesRegistry(["soil__depth"]),
+    }
+    server = RegistryServer(registries, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_service_batch_shares_work():
+    calls = []
+
+    class CountingRegistry(NamesRegistry):
+        def search(self, name):
+            calls.append(name)
+            return super().search(name)
+
+    service = RegistryService({"a": CountingRegistry(["air__temperature"])})
+    responses = service.handle_batch(
+        [("search", {"name": "air__temp"})] * 3 + [("search", {"name": "air"})]
+    )
+    assert [response["results"] for response in responses[:3]] == [
+        ["air__temperature"]
+    ] * 3
+    assert calls == ["air__temp", "air"]
+
+
+def test_service_bad_requests():
+    service = RegistryService({"a": NamesRegistry()})
+    assert "error" in service.handle("frobnicate", {})
+    assert "error" in service.handle("validate", {"names": [1, 2]})
+    assert "error" in service.handle("search", {})
+    assert "error" in service.handle("search", {"name": "x", "registry": "c"})
+
+
+def test_client_registries(server):
+    with ServeClient(port=server.server_port) as client:
+        assert client.registries() == ["a", "b"]
+
+
+def test_client_validate(server):
+    with ServeClient(port=server.server_port, registry="b") as client:
+        results = client.validate(["soil__depth", "air__temperature", "air_temp"])
+    assert [(r["valid"], r["registered"]) for r in results] == [
+        (True, True),
+        (True, False),
+        (False, False),
+    ]
+
+
+def test_client_decompose_match(server):
+    with ServeClient(port=server.server_port) as client:
+        assert client.decompose("air__mean_of_temperature") == [
+            {
+                "name": "air__mean_of_temperature",
+                "object": "air",
+                "quantity": "temperature",
+                "operators": ["mean"],
+            }
+        ]
+        assert client.decompose("air_temp") == [None]
+        assert client.match("*__temperature") == [
+            "air__temperature",
+            "water__temperature",
+        ]
+
+
+def test_client_error(server):
+    with ServeClient(port=server.server_port, registry="missing") as client:
+        with pytest.raises(ServeError, match="unknown registry"):
+            client.search("air")
+
+
+def test_concurrent_clients(server):
+    def search(name):
+        with ServeClient(port=server.server_port) as client:
+            return [client.search(name) for _ in range(10)]
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(search, ["air__temp"] * 16))
+
+    assert all(result == [["air__temperature"]] * 10 for result in results)
+
+
+def test_service_adversarial_names_are_quick():
+    service = RegistryService({"a": NamesRegistry(["air__temperature"])})
+    names = ["a" * 100000 + "!", "a__" + "b" * 100000 + "!"]
+
+    start = time.process_time()
+    validated = service.handle("validate", {"names": names})
+    decomposed = service.handle("decompose", {"names": names})
+    assert time.process_time() - start < 1.0
+
+    assert [result["valid"] for result in validated["results"]] == [False, False]
+    assert decomposed["results"] == [None, None]
+
+
+@pytest.mark.parametrize("length", ["nan", "-1"])
+def test_bad_content_length(server, length):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port)
+    try:
+        connection.putrequest("POST", "/validate")
+        connection.putheader("Content-Length", length)
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400
+        assert "error" in json.loads(response.read())
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("length", [MAX_CONTENT_LENGTH + 1, 2**62])
+def test_content_length_too_large(server, length):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port)
+    try:
+        connection.putrequest("POST", "/validate")
+        connection.putheader("Content-Length", str(length))
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 413
+        assert "error" in json.loads(response.read())
+    finally:
+        connection.close()
+
+
+class FailingRegistry(NamesRegistry):
+    def search(self, name):
+        if name == "boom":
+            raise RuntimeError("boom")
+        return super().search(name)
+
+
+def test_batch_errors_stay_with_their_request():
+    service = RegistryService({"a": FailingRegistry(["air__temperature"])})
+    batcher = _Batcher(service, window=0.2)
+    try:
+        bad = batcher.submit("search", {"name": "boom"})
+        good = batcher.submit("search", {"name": "air__temp"})
+        assert good.result(timeout=5) == {"results": ["air__temperature"]}
+        with pytest.raises(RuntimeError):
+            bad.result(timeout=5)
+    finally:
+        batcher.close()
+
+
+def test_internal_error_is_answered():
+    server = RegistryServer({"a": FailingRegistry(["air__temperature"])}, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with ServeClient(port=server.server_port) as client:
+            with pytest.raises(ServeError, match="internal error"):
+                client.search("boom")
+            assert client.search("air__temp") == ["air__temperature"]
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""Unit tests for standard_names.ShardedNamesRegistry"""
+import pytest
+
+from standard_names.error import BadNameError
+from standard_names.error import BadRegistryError
+from standard_names.registry import NamesRegistry
+from standard_names.registry import ShardedNamesRegistry
+
+
+@pytest.fixture(scope="module")
+def latest():
+    return NamesRegistry.from_latest()
+
+
+@pytest.mark.parametrize("partition", ShardedNamesRegistry.PARTITIONS)
+def test_queries_match_registry(latest, partition):
+    registry = ShardedNamesRegistry(latest, n_shards=8, partition=partition)
+
+    assert len(registry) == len(latest)
+    assert registry.names == latest.names
+    assert registry.objects == latest.objects
+    assert registry.quantities == latest.quantities
+    assert registry.operators == latest.operators
+    assert all(name in registry for name in list(latest)[::11])
+    assert "air__not_a_quantity" not in registry
+    assert 1 not in registry
+
+    for pattern in ("air__*", "atmosphere_*", "*__temperature", "sea_w?ter__*"):
+        assert registry.match(pattern) == latest.match(pattern)
+    assert registry.names_with(["air", "temperature"]) == latest.names_with(
+        ["air", "temperature"]
+    )
+    assert registry.search("air__temprature") == latest.search("air__temprature")
+
+
+@pytest.mark.parametrize("partition", ShardedNamesRegistry.PARTITIONS)
+def test_names_are_partitioned_by_object(latest, partition):
+    registry = ShardedNamesRegistry(latest, n_shards=8, partition=partition)
+    shards = registry.shards
+
+    assert sum(len(shard) for shard in shards) == len(latest)
+    assert sum(1 for shard in shards if len(shard) > 0) > 1
+    for shard in shards:
+        for name in shard:
+            assert registry.shard_for(name) is shard
+
+    for n, shard in enumerate(shards):
+        for m, other in enumerate(shards):
+            if n != m:
+                assert not shard.objects & other.objects
+
+
+def test_prefix_keeps_objects_together(latest):
+    registry = ShardedNamesRegistry(latest, n_shards=8, partition="prefix")
+    shards = {id(registry.shard_for(name)) for name in latest.match("atmosphere_*")}
+    assert len(shards) == 1
+
+
+@pytest.mark.parametrize(
+    "pattern,routed",
+    (
+        ("air__*", {"hash": 1, "prefix": 1}),
+        ("atmosphere_*", {"hash": 4, "prefix": 1}),
+        ("atmo*", {"hash": 4, "prefix": 4}),
+        ("*__temperature", {"hash": 4, "prefix": 4}),
+    ),
+)
+@pytest.mark.parametrize("partition", ShardedNamesRegistry.PARTITIONS)
+def test_match_is_routed(pattern, routed, partition):
+    registry = ShardedNamesRegistry(n_shards=4, partition=partition)
+    assert len(registry._shards_for_pattern(pattern)) == routed[partition]
+
+
+@pytest.mark.parametrize("processes", (1, 2))
+def test_build_in_parallel(latest, processes):
+    names = sorted(latest)
+    registry = ShardedNamesRegistry(
+        names + ["", "  "], version="1.2.3", n_shards=3, processes=processes
+    )
+    assert registry.names == latest.names
+    assert registry.version == "1.2.3"
+    assert all(shard.version == "1.2.3" for shard in registry.shards)
+
+
+@pytest.mark.parametrize("processes", (1, 2))
+def test_bad_names_are_collected(processes):
+    with pytest.raises(BadRegistryError) as excinfo:
+        ShardedNamesRegistry(
+            ["air__temperature", "Air__temperature", "water__", "ice__temperature"],
+            n_shards=4,
+            processes=processes,
+        )
+    assert excinfo.value.names == ("Air__temperature", "water__")
+
+
+def test_add_and_discard():
+    registry = ShardedNamesRegistry(["air__temperature"], n_shards=4)
+
+    registry.add("water__temperature")
+    registry.add_many(["ice__temperature", "soil__porosity"])
+    assert len(registry) == 4
+    assert "ice__temperature" in registry.shard_for("ice__temperature")
+
+    with pytest.raises(BadNameError):
+        registry.add_many(["snow__depth", "Snow__depth"])
+    assert "snow__depth" not in registry
+
+    with pytest.raises(KeyError):
+        registry.discard_many(["air__temperature", "snow__depth"])
+    with pytest.raises(KeyError):
+        registry.discard_many(["air__temperature", "air__temperature"])
+    assert "air__temperature" in registry
+
+    registry.discard("water__temperature")
+    registry -= ["ice__temperature", "soil__porosity"]
+    assert sorted(registry) == ["air__temperature"]
+
+    registry.clear()
+    assert len(registry) == 0
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError, match="partition"):
+        ShardedNamesRegistry(partition="range")
+    with pytest.raises(ValueError, match="shards"):
+        ShardedNamesRegistry(n_shards=0)
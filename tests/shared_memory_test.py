@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""Unit tests for registries published in shared memory."""
+import gc
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from standard_names.registry import FrozenNamesRegistry
+from standard_names.registry import NamesRegistry
+
+_registry = None
+
+
+def _attach(name):
+    global _registry
+    _registry = FrozenNamesRegistry.from_shared_memory(name)
+
+
+def _lookup(names):
+    return [_registry.decompose(name) if name in _registry else None for name in names]
+
+
+@pytest.fixture
+def published():
+    registry = NamesRegistry.from_latest().freeze()
+    shm = registry.to_shared_memory()
+    yield registry, shm
+    shm.close()
+    shm.unlink()
+
+
+def test_attach_without_copying(published):
+    registry, shm = published
+    shared = FrozenNamesRegistry.from_shared_memory(shm.name)
+
+    assert shared == registry
+    assert shared.version == registry.version
+    assert list(shared.objects) == list(registry.objects)
+    assert shared.nbytes == registry.nbytes
+    assert shared.tobytes() == registry.tobytes()
+    for name in list(registry)[::50]:
+        assert shared.decompose(name) == registry.decompose(name)
+    assert "air__not_a_quantity" not in shared
+
+    assert isinstance(shared.names._data, memoryview)
+    assert shared.names._data.obj is shared._shm.buf.obj
+
+
+def test_frombytes_copies_bytes():
+    registry = FrozenNamesRegistry(["air__temperature", "air__log_of_pressure"])
+    copied = FrozenNamesRegistry.frombytes(bytearray(registry.tobytes()))
+    assert isinstance(copied.names._data, bytes)
+    assert copied.decompose("air__log_of_pressure") == ("air", "pressure", ("log",))
+
+
+def test_process_pool_workers(published):
+    registry, shm = published
+    names = list(registry)[::20] + ["air__not_a_quantity", "Air__temperature"]
+
+    with ProcessPoolExecutor(2, initializer=_attach, initargs=(shm.name,)) as executor:
+        chunks = [names[i::4] for i in range(4)]
+        results = dict(
+            zip(
+                (name for chunk in chunks for name in chunk),
+                (parts for result in executor.map(_lookup, chunks) for parts in result),
+            )
+        )
+
+    assert results["air__not_a_quantity"] is None
+    assert results["Air__temperature"] is None
+    for name in names[:-2]:
+        assert results[name] == registry.decompose(name)
+
+
+def test_close_releases_views(published):
+    _, shm = published
+    with FrozenNamesRegistry.from_shared_memory(shm.name) as shared:
+        names = shared.names
+        assert "air__temperature" in names
+    assert shared._shm is None
+
+    with pytest.raises(ValueError):
+        "air__temperature" in names
+    shared.close()
+
+
+def test_tables_outlive_registry(published, monkeypatch):
+    unraisable = []
+    monkeypatch.setattr(sys, "unraisablehook", unraisable.append)
+
+    registry, shm = published
+    shared = FrozenNamesRegistry.from_shared_memory(shm.name)
+    names = shared.names
+    del shared
+    gc.collect()
+    assert list(names) == list(registry.names)
+
+    del names
+    gc.collect()
+    assert unraisable == []
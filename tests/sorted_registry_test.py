@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""Unit tests for standard_names.SortedNamesRegistry"""
+import random
+
+import pytest
+
+from standard_names.registry import NamesRegistry
+from standard_names.registry import SortedNamesRegistry
+
+
+def test_sorted_through_batches():
+    names = sorted(NamesRegistry.from_latest())
+    rng = random.Random(1945)
+
+    registry = SortedNamesRegistry()
+    expected = set()
+    for _ in range(20):
+        batch = rng.sample(names, 50)
+        registry |= batch
+        expected |= set(batch)
+
+        removed = rng.sample(sorted(expected), 10)
+        registry -= removed
+        expected -= set(removed)
+
+        assert list(registry) == sorted(expected)
+
+    reference = NamesRegistry(expected)
+    for field in ("objects", "quantities", "operators"):
+        assert list(registry._field_items(field)) == sorted(getattr(reference, field))
+
+
+def test_readd_discarded():
+    registry = SortedNamesRegistry(["air__temperature", "water__temperature"])
+    assert list(registry) == ["air__temperature", "water__temperature"]
+
+    registry.discard("air__temperature")
+    registry.add("air__temperature")
+    registry.add("ice__temperature")
+    registry.discard("ice__temperature")
+
+    assert list(registry) == ["air__temperature", "water__temperature"]
+    assert list(registry._field_items("objects")) == ["air", "water"]
+
+
+def test_dumps_matches_unsorted_registry():
+    names = NamesRegistry.from_latest()
+    registry = SortedNamesRegistry(names)
+
+    assert registry.dumps(sort=True) == names.dumps(sort=True)
+    assert registry.dumps(format_="yaml", sort=True) == names.dumps(
+        format_="yaml", sort=True
+    )
+
+
+def test_prefix_and_range_queries():
+    names = NamesRegistry.from_latest()
+    registry = SortedNamesRegistry(names)
+
+    assert registry.startswith("soil_") == sorted(
+        name for name in names if name.startswith("soil_")
+    )
+    assert registry.startswith("") == sorted(names)
+    assert registry.startswith("zzz") == []
+    assert registry.between("sea", "seb") == registry.startswith("sea")
+    assert registry.match("atmosphere_air__*") == names.match("atmosphere_air__*")
+    assert registry.match("*__temperature") == names.match("*__temperature")
+
+
+def test_index():
+    registry = SortedNamesRegistry(["b__x", "a__x", "c__x"])
+
+    assert registry.index("b__x") == 1
+    assert registry[0] == "a__x"
+    with pytest.raises(ValueError):
+        registry.index("d__x")
+    with pytest.raises(KeyError):
+        registry.remove("d__x")
+
+
+@pytest.mark.parametrize("change", ("add", "discard"))
+def test_change_during_iteration(change):
+    registry = SortedNamesRegistry(["a__x", "b__x", "c__x"])
+    with pytest.raises(RuntimeError):
+        for _ in registry:
+            getattr(registry, change)("b__x" if change == "discard" else "d__x")
+    assert list(registry) == sorted(registry.names)
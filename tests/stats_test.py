@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""Unit tests for standard_names timing instrumentation."""
+import pytest
+
+import standard_names
+from standard_names import _stats
+from standard_names.cli._watch import NamesWatcher
+from standard_names.cli.main import main
+from standard_names.error import BadNameError
+from standard_names.error import BadRegistryError
+from standard_names.registry import NamesRegistry
+from standard_names.registry import load_names_from_txt
+from standard_names.standardname import StandardName
+
+
+@pytest.fixture
+def profiling():
+    _stats.reset()
+    _stats.enable()
+    yield
+    _stats.disable()
+    _stats.reset()
+
+
+def test_stats_empty_when_disabled():
+    _stats.reset()
+    NamesRegistry(["air__temperature"]).search("air__temp")
+    assert standard_names.stats() == {}
+
+
+def test_stats_categories(profiling):
+    registry = NamesRegistry(["air__temperature", "water__temperature"])
+    registry.search("air__temp")
+    registry.match("air*")
+    registry.dumps()
+
+    stats = standard_names.stats()
+    assert set(stats) == {"load", "validate", "decompose", "search", "match", "format"}
+    assert stats["load"]["items"] == 2
+    assert stats["validate"]["calls"] == 2
+    assert stats["match"]["items"] == 1
+    assert all(counts["seconds"] >= 0.0 for counts in stats.values())
+
+
+def test_imported_functions_are_counted(profiling):
+    from standard_names.standardname import is_valid_name
+
+    decompose_name = StandardName.decompose_name
+    assert is_valid_name("air__temperature")
+    assert not is_valid_name("Air__temperature")
+    decompose_name("air__temperature")
+    with pytest.raises(BadNameError):
+        decompose_name("air_temperature")
+
+    stats = standard_names.stats()
+    assert stats["validate"]["calls"] == stats["validate"]["items"] == 2
+    assert stats["decompose"]["calls"] == 2
+    assert stats["decompose"]["items"] == 1
+
+
+def test_cli_profile(capsys, tmpdir):
+    with tmpdir.as_cwd():
+        with open("names.txt", "w") as fp:
+            fp.write("air__temperature")
+        assert main(["--profile", "validate", "names.txt"]) == 0
+
+    _, err = capsys.readouterr()
+    assert err.splitlines()[0].split()[0] == "category"
+    assert "validate" in err
+    assert not _stats.is_enabled()
+
+
+def test_calls_that_raise_are_recorded(profiling):
+    with pytest.raises(BadRegistryError):
+        load_names_from_txt(["Air__temperature"], onerror="raise")
+    assert standard_names.stats()["load"]["calls"] == 1
+    assert standard_names.stats()["load"]["items"] == 0
+
+
+def test_load_warnings_blame_the_caller(recwarn):
+    load_names_from_txt(["Air__temperature"], onerror="warn")
+    assert recwarn.pop(UserWarning).filename == __file__
+
+
+def test_disable_overrides_environment(monkeypatch):
+    monkeypatch.setattr(_stats, "_enabled", True)
+    _stats.disable()
+    assert not _stats.is_enabled()
+
+
+def test_watcher_validations_are_counted(profiling, tmpdir):
+    path = tmpdir / "names.txt"
+    path.write("air__temperature\nwater__temperature\n")
+    NamesWatcher([str(path)]).poll()
+    assert standard_names.stats()["validate"]["calls"] == 1
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""Unit tests for suggesting registered names."""
+import pytest
+
+from standard_names._fuzzy import NGramIndex
+from standard_names.cli.main import main
+from standard_names.registry import NamesRegistry
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return NamesRegistry.from_latest()
+
+
+def test_query_exact_match():
+    index = NGramIndex(["air__temperature", "water__temperature"])
+    assert index.query("air__temperature", k=1) == [("air__temperature", 1.0)]
+    assert index.query("soil__depth") == []
+
+
+def test_suggest_single_name(registry):
+    assert registry.suggest("Sea_water__temperature", k=1) == {
+        "Sea_water__temperature": ["sea_water__temperature"]
+    }
+
+
+def test_suggest_index_updated():
+    registry = NamesRegistry(["air__temperature"])
+    assert registry.suggest("water__temp", k=1) == {"water__temp": []}
+
+    registry.add("water__temperature")
+    assert registry.suggest("water__temp", k=1) == {
+        "water__temp": ["water__temperature"]
+    }
+
+    registry.discard("water__temperature")
+    assert registry.suggest("water__temp", k=1) == {"water__temp": []}
+
+
+def test_suggest_parallel(registry):
+    names = sorted(registry)[:600]
+    bad_names = [name.replace("__", "_") for name in names]
+
+    serial = registry.suggest(bad_names, processes=1)
+    parallel = registry.suggest(bad_names, processes=2)
+
+    assert parallel == serial
+    assert sum(name in serial[bad] for name, bad in zip(names, bad_names)) > 550
+
+
+def test_cli_validate_suggest(capsys, tmpdir):
+    with tmpdir.as_cwd():
+        with open("names.txt", "w") as fp:
+            fp.write("air__temperature\nSea_water__temperature\n")
+        assert main(["validate", "--suggest", "1", "names.txt"]) == 1
+
+    out, _ = capsys.readouterr()
+    assert out.splitlines() == ["Sea_water__temperature: sea_water__temperature"]
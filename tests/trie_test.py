@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+"""Unit tests for tries over the parts of standard names."""
+from standard_names._trie import ObjectTree
+from standard_names._trie import OperatorTrie
+from standard_names._trie import TokenTrie
+from standard_names.registry import NamesRegistry
+
+
+def test_token_trie_discard_prunes():
+    trie = TokenTrie()
+    trie.add(("a", "b", "c"), "abc")
+    trie.add(("a",), "a")
+
+    assert trie.discard(("a", "b", "c"), "abc")
+    assert not trie.discard(("a", "b", "c"), "abc")
+    assert not trie.discard(("x",), "a")
+    assert trie.children(("a",)) == {}
+    assert trie.count() == 1
+
+    assert trie.discard(("a",), "a")
+    assert len(trie) == 0
+    assert trie.children() == {}
+
+
+def test_operator_trie_queries():
+    trie = OperatorTrie()
+    for name in (
+        "air__temperature",
+        "air__mean_of_temperature",
+        "air__mean_of_log_of_temperature",
+        "water__mean_of_log_of_temperature",
+        "air__log_of_pressure",
+    ):
+        trie.add_name(name)
+
+    assert trie.with_chain(("mean", "log")) == {
+        "air__mean_of_log_of_temperature",
+        "water__mean_of_log_of_temperature",
+    }
+    assert trie.with_depth(1) == {"air__mean_of_temperature", "air__log_of_pressure"}
+    assert trie.with_depth(3) == set()
+    assert trie.children(("mean",)) == {"log": 2}
+    assert trie.applied_to("pressure") == {("log",)}
+    assert trie.applied_to("depth") == set()
+
+    trie.discard_name("air__log_of_pressure")
+    assert trie.applied_to("pressure") == set()
+    assert trie.children() == {"mean": 3}
+
+
+def test_registry_operator_trie_incremental():
+    nreg = NamesRegistry()
+    nreg.add("air__time_derivative_of_temperature")
+    nreg.add("air__time_derivative_of_temperature")
+    nreg.add("air__time_derivative_of_log_of_pressure")
+
+    assert nreg.operator_trie.count(("time_derivative",)) == 2
+    assert nreg.operator_trie.applied_to("temperature") == {("time_derivative",)}
+
+    nreg.discard("air__time_derivative_of_temperature")
+    assert nreg.operator_trie.startswith("time_derivative") == {
+        "air__time_derivative_of_log_of_pressure"
+    }
+    assert nreg.operator_trie.applied_to("temperature") == set()
+
+
+def test_registry_tries_are_built_when_used():
+    nreg = NamesRegistry(["air__temperature", "air__time_derivative_of_pressure"])
+    assert nreg._operator_trie is None
+    assert nreg._object_tree is None
+
+    other = nreg.copy()
+    other.add("soil__time_derivative_of_porosity")
+    assert other._operator_trie is None
+
+    assert other.operator_trie.count(("time_derivative",)) == 2
+    assert other.object_tree.count("soil") == 1
+    assert nreg._operator_trie is None
+
+    other.discard("air__time_derivative_of_pressure")
+    other.add_many(["water__time_derivative_of_depth", "water__depth"])
+    assert other.operator_trie.startswith("time_derivative") == {
+        "soil__time_derivative_of_porosity",
+        "water__time_derivative_of_depth",
+    }
+    assert other.object_tree.objects() == other.objects
+    assert len(other.copy().object_tree) == len(other)
+
+
+def test_registry_operator_trie_latest():
+    nreg = NamesRegistry.from_latest()
+    trie = nreg.operator_trie
+
+    assert len(trie) == len(nreg)
+    assert sum(trie.children().values()) + len(trie.with_depth(0)) == len(nreg)
+    for chain, names in trie.items(depth=2):
+        assert len(chain) == 2
+        assert names <= nreg.names_with("_of_".join(chain) + "_of_")
+
+
+def test_object_tree():
+    tree = ObjectTree()
+    for name in (
+        "above-ground_crop_biomass__mass",
+        "above-ground_crop__height",
+        "atmosphere__pressure",
+        "atmosphere_air__temperature",
+        "atmosphere_air_flow__speed",
+        "soil__porosity",
+        "soil_water__volume_fraction",
+    ):
+        tree.add_name(name)
+
+    assert tree.children() == {"above-ground": 2, "atmosphere": 3, "soil": 2}
+    assert tree.children("above-ground") == {"crop": 2}
+    assert tree.children(("above-ground", "crop")) == {"biomass": 1}
+    assert tree.count("atmosphere_air") == 2
+    assert tree.count("atmos") == 0
+    assert tree.under("atmosphere_air") == {
+        "atmosphere_air__temperature",
+        "atmosphere_air_flow__speed",
+    }
+    assert tree.with_object("soil") == {"soil__porosity"}
+    assert tree.objects("soil") == {"soil", "soil_water"}
+    assert len(tree.under("")) == len(tree) == 7
+
+    tree.discard_name("atmosphere_air_flow__speed")
+    assert tree.children("atmosphere_air") == {}
+    assert tree.objects("atmosphere") == {"atmosphere", "atmosphere_air"}
+
+
+def test_registry_object_tree_latest():
+    nreg = NamesRegistry.from_latest()
+    tree = nreg.object_tree
+
+    assert len(tree) == len(nreg)
+    assert tree.objects() == nreg.objects
+    assert sum(tree.children().values()) == len(nreg)
+    assert tree.under("soil") == {
+        name for name in nreg if name.split("__")[0].split("_")[0] == "soil"
+    }
+
+
+def test_token_trie_bulk_updates():
+    trie = TokenTrie()
+    assert trie.update([(("a", "b"), "ab"), (("a", "b"), "ab2"), (("a",), "a")]) == {
+        "ab",
+        "ab2",
+        "a",
+    }
+    assert trie.update([(("a", "b"), "ab"), (("c",), "c")]) == {"c"}
+    assert trie.count() == 4
+    assert trie.children() == {"a": 3, "c": 1}
+
+    assert trie.difference_update([(("a", "b"), "ab"), (("c",), "x")]) == {"ab"}
+    assert trie.difference_update([(("a", "b"), "ab2"), (("c",), "c")]) == {
+        "ab2",
+        "c",
+    }
+    assert trie.children() == {"a": 1}
+    assert trie.children(("a",)) == {}
+
+
+def test_token_trie_copies_are_independent():
+    trie = OperatorTrie()
+    for name in ("air__temperature", "air__log_of_temperature", "air__log_of_depth"):
+        trie.add_name(name)
+    other = trie.copy()
+
+    other.add_name("air__log_of_pressure")
+    other.discard_name("air__temperature")
+    trie.discard_name("air__log_of_depth")
+
+    assert trie.startswith(()) == {"air__temperature", "air__log_of_temperature"}
+    assert other.startswith(()) == {
+        "air__log_of_temperature",
+        "air__log_of_depth",
+        "air__log_of_pressure",
+    }
+    assert len(trie) == 2 and len(other) == 3
+    assert trie.applied_to("temperature") == {(), ("log",)}
+    assert other.applied_to("temperature") == {("log",)}
+    assert trie.applied_to("depth") == set()
+    assert other.applied_to("depth") == {("log",)}
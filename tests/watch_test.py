@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""Unit tests for watching names files."""
+import io
+import os
+
+from standard_names.cli._validate import validate_names
+from standard_names.cli._watch import NamesWatcher
+
+
+def _write(path, contents, mtime_ns):
+    with open(path, "w") as fp:
+        fp.write(contents)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_watch_only_checks_changed_lines(tmpdir):
+    path = str(tmpdir / "names.txt")
+    _write(path, "air__temperature\nwater_temperature\n", 1)
+
+    watcher = NamesWatcher([path])
+    (report,) = watcher.poll()
+    assert report.invalid == [(2, "water_temperature")]
+    assert report.n_checked == 2
+
+    _write(path, "Air__temperature\nair__temperature\n\nwater_temperature\n", 2)
+    (report,) = watcher.poll()
+    assert report.invalid == [(1, "Air__temperature"), (4, "water_temperature")]
+    assert report.n_checked == 3
+    assert watcher.invalid_names == {path: report.invalid}
+
+
+def test_watch_edit_in_the_middle(tmpdir):
+    path = str(tmpdir / "names.txt")
+    lines = ["air__temperature"] * 50000 + ["Air__x"] + ["water__depth"] * 50000
+    _write(path, "\n".join(lines) + "\n", 1)
+
+    watcher = NamesWatcher([path])
+    (report,) = watcher.poll()
+    assert report.invalid == [(50001, "Air__x")]
+
+    lines[20000] = "ice_thickness"
+    _write(path, "\n".join(lines) + "\n", 2)
+    (report,) = watcher.poll()
+    assert report.invalid == [(20001, "ice_thickness"), (50001, "Air__x")]
+    assert report.n_checked == 1
+    assert report.n_lines == len(lines)
+
+    lines[:0] = ["soil__depth", "Soil__depth"]
+    _write(path, "\n".join(lines) + "\n", 3)
+    (report,) = watcher.poll()
+    assert report.invalid == [
+        (2, "Soil__depth"),
+        (20003, "ice_thickness"),
+        (50003, "Air__x"),
+    ]
+    assert report.n_checked == 2
+
+
+def test_watch_agrees_with_validate(tmpdir):
+    path = str(tmpdir / "names.txt")
+    contents = "air__temperature\x1cwater__depth\nair\x85__x\nsoil__depth\rIce__x\n"
+    with open(path, "w", encoding="utf-8", newline="") as fp:
+        fp.write(contents)
+
+    (report,) = NamesWatcher([path]).poll()
+    assert {name for _, name in report.invalid} == validate_names(
+        io.StringIO(contents, newline="")
+    )
+    assert report.invalid == [
+        (1, "air__temperature\x1cwater__depth"),
+        (2, "air\x85__x"),
+        (3, "Ice__x"),
+    ]
+
+
+def test_watch_unchanged_contents(tmpdir):
+    path = str(tmpdir / "names.txt")
+    _write(path, "air__temperature\n", 1)
+
+    watcher = NamesWatcher([path])
+    assert len(watcher.poll()) == 1
+    assert watcher.poll() == []
+
+    _write(path, "air__temperature\n", 2)
+    assert watcher.poll() == []
+
+
+def test_watch_removed_file(tmpdir):
+    path = str(tmpdir / "names.txt")
+    watcher = NamesWatcher([path])
+    assert watcher.poll() == []
+
+    _write(path, "air_temperature\n", 1)
+    (report,) = watcher.poll()
+    assert not report.removed
+    assert report.invalid == [(1, "air_temperature")]
+
+    os.remove(path)
+    (report,) = watcher.poll()
+    assert report.removed
+    assert watcher.invalid_names == {path: []}